@@ -0,0 +1,216 @@
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+import numpy as np
+# scipy.sparse est importé à la construction des matrices (import du module plus rapide)
+
+
+class CorpusAnalysis:
+    """
+    Analyse du corpus en une seule passe : chaque document est nettoyé et découpé en mots
+    une seule fois, puis stocké sous forme de tableau d'ids de mots.
+    Le vocabulaire, les fréquences et les matrices TF / TF-IDF sont ensuite dérivés de ces
+    tableaux sans jamais renettoyer les textes.
+    Les documents supprimés ne sont pas retirés tout de suite : leur ligne est marquée dans
+    un masque (tombstone) jusqu'au prochain compactage.
+    """
+
+    def __init__(self, decouper):
+        # decouper : fonction texte -> liste de mots nettoyés
+        # (envoyée aux processus de l'analyse parallèle : elle doit pouvoir être picklée)
+        self._decouper = decouper
+        self.mots = []      # id du mot -> mot (ordre de première apparition dans le corpus)
+        self.mot2id = {}    # mot -> id du mot
+        self.doc_ids = []   # ligne -> doc_id
+        self.tokens = []    # ligne -> tableau des ids de mots du document
+        self.frequences = np.zeros(0, dtype=np.int64)         # nombre total d'occurrences par mot
+        self.frequences_nb_doc = np.zeros(0, dtype=np.int64)  # nombre de documents contenant le mot
+        self.supprime = np.zeros(0, dtype=bool)               # ligne -> document supprimé
+        self._lignes = {}   # doc_id -> ligne (documents non supprimés)
+        # Matrice TF par segments : chaque lot ajouté donne un segment, fusionnés à la lecture
+        self._segments = []
+
+    @property
+    def nb_documents(self):
+        # Nombre de documents non supprimés
+        return len(self._lignes)
+
+    @property
+    def nb_lignes(self):
+        # Nombre de lignes des matrices (documents supprimés compris)
+        return len(self.tokens)
+
+    @property
+    def nb_mots(self):
+        return len(self.mots)
+
+    def ajouter_documents(self, documents, nb_processus=1):
+        """
+        Analyse des documents et les ajoute à la fin (une ligne par document).
+        Args:
+            documents: itérable de (doc_id, texte)
+            nb_processus: int - Nombre de processus pour nettoyer et découper les textes.
+                Au-delà de 1, les documents sont découpés en paquets analysés en parallèle avec
+                un vocabulaire local, puis fusionnés dans l'ordre : le résultat est identique
+                à l'analyse en un seul processus.
+        """
+        mot2id = self.mot2id
+        nb_mots_avant = len(mot2id)
+        nouveaux = []
+        if nb_processus > 1:
+            documents = list(documents)
+            doc_ids = [doc_id for doc_id, _ in documents]
+            nouveaux = self._analyser_en_parallele([texte for _, texte in documents], nb_processus)
+        else:
+            doc_ids = []
+            for doc_id, texte in documents:
+                # setdefault donne un nouvel id (= taille actuelle du vocabulaire) aux mots jamais vus
+                ids = [mot2id.setdefault(mot, len(mot2id)) for mot in self._decouper(texte)]
+                doc_ids.append(doc_id)
+                nouveaux.append(np.array(ids, dtype=np.int32))
+        for doc_id in doc_ids:
+            self._lignes[doc_id] = len(self.doc_ids)
+            self.doc_ids.append(doc_id)
+        self.mots.extend(islice(mot2id, nb_mots_avant, None))
+        self.tokens.extend(nouveaux)
+        self.supprime = np.concatenate([self.supprime, np.zeros(len(nouveaux), dtype=bool)])
+
+        # Mise à jour des fréquences avec un seul bincount pour tout le lot
+        occurrences, presences = self._comptages(nouveaux)
+        self.frequences = _agrandir(self.frequences, self.nb_mots) + occurrences
+        self.frequences_nb_doc = _agrandir(self.frequences_nb_doc, self.nb_mots) + presences
+        if nouveaux:
+            self._segments.append(_matrice_lot(nouveaux, self.nb_mots))
+
+    def _analyser_en_parallele(self, textes, nb_processus):
+        # Chaque paquet est analysé dans un processus avec son propre vocabulaire ; les vocabulaires
+        # locaux sont fusionnés dans l'ordre des paquets, ce qui donne les mêmes ids (ordre de
+        # première apparition) qu'une analyse document par document
+        if not textes:
+            return []
+        taille = -(-len(textes) // (4 * nb_processus))  # ~4 paquets par processus
+        paquets = [textes[i:i + taille] for i in range(0, len(textes), taille)]
+        mot2id = self.mot2id
+        nouveaux = []
+        with ProcessPoolExecutor(max_workers=nb_processus) as executeur:
+            for mots_locaux, ids_locaux, longueurs in executeur.map(partial(_analyser_paquet, self._decouper), paquets):
+                correspondance = np.array([mot2id.setdefault(mot, len(mot2id)) for mot in mots_locaux], dtype=np.int32)
+                ids = correspondance[ids_locaux]
+                nouveaux.extend(np.split(ids, np.cumsum(longueurs)[:-1]))
+        return nouveaux
+
+    def supprimer_documents(self, doc_ids):
+        """
+        Marque des documents comme supprimés et retire leurs mots des fréquences.
+        Les lignes restent dans les matrices jusqu'au prochain compactage.
+        Args:
+            doc_ids: itérable d'ids de documents (les ids inconnus sont ignorés)
+        """
+        lignes = [self._lignes.pop(doc_id) for doc_id in doc_ids if doc_id in self._lignes]
+        if not lignes:
+            return
+        self.supprime[lignes] = True
+        occurrences, presences = self._comptages([self.tokens[ligne] for ligne in lignes])
+        self.frequences -= occurrences
+        self.frequences_nb_doc -= presences
+
+    def proportion_supprimee(self):
+        """Part des lignes des matrices qui correspondent à des documents supprimés."""
+        return self.supprime.mean() if self.nb_lignes else 0.0
+
+    def compacter(self):
+        """
+        Retire définitivement les lignes supprimées et les mots qui n'apparaissent plus
+        dans aucun document. Les ids des mots sont renumérotés (l'ordre est conservé).
+        """
+        from scipy.sparse import csr_matrix
+        garder_lignes = ~self.supprime
+        garder_mots = self.frequences_nb_doc > 0
+        nouveaux_ids = (np.cumsum(garder_mots) - 1).astype(np.int32)
+        matrice = self.matrice_tf()[garder_lignes][:, garder_mots]
+
+        self.tokens = [nouveaux_ids[ids] for ids, garder in zip(self.tokens, garder_lignes) if garder]
+        self.doc_ids = [doc_id for doc_id, garder in zip(self.doc_ids, garder_lignes) if garder]
+        self.mots = [mot for mot, garder in zip(self.mots, garder_mots) if garder]
+        # Mise à jour sur place : le dictionnaire peut être partagé (moteur de recherche)
+        self.mot2id.clear()
+        self.mot2id.update((mot, i) for i, mot in enumerate(self.mots))
+        self.frequences = self.frequences[garder_mots]
+        self.frequences_nb_doc = self.frequences_nb_doc[garder_mots]
+        self.supprime = np.zeros(len(self.doc_ids), dtype=bool)
+        self._lignes = {doc_id: ligne for ligne, doc_id in enumerate(self.doc_ids)}
+        self._segments = [csr_matrix(matrice)]
+
+    def matrice_tf(self):
+        """
+        Matrice creuse lignes x mots du nombre d'occurrences.
+        Les segments ajoutés depuis la dernière lecture sont fusionnés en une seule matrice,
+        les lignes déjà calculées ne sont jamais reconstruites à partir des textes.
+        """
+        from scipy.sparse import csr_matrix, vstack
+        nb_mots = self.nb_mots
+        if not self._segments:
+            return csr_matrix((0, nb_mots), dtype=np.int64)
+        if len(self._segments) > 1 or self._segments[0].shape[1] != nb_mots:
+            # Les anciens segments ont moins de colonnes : on les élargit sans copier leurs données
+            segments = [csr_matrix((s.data, s.indices, s.indptr), shape=(s.shape[0], nb_mots)) for s in self._segments]
+            self._segments = [vstack(segments, format="csr")]
+        return self._segments[0]
+
+    def idf(self):
+        """IDF de chaque mot, aligné sur les ids du vocabulaire : log(N / NbDoc(mot)) (0 si le mot a disparu)."""
+        ratio = np.divide(self.nb_documents, self.frequences_nb_doc, out=np.ones(self.nb_mots),
+                          where=self.frequences_nb_doc > 0)
+        return np.log(ratio)
+
+    def masquer_supprimes(self, matrice):
+        """Met à zéro les lignes des documents supprimés d'une matrice alignée sur les lignes de l'analyse."""
+        from scipy.sparse import csr_matrix
+        matrice = csr_matrix(matrice)
+        if self.supprime.any():
+            matrice = csr_matrix(matrice.multiply(~self.supprime[:, None]))
+            matrice.eliminate_zeros()
+        return matrice
+
+    def matrice_tfidf(self):
+        """Matrice TF-IDF alignée sur les lignes de l'analyse (lignes supprimées à zéro)."""
+        return self.masquer_supprimes(self.matrice_tf().multiply(self.idf()))
+
+    def _comptages(self, tokens):
+        # Occurrences et nombre de documents par mot pour une liste de tableaux d'ids
+        if not tokens:
+            vide = np.zeros(self.nb_mots, dtype=np.int64)
+            return vide, vide.copy()
+        occurrences = np.bincount(np.concatenate(tokens), minlength=self.nb_mots)
+        presences = np.bincount(np.concatenate([np.unique(ids) for ids in tokens]), minlength=self.nb_mots)
+        return occurrences, presences
+
+
+def _analyser_paquet(decouper, textes):
+    # Exécuté dans un processus de l'analyse parallèle : découpe les textes d'un paquet avec un
+    # vocabulaire local. Retourne les mots du paquet (ordre de première apparition), les ids
+    # locaux de tous les mots à la suite, et le nombre de mots de chaque texte.
+    mot2id = {}
+    ids = []
+    longueurs = []
+    for texte in textes:
+        mots = decouper(texte)
+        ids.extend(mot2id.setdefault(mot, len(mot2id)) for mot in mots)
+        longueurs.append(len(mots))
+    return list(mot2id), np.array(ids, dtype=np.int32), np.array(longueurs, dtype=np.int64)
+
+
+def _matrice_lot(tokens, nb_mots):
+    # Matrice TF d'un lot de documents (une ligne par tableau d'ids)
+    from scipy.sparse import csr_matrix
+    lignes = np.repeat(np.arange(len(tokens)), [len(ids) for ids in tokens])
+    colonnes = np.concatenate(tokens)
+    # Les doublons (ligne, colonne) sont additionnés par csr_matrix
+    return csr_matrix((np.ones(len(colonnes), dtype=np.int64), (lignes, colonnes)), shape=(len(tokens), nb_mots))
+
+
+def _agrandir(tableau, taille):
+    # Complète un tableau de comptage avec des 0 pour les nouveaux mots
+    if len(tableau) == taille:
+        return tableau
+    return np.concatenate([tableau, np.zeros(taille - len(tableau), dtype=tableau.dtype)])
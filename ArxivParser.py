@@ -0,0 +1,60 @@
+import xml.etree.ElementTree as ET
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+OPENSEARCH = "{http://a9.com/-/spec/opensearch/1.1/}"
+
+
+class ArxivParser:
+    """
+    Lecture en flux d'une réponse Atom de l'API arXiv avec ElementTree.iterparse :
+    les entrées sont produites une par une pendant la lecture (on peut itérer directement
+    sur la réponse HTTP), et chaque entrée est effacée une fois traitée. La mémoire utilisée
+    ne dépend donc pas du nombre de résultats, contrairement à xmltodict.parse.
+
+    Chaque entrée est un dict au format de xmltodict (title, summary, published, id, author) :
+    author est un dict {"name": ...} s'il n'y a qu'un auteur, une liste de dicts sinon.
+    """
+
+    def __init__(self, source):
+        """
+        Args:
+            source: fichier (ou réponse HTTP) ouvert en binaire, ou chemin de fichier
+        """
+        self.source = source
+        self.total = None  # opensearch:totalResults, connu après le début de la lecture
+
+    def __iter__(self):
+        racine = None
+        for evenement, element in ET.iterparse(self.source, events=("start", "end")):
+            if evenement == "start":
+                if racine is None:
+                    racine = element
+                continue
+            if element.tag == OPENSEARCH + "totalResults":
+                self.total = int(element.text)
+            elif element.tag == ATOM + "entry":
+                yield self._entree(element)
+                # L'entrée est traitée : on libère ses éléments (et ceux déjà lus sous la racine)
+                element.clear()
+                racine.clear()
+
+    @staticmethod
+    def _entree(element):
+        auteurs = [{"name": _texte(auteur, "name", "Auteur inconnu")} for auteur in element.findall(ATOM + "author")]
+        entree = {
+            "title": _texte(element, "title", "Titre inconnu"),
+            "summary": _texte(element, "summary", ""),
+            "published": _texte(element, "published", "Inconnu"),
+            "id": _texte(element, "id", "Inconnu"),
+        }
+        if auteurs:
+            entree["author"] = auteurs[0] if len(auteurs) == 1 else auteurs
+        return entree
+
+
+def _texte(element, nom, defaut):
+    # Texte d'un sous-élément Atom, sans les espaces de début et de fin (comme xmltodict)
+    enfant = element.find(ATOM + nom)
+    if enfant is None or enfant.text is None:
+        return defaut
+    return enfant.text.strip()
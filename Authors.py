@@ -1,29 +1,61 @@
+from array import array
+
+
 # Name, nb publi, liste des ids des documents
-import matplotlib.pyplot as plt
 class Author:
+    # __slots__ et ids des documents dans un array int64 (8 octets par id au lieu d'un objet int par id)
+    __slots__ = ("name", "nb_publications", "_document_ids")
+
     def __init__(self, name,nb_publications=0, document_ids=None):
         self.name = name
         self.nb_publications = nb_publications
         self.document_ids = document_ids if document_ids is not None else []
 
+    @property
+    def document_ids(self):
+        # L'array lui-même (sans copie) : append / remove / index / in / len comme sur une liste
+        return self._document_ids
+
+    @document_ids.setter
+    def document_ids(self, value):
+        self._document_ids = array("q", value)
+
+    def a_publie(self, document_id):
+        return document_id in self._document_ids
+
     def add_publication(self, document_id):
         self.nb_publications += 1
-        self.document_ids.append(document_id)
+        self._document_ids.append(document_id)
+
+    def remove_publication(self, document_id):
+        self._document_ids.remove(document_id)
+        self.nb_publications -= 1
+
+    def __getstate__(self):
+        return {"name": self.name, "nb_publications": self.nb_publications, "document_ids": self._document_ids.tolist()}
+
+    def __setstate__(self, state):
+        # Accepte aussi les anciens pickles (__dict__ avec document_ids en liste)
+        self.name = state["name"]
+        self.nb_publications = state["nb_publications"]
+        self.document_ids = state["document_ids"]
 
     def __repr__(self):
-        return f"Author(name={self.name}, nb_publications={self.nb_publications}, document_ids={self.document_ids})"
+        return f"Author(name={self.name}, nb_publications={self.nb_publications}, document_ids={self._document_ids.tolist()})"
     
     def __str__(self):
         return f"{self.name} ({self.nb_publications} publications)"
     
     def statistics(self, id2doc):
         total_length = 0
-        for doc_id in self.document_ids:
+        for doc_id in self._document_ids:
             doc = id2doc.get(doc_id)
             if doc:
                 total_length += len(doc.text)
         avg_length = total_length / self.nb_publications if self.nb_publications > 0 else 0
         # trace graphique: nombre de publications et taille moyenne
+        # (matplotlib n'est importé que si on trace : son import est long)
+        import matplotlib.pyplot as plt
         labels = ["Nombre de publications", "Taille moyenne des docs"]
         values = [self.nb_publications, avg_length]
         fig, ax = plt.subplots(figsize=(6, 4))
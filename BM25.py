@@ -0,0 +1,55 @@
+import numpy as np
+from InvertedIndex import InvertedIndex
+
+
+class BM25:
+    """
+    Score BM25 calculé à partir de la matrice TF du corpus (documents x termes).
+    Les longueurs des documents, la longueur moyenne et l'IDF sont précalculés une seule fois
+    sous forme de tableaux NumPy : une requête ne parcourt que les postings de ses mots,
+    et k1 / b peuvent changer à chaque requête sans reconstruire la matrice.
+    """
+
+    def __init__(self, matrice_tf, k1=1.2, b=0.75, nb_documents=None):
+        # nb_documents : nombre de documents réels si certaines lignes de la matrice sont vides
+        # (documents supprimés en attente de compactage)
+        self.k1 = k1
+        self.b = b
+        # Postings (ligne, tf) par mot
+        self.index = InvertedIndex(matrice_tf)
+        self.nb_documents = self.index.nb_documents if nb_documents is None else nb_documents
+        # Longueur de chaque document = nombre total de mots
+        self.longueurs = np.asarray(matrice_tf.sum(axis=1), dtype=np.float64).ravel()
+        self.longueur_moyenne = self.longueurs.sum() / self.nb_documents if self.nb_documents else 0.0
+        if self.longueur_moyenne == 0:
+            self.longueur_moyenne = 1.0
+        # IDF BM25 (variante toujours positive) : log(1 + (N - df + 0.5) / (df + 0.5))
+        df = np.diff(self.index.indptr)
+        self.idf = np.log1p((self.nb_documents - df + 0.5) / (df + 0.5))
+
+    def scores(self, poids_requete, k1=None, b=None):
+        """
+        Calcule le score BM25 des documents qui contiennent au moins un mot de la requête.
+        Args:
+            poids_requete: dict - id du mot -> nombre d'occurrences dans la requête
+            k1: float - Saturation de la fréquence des mots (par défaut celui du constructeur)
+            b: float - Importance de la normalisation par la longueur (par défaut celui du constructeur)
+        Returns:
+            (np.ndarray, np.ndarray) - Les lignes des documents touchés et leurs scores
+        """
+        k1 = self.k1 if k1 is None else k1
+        b = self.b if b is None else b
+        lignes_par_mot, scores_par_mot = [], []
+        for id_mot, q in poids_requete.items():
+            if not 0 <= id_mot < self.index.nb_termes:
+                continue
+            lignes, tf = self.index.postings(id_mot)
+            normalisation = k1 * (1 - b + b * self.longueurs[lignes] / self.longueur_moyenne)
+            lignes_par_mot.append(lignes)
+            scores_par_mot.append(q * self.idf[id_mot] * tf * (k1 + 1) / (tf + normalisation))
+        if not lignes_par_mot:
+            return np.array([], dtype=np.int64), np.array([])
+        # Somme des contributions de chaque mot par document (sans tableau de taille N)
+        lignes, inverse = np.unique(np.concatenate(lignes_par_mot), return_inverse=True)
+        scores = np.bincount(inverse, weights=np.concatenate(scores_par_mot), minlength=len(lignes))
+        return lignes.astype(np.int64), scores
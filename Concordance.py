@@ -0,0 +1,226 @@
+import heapq
+import re
+from collections import Counter
+from itertools import islice
+import numpy as np
+
+COLONNES = ["doc_id", "debut", "fin", "contexteGauche", "keyword", "contexteDroite"]
+MOT_SIMPLE = re.compile(r'\w+')
+
+
+class Concordance:
+    """
+    Concordancier sur la concaténation des textes du corpus (séparés par une espace).
+    La position de début de chaque document dans le texte complet est gardée dans un tableau :
+    chaque occurrence est rattachée à son document par recherche dichotomique, et les contextes
+    sont coupés aux limites du document (ils ne débordent jamais sur le document voisin) ; une occurrence
+    qui passe d'un document au suivant (expression de plusieurs mots) est écartée.
+    Les occurrences sont collectées en colonnes et le DataFrame est construit une seule fois.
+    """
+
+    def __init__(self, doc_ids, textes):
+        """
+        Args:
+            doc_ids: list - Ids des documents, dans l'ordre des textes
+            textes: list - Textes des documents
+        """
+        self.texte = " ".join(textes)
+        longueurs = np.fromiter(map(len, textes), dtype=np.int64, count=len(textes))
+        # Chaque document est suivi d'une espace de séparation
+        self.debuts = np.cumsum(longueurs + 1) - (longueurs + 1)
+        self.fins = self.debuts + longueurs
+        self.doc_ids = np.array(doc_ids)
+        self._comptes_mots = None  # mot en minuscules -> nombre d'occurrences (calculé au premier comptage)
+
+    @staticmethod
+    def motif(mot):
+        # Mot entier, insensible à la casse
+        return re.compile(r'\b' + re.escape(mot) + r'\b', re.IGNORECASE)
+
+    def positions(self, mot, premier=0, nb_resultats=None):
+        """
+        Positions des occurrences d'un mot dans le texte complet.
+        Args:
+            mot: str - Mot recherché
+            premier: int - Nombre d'occurrences à sauter (pagination)
+            nb_resultats: int - Nombre maximum d'occurrences (None = toutes)
+        Returns:
+            (np.ndarray, np.ndarray) - Débuts et fins des occurrences
+        """
+        fin = None if nb_resultats is None else premier + nb_resultats
+        bornes = list(islice(self._occurrences(mot), premier, fin))
+        bornes = np.array(bornes, dtype=np.int64).reshape(-1, 2)
+        return bornes[:, 0], bornes[:, 1]
+
+    def _occurrences(self, mot):
+        # (début, fin) des occurrences d'un mot dans le texte complet, sans celles qui passent sur
+        # le document suivant : une expression peut correspondre à l'espace qui sépare deux documents
+        # ("machine" à la fin de l'un, "learning" au début de l'autre). Une telle occurrence contient
+        # forcément une espace ; après elle, la recherche reprend juste après son début, comme si
+        # chaque document était parcouru séparément.
+        motif = self.motif(mot)
+        texte = self.texte
+        position = 0
+        while True:
+            match = motif.search(texte, position)
+            if match is None:
+                return
+            debut, fin = match.span()
+            if " " in match.group() and fin > self.fins[self.documents(debut)]:
+                position = debut + 1
+                continue
+            yield debut, fin
+            position = fin if fin > debut else fin + 1
+
+    def comptes_par_document(self, mot, nb_documents=None):
+        """
+        Nombre d'occurrences d'un mot dans chaque document qui le contient
+        (sans les occurrences à cheval sur deux documents, voir _occurrences).
+        Args:
+            mot: str - Mot recherché (mot entier, insensible à la casse)
+            nb_documents: int - Arrêter le parcours après les nb_documents premiers documents
+                trouvés (None = tout le texte) ; les comptes de ces documents restent complets
+        Returns:
+            dict - doc_id -> nombre d'occurrences, dans l'ordre des documents
+        """
+        if nb_documents is None:
+            debuts, _ = self.positions(mot)
+            documents, comptes = np.unique(self.documents(debuts), return_counts=True)
+            return dict(zip(self.doc_ids[documents].tolist(), comptes.tolist()))
+        comptes = {}
+        fin_document = -1  # fin du document courant dans le texte complet
+        for debut, _ in self._occurrences(mot):
+            if debut > fin_document:
+                # Nouveau document : on le retrouve par recherche dichotomique dans les débuts
+                if len(comptes) == nb_documents:
+                    break
+                i = int(self.documents(debut))
+                fin_document = int(self.fins[i])
+                doc_id = self.doc_ids[i].item()
+                comptes[doc_id] = 0
+            comptes[doc_id] += 1
+        return comptes
+
+    def documents(self, debuts):
+        # Indice du document qui contient chaque position (positions triées ou non)
+        return np.searchsorted(self.debuts, debuts, side="right") - 1
+
+    def concorde(self, mot, taille_context=30, premier=0, nb_resultats=None):
+        """
+        Concordancier : contexte gauche / mot / contexte droit pour chaque occurrence.
+        Args:
+            mot: str - Mot recherché (mot entier, insensible à la casse)
+            taille_context: int - Nombre de caractères de contexte de chaque côté
+            premier: int - Nombre d'occurrences à sauter (pagination)
+            nb_resultats: int - Nombre maximum d'occurrences (None = toutes)
+        Returns:
+            pd.DataFrame - Une ligne par occurrence : doc_id, position dans le document (debut, fin),
+            contexteGauche, keyword, contexteDroite
+        """
+        import pandas as pd
+        debuts, fins = self.positions(mot, premier, nb_resultats)
+        return pd.DataFrame(self._colonnes([mot] * len(debuts), debuts, fins, taille_context), columns=COLONNES)
+
+    def concorde_multiple(self, mots, taille_context=30, premier=0, nb_resultats=None):
+        """
+        Concordancier pour plusieurs mots : chaque mot est cherché indépendamment des autres
+        (mêmes occurrences que concorde pour ce mot seul, même quand elles chevauchent celles
+        d'un autre mot, ex : "president" dans "president obama"). Les mots simples sont cherchés
+        en un seul parcours du texte.
+        Args:
+            mots: list - Mots recherchés (mots entiers, insensibles à la casse)
+            taille_context: int - Nombre de caractères de contexte de chaque côté
+            premier: int - Nombre d'occurrences à sauter (pagination)
+            nb_resultats: int - Nombre maximum d'occurrences (None = toutes)
+        Returns:
+            pd.DataFrame - Mêmes colonnes que concorde, dans l'ordre du texte (à la même position,
+            dans l'ordre des mots demandés) ; la colonne keyword donne le mot trouvé (tel qu'il a été demandé)
+        """
+        import pandas as pd
+        if not mots:
+            return pd.DataFrame(columns=COLONNES)
+        fin = None if nb_resultats is None else premier + nb_resultats
+        trouves = list(islice(self._occurrences_multiples(mots), premier, fin))
+        debuts = np.array([t[0] for t in trouves], dtype=np.int64)
+        fins = np.array([t[1] for t in trouves], dtype=np.int64)
+        keywords = [t[2] for t in trouves]
+        return pd.DataFrame(self._colonnes(keywords, debuts, fins, taille_context), columns=COLONNES)
+
+    def compter(self, mots):
+        """
+        Nombre d'occurrences de chaque mot, compté indépendamment des autres mots demandés
+        (même nombre que concorde pour ce mot seul).
+        Args:
+            mots: list - Mots recherchés (mots entiers, insensibles à la casse)
+        Returns:
+            dict - mot -> nombre d'occurrences (0 pour les mots absents)
+        """
+        comptes = {}
+        for mot in mots:
+            if MOT_SIMPLE.fullmatch(mot):
+                # Mots simples : tous les mots du texte sont comptés une fois pour toutes
+                if self._comptes_mots is None:
+                    self._comptes_mots = Counter(map(str.lower, MOT_SIMPLE.findall(self.texte)))
+                comptes[mot] = self._comptes_mots[mot.lower()]
+            else:
+                comptes[mot] = sum(1 for _ in self._occurrences(mot))
+        return comptes
+
+    def _occurrences_multiples(self, mots):
+        # (début, fin, mot demandé) de chaque occurrence d'un des mots, dans l'ordre du texte
+        mots = list(dict.fromkeys(mots))
+        if all(MOT_SIMPLE.fullmatch(mot) for mot in mots):
+            # Mots simples : \bmot\b correspond exactement à une suite de lettres \w+ du texte,
+            # on parcourt donc les mots du texte avec une recherche dans un dictionnaire
+            # (coût indépendant du nombre de mots demandés)
+            cles = {}
+            for mot in mots:
+                cles.setdefault(mot.lower(), []).append(mot)
+            for m in MOT_SIMPLE.finditer(self.texte):
+                for mot in cles.get(m.group().lower(), ()):
+                    yield m.start(), m.end(), mot
+        else:
+            # Un parcours par mot, fusionnés dans l'ordre du texte : chaque mot garde toutes
+            # ses occurrences, même celles qui chevauchent l'occurrence d'un autre mot
+            parcours = [self._parcours(rang, mot) for rang, mot in enumerate(mots)]
+            for debut, _, fin, mot in heapq.merge(*parcours):
+                yield debut, fin, mot
+
+    def _parcours(self, rang, mot):
+        # Occurrences d'un mot, triables par (début, rang du mot dans la demande)
+        for debut, fin in self._occurrences(mot):
+            yield debut, rang, fin, mot
+
+    def iter_concorde(self, mot, taille_context=30):
+        """
+        Version générateur de concorde : les occurrences sont produites une par une
+        (dict avec les mêmes clés que les colonnes de concorde), sans tout garder en mémoire.
+        """
+        texte = self.texte
+        for debut, fin in self._occurrences(mot):
+            i = int(self.documents(debut))
+            debut_doc, fin_doc = int(self.debuts[i]), int(self.fins[i])
+            yield {
+                "doc_id": self.doc_ids[i].item(),
+                "debut": debut - debut_doc,
+                "fin": fin - debut_doc,
+                "contexteGauche": texte[max(debut_doc, debut - taille_context):debut],
+                "keyword": mot,
+                "contexteDroite": texte[fin:min(fin_doc, fin + taille_context)],
+            }
+
+    def _colonnes(self, keywords, debuts, fins, taille_context):
+        # Colonnes du résultat pour des occurrences données par leurs positions dans le texte complet
+        documents = self.documents(debuts)
+        debuts_doc = self.debuts[documents]
+        gauches = np.maximum(debuts_doc, debuts - taille_context)
+        droites = np.minimum(self.fins[documents], fins + taille_context)
+        texte = self.texte
+        return {
+            "doc_id": self.doc_ids[documents],
+            "debut": debuts - debuts_doc,
+            "fin": fins - debuts_doc,
+            "contexteGauche": [texte[g:d] for g, d in zip(gauches.tolist(), debuts.tolist())],
+            "keyword": keywords,
+            "contexteDroite": [texte[f:d] for f, d in zip(fins.tolist(), droites.tolist())],
+        }
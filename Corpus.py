@@ -1,11 +1,14 @@
 
 from Document import DocumentFactory
 from Authors import Author
+from Analysis import CorpusAnalysis
+from Tokenizer import Tokenizer
+from Dates import DatesDocuments
+import Dates
 from datetime import datetime, timezone
-import re 
-import pandas as pd
-from scipy.sparse import csr_matrix
 import numpy as np
+# pandas, scipy et matplotlib sont importés dans les méthodes qui s'en servent,
+# pour que l'import du module reste rapide
 #attributs :
 # nom du corpus
 # dictionnaire id2document
@@ -14,11 +17,106 @@ import numpy as np
 # nauth = nombre d'auteurs
 # On ne va pas s'embêter avec des getters et setters pour l'instant 
 # car les attributs ne sont jamais vraiment privés en Python
+# (sauf id2document : on doit savoir quand les documents changent pour invalider les caches)
+
+
+class _DocumentDict(dict):
+    """
+    Dictionnaire id -> document qui prévient le corpus à chaque modification,
+    pour que les caches dérivés des documents (analyse, texte complet) soient invalidés.
+    """
+
+    def __init__(self, corpus, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._corpus = corpus
+
+    def _modifie(self, ajouts=None, suppressions=None):
+        # ajouts / suppressions : ids concernés ; sans les deux, toute l'analyse est à refaire
+        # getattr : pendant le dépicklage, les éléments sont remis avant l'attribut _corpus
+        corpus = getattr(self, "_corpus", None)
+        if corpus is not None:
+            corpus._documents_modifies(ajouts, suppressions)
+
+    def __setitem__(self, key, value):
+        # Remplacer un document = supprimer l'ancien puis ajouter le nouveau sous le même id
+        existant = key in self
+        super().__setitem__(key, value)
+        self._modifie([key], [key] if existant else None)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._modifie(suppressions=[key])
+
+    def pop(self, key, *default):
+        present = key in self
+        value = super().pop(key, *default)
+        if present:
+            self._modifie(suppressions=[key])
+        return value
+
+    def popitem(self):
+        key, value = super().popitem()
+        self._modifie(suppressions=[key])
+        return key, value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        documents = dict(*args, **kwargs)
+        existants = [key for key in documents if key in self]
+        super().update(documents)
+        self._modifie(list(documents), existants or None)
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def clear(self):
+        super().clear()
+        self._modifie()
+
+
+def _ajouter_publication(id2aut, author_name, doc_id):
+    # Enregistre un document pour un auteur, en créant l'auteur s'il n'existe pas encore
+    if author_name not in id2aut:
+        id2aut[author_name] = Author(name=author_name)
+    id2aut[author_name].add_publication(doc_id)
+
+
+def _retirer_publication(id2aut, author_name, doc_id):
+    # Retire un document d'un auteur, et l'auteur lui-même s'il n'a plus de publication
+    author = id2aut.get(author_name)
+    if author is None or not author.a_publie(doc_id):
+        return
+    author.remove_publication(doc_id)
+    if author.nb_publications == 0:
+        del id2aut[author_name]
+
+
+# Découpage utilisé par défaut par tous les corpus
+TOKENIZER = Tokenizer()
+
+
+def _parser_date_discours(date):
+    # Dates de discours_US.csv, ex : "April 12, 2015" (la chaîne est gardée si le format est inconnu)
+    try:
+        return datetime.strptime(date.strip(), "%B %d, %Y")
+    except ValueError:
+        return date
 
 
 class Corpus:
     # Singleton implementation pour n'avoir qu'une seule instance de Corpus
     _instance = None
+    # Part de documents supprimés au-delà de laquelle l'analyse est compactée
+    SEUIL_COMPACTAGE = 0.25
+    # Nombre de processus utilisés par analyse() pour nettoyer et découper les textes
+    NB_PROCESSUS = 1
+    # Découpage des textes en mots (remplaçable par un autre objet avec decouper / tokens)
+    tokenizer = TOKENIZER
 
     def __new__(cls, *args, **kwargs):
         if cls._instance is None:
@@ -29,11 +127,76 @@ class Corpus:
         if not hasattr(self, '_initialized') or not self._initialized:
             self._initialized = True
             self.title = title
+            self._full_text = None  # Pour stocker la concaténation complète
+            self._concordance = None  # Concaténation + position de chaque document (Concordance.py)
+            self._analyse = None  # Analyse (mots -> ids) faite une seule fois pour tous les documents
+            self._ajouts_en_attente = []  # Documents ajoutés pas encore passés dans l'analyse
+            self._generation = 0  # Incrémenté à chaque modification des documents
+            self._derniere_synchro = {}  # Source -> date du document le plus récent téléchargé
+            self._dates = DatesDocuments()  # Date de publication (epoch int64) de chaque document
             self.id2document = id2document if id2document is not None else {}
             self.id2author = id2author if id2author is not None else {}
             self.ndoc = len(self.id2document)
             self.nauth = len(self.id2author)
-            self._full_text = None  # Pour stocker la concaténation complète
+
+    @property
+    def id2document(self):
+        return self._id2document
+
+    @id2document.setter
+    def id2document(self, value):
+        self._id2document = _DocumentDict(self, value)
+        self._documents_modifies()
+
+    def _documents_modifies(self, ajouts=None, suppressions=None):
+        # Appelé à chaque modification de id2document : les caches ne sont plus valides.
+        # Les ajouts et suppressions sont reportés sur l'analyse existante sans la refaire :
+        # - un document supprimé est marqué dans le masque de l'analyse (tombstone)
+        # - un document ajouté sera analysé au prochain appel de analyse()
+        # - la date de publication des documents ajoutés est normalisée une fois pour toutes (Dates.py)
+        self._generation += 1
+        self._full_text = None
+        self._concordance = None
+        if ajouts is None and suppressions is None:
+            self._dates = DatesDocuments.depuis_documents(self._id2document)
+            self._analyse = None
+            self._ajouts_en_attente = []
+            return
+        for doc_id in suppressions or ():
+            self._dates.supprimer(doc_id)
+        for doc_id in ajouts or ():
+            self._dates.ajouter(doc_id, self._id2document[doc_id].published)
+        if self._analyse is None:
+            return
+        if suppressions:
+            # Un document pas encore analysé est simplement retiré de la file d'attente
+            retires = set(suppressions)
+            self._ajouts_en_attente = [doc_id for doc_id in self._ajouts_en_attente if doc_id not in retires]
+            self._analyse.supprimer_documents(suppressions)
+            if self._analyse.proportion_supprimee() > self.SEUIL_COMPACTAGE:
+                self._analyse.compacter()
+        if ajouts:
+            self._ajouts_en_attente.extend(ajouts)
+
+    def __getstate__(self):
+        # Les caches ne sont pas sauvegardés : ils seront recalculés au besoin
+        state = self.__dict__.copy()
+        state["_full_text"] = None
+        state["_concordance"] = None
+        state["_analyse"] = None
+        state["_ajouts_en_attente"] = []
+        state["_dates"] = None  # Recalculées au chargement, à partir des documents
+        return state
+
+    def __setstate__(self, state):
+        # Compatibilité avec les anciens pickles où id2document était un simple dict
+        state = dict(state)
+        documents = state.pop("_id2document", state.pop("id2document", {}))
+        self.__dict__.update(state)
+        self._generation = state.get("_generation", 0)
+        self._derniere_synchro = state.get("_derniere_synchro", {})
+        self._analyse = None
+        self.id2document = documents
 
     def __str__(self):
             return f"Corpus(title={self.title}, num_documents={len(self.id2document)}, num_authors={len(self.id2author)})"
@@ -67,6 +230,59 @@ class Corpus:
             "average_document_length": avg_length
         }
     
+    def add_documents(self, documents):
+        """
+        Ajoute des documents au corpus sans reconstruire ce qui a déjà été calculé :
+        les nouveaux documents reçoivent des ids à la suite des ids existants, leurs auteurs sont
+        enregistrés, et seuls leurs textes seront analysés (vocabulaire étendu, fréquences mises
+        à jour, lignes ajoutées à la matrice TF). L'IDF est recalculé au prochain besoin.
+        Args:
+            documents: itérable de Document
+        Returns:
+            list - Les ids attribués aux nouveaux documents
+        """
+        prochain_id = max(self.id2document, default=0) + 1
+        nouveaux = {}
+        for document in documents:
+            nouveaux[prochain_id] = document
+            for author_name in document.get_authors_list():
+                _ajouter_publication(self.id2author, author_name, prochain_id)
+            prochain_id += 1
+        self.id2document.update(nouveaux)
+        self.ndoc = len(self.id2document)
+        self.nauth = len(self.id2author)
+        return list(nouveaux)
+
+    def remove_documents(self, doc_ids):
+        """
+        Supprime des documents du corpus et les retire de leurs auteurs.
+        L'analyse n'est pas refaite : les lignes sont marquées comme supprimées et
+        compactées quand leur proportion dépasse SEUIL_COMPACTAGE.
+        Args:
+            doc_ids: itérable d'ids de documents
+        """
+        for doc_id in list(doc_ids):
+            document = self.id2document.pop(doc_id)
+            for author_name in document.get_authors_list():
+                _retirer_publication(self.id2author, author_name, doc_id)
+        self.ndoc = len(self.id2document)
+        self.nauth = len(self.id2author)
+
+    def update_document(self, doc_id, document):
+        """
+        Remplace le document doc_id par un nouveau document, en gardant le même id.
+        Args:
+            doc_id: L'id du document à remplacer
+            document: Document - Le nouveau document
+        """
+        ancien = self.id2document[doc_id]
+        for author_name in ancien.get_authors_list():
+            _retirer_publication(self.id2author, author_name, doc_id)
+        self.id2document[doc_id] = document
+        for author_name in document.get_authors_list():
+            _ajouter_publication(self.id2author, author_name, doc_id)
+        self.nauth = len(self.id2author)
+
     def load_from_net(self, client_id, client_secret, user_agent):
         
         sujet = self.title
@@ -97,60 +313,136 @@ class Corpus:
                 )
 
                 author_name = submission.author.name if submission.author else "Auteur inconnu"
-                if author_name in id2aut:
-                    id2aut[author_name].add_publication(id_doc_counter)
-                else:
-                    aut = Author(name=author_name)
-                    aut.add_publication(id_doc_counter)
-                    id2aut[author_name] = aut
-            dernierDocument = id_doc_counter
+                _ajouter_publication(id2aut, author_name, id_doc_counter)
 
 
 
         ## arxiv
         import urllib.request
-        import xmltodict
+        from ArxivParser import ArxivParser
+        from Ingestion import document_arxiv
         url = f"http://export.arxiv.org/api/query?search_query=all:{sujet}&start=0&max_results=10000"
+        # La réponse est lue en flux : chaque entrée est transformée en document dès qu'elle est lue,
+        # sans charger toute la réponse en mémoire (les documents arxiv suivent les documents reddit)
         with urllib.request.urlopen(url) as response:
-            xml_data = response.read()
-        data_dict = xmltodict.parse(xml_data)
-
-        # ajourter les documents arxiv au corpus a partir du dernier document reddit
-        for i in range(dernierDocument + 1, dernierDocument + 1 + len(data_dict['feed']['entry'])):
-            entry = data_dict['feed']['entry'][i - (dernierDocument + 1)]
-            text = entry.get('summary', '').replace('\n', ' ')
-            if text != "" and len(text) > 20:
+            for entry in ArxivParser(response):
+                resultat = document_arxiv(entry, sujet)
+                if resultat is None:
+                    continue
                 id_doc_counter += 1
-                # On retravaille les auteurs pour avoir une liste de noms pour le dictionnaire auteurs 
-                # (sinon déja géré dans le setter de ArxivDocument)
-                authors = entry.get('author', [])
-                if isinstance(authors, dict):
-                    authors = [authors.get('name', 'Auteur inconnu')]
-                else:
-                    authors = [a.get('name', 'Auteur inconnu') for a in authors]
-                id2doc[id_doc_counter] = DocumentFactory.create_document("arxiv",
-                    title=entry.get('title', 'Titre inconnu'),
-                    authors=authors,
-                    text=entry.get('summary', '').replace('\n', ' '),
-                    published=entry.get('published', 'Inconnu'),
-                    link=entry.get('id', 'Inconnu'),
-                    source="arxiv_" + sujet
-                )
-
+                document, authors = resultat
+                id2doc[id_doc_counter] = document
                 for author_name in authors:
-                    if author_name in id2aut:
-                        id2aut[author_name].add_publication(id_doc_counter)
-                    else:
-                        aut = Author(name=author_name)
-                        aut.add_publication(id_doc_counter)
-                        id2aut[author_name] = aut
+                    _ajouter_publication(id2aut, author_name, id_doc_counter)
 
-            
+        self.id2document = id2doc
+        self.id2author = id2aut
+        self.ndoc = len(id2doc)
+        self.nauth = len(id2aut)
 
+    async def load_from_net_async(self, user_agent="projetPythonM1A", **options):
+        """
+        Comme load_from_net, mais sans praw ni xmltodict : Reddit (listing JSON) et arXiv (pages de
+        l'API Atom) sont téléchargés en même temps avec asyncio (voir Ingestion.py).
+        Dans un script : asyncio.run(corpus.load_from_net_async()) ; dans un notebook : await corpus.load_from_net_async()
+        Args:
+            user_agent: str - User-Agent des requêtes HTTP
+            options: paramètres de Ingestion (taille_page, max_reddit, max_arxiv, nb_connexions, url_reddit, url_arxiv,
+                dossier_cache et ttl pour garder les réponses sur disque et reprendre une ingestion interrompue...)
+        """
+        from Ingestion import Ingestion
+        ingestion = Ingestion(self.title, user_agent=user_agent, **options)
+        reddit, arxiv = await ingestion.telecharger()
+        id2doc = {}
+        id2aut = {}
+        # Documents Reddit d'abord puis arXiv, numérotés à partir de 1 comme load_from_net
+        for doc_id, (document, authors) in enumerate(reddit + arxiv, 1):
+            id2doc[doc_id] = document
+            for author_name in authors:
+                _ajouter_publication(id2aut, author_name, doc_id)
         self.id2document = id2doc
         self.id2author = id2aut
         self.ndoc = len(id2doc)
         self.nauth = len(id2aut)
+        self._derniere_synchro = {source: date for source, date in ingestion.plus_recent.items() if date is not None}
+
+    async def sync_from_net_async(self, user_agent="projetPythonM1A", **options):
+        """
+        Met le corpus à jour sans tout retélécharger : seuls les posts Reddit et articles arXiv plus
+        récents que la dernière ingestion (load_from_net_async ou sync_from_net_async) sont demandés.
+        Les documents déjà présents (même lien) sont ignorés, les autres sont ajoutés avec add_documents :
+        les ids existants ne changent pas et l'analyse déjà faite est complétée, pas refaite.
+        Sans ingestion précédente, tout est téléchargé (comme load_from_net_async, mais en ajoutant).
+        Args:
+            user_agent: str - User-Agent des requêtes HTTP
+            options: paramètres de Ingestion (voir load_from_net_async)
+        Returns:
+            list - Les ids des documents ajoutés
+        """
+        from Ingestion import Ingestion
+        ingestion = Ingestion(self.title, user_agent=user_agent,
+                              depuis_reddit=self._derniere_synchro.get("reddit"),
+                              depuis_arxiv=self._derniere_synchro.get("arxiv"), **options)
+        reddit, arxiv = await ingestion.telecharger()
+        liens = {document.link for document in self.id2document.values()}
+        nouveaux = []
+        for document, _ in reddit + arxiv:
+            if document.link not in liens:
+                liens.add(document.link)
+                nouveaux.append(document)
+        ids = self.add_documents(nouveaux) if nouveaux else []
+        for source, date in ingestion.plus_recent.items():
+            if date is not None:
+                self._derniere_synchro[source] = max(date, self._derniere_synchro.get(source, date))
+        return ids
+
+    def load_from_csv(self, filename, chunksize=1000, sep="\t", source="discours_US"):
+        """
+        Charge un fichier de discours au format de discours_US.csv (speaker, text, date, descr, link)
+        en le lisant ligne par ligne, par paquets de chunksize documents :
+        chaque paquet est ajouté au corpus puis analysé tout de suite, sans jamais
+        charger tout le fichier dans un DataFrame.
+        Args:
+            filename: str - Chemin du fichier CSV/TSV
+            chunksize: int - Nombre de documents par paquet
+            sep: str - Séparateur de colonnes
+            source: str - Source des documents créés
+        Returns:
+            list - Les ids des documents ajoutés
+        """
+        import csv
+        import sys
+        # Certains discours dépassent la taille de champ par défaut du module csv
+        csv.field_size_limit(min(sys.maxsize, 2**31 - 1))
+        dates = {}  # Chaque date (souvent répétée) n'est convertie qu'une fois
+        ids = []
+        self.analyse()
+        with open(filename, newline="", encoding="utf-8") as f:
+            lecteur = csv.reader(f, delimiter=sep)
+            colonnes = {nom: i for i, nom in enumerate(next(lecteur))}
+            paquet = []
+            for ligne in lecteur:
+                if not ligne:
+                    continue
+                date = ligne[colonnes["date"]]
+                if date not in dates:
+                    dates[date] = _parser_date_discours(date)
+                paquet.append(DocumentFactory.create_document("speech",
+                    title=ligne[colonnes["descr"]],
+                    authors=ligne[colonnes["speaker"]],
+                    text=ligne[colonnes["text"]],
+                    published=dates[date],
+                    link=ligne[colonnes["link"]],
+                    source=source
+                ))
+                if len(paquet) >= chunksize:
+                    ids += self.add_documents(paquet)
+                    self.analyse()
+                    paquet = []
+            if paquet:
+                ids += self.add_documents(paquet)
+                self.analyse()
+        return ids
 
     def save_pickle(self, filename):
         import pickle
@@ -164,61 +456,132 @@ class Corpus:
         self.title = corpus.title
         self.id2document = corpus.id2document
         self.id2author = corpus.id2author
+        self._derniere_synchro = getattr(corpus, "_derniere_synchro", {})
+        self.ndoc = len(self.id2document)
+        self.nauth = len(self.id2author)
 
-    def search(self, mot): 
- 
-        if self._full_text is None:
-            self._full_text = " ".join(doc.text for doc in self.id2document.values())
-            # self._full_text est initialisé à None et concatène tous les textes des documents la première fois que search est appelé.​
-        pattern = re.compile(r'\b' + re.escape(mot) + r'\b', re.IGNORECASE)
-        
-        matches = pattern.findall(self._full_text)
+    def save_store(self, dossier):
+        """
+        Sauvegarde les documents sans pickle : tous les textes dans un seul fichier
+        (relu ensuite à la demande) et les autres attributs en colonnes (voir DocumentStore.py).
+        Args:
+            dossier: str - Dossier de destination
+        """
+        from DocumentStore import save_documents
+        save_documents(dossier, self.id2document, title=self.title, derniere_synchro=self._derniere_synchro)
+
+    def load_from_store(self, dossier):
+        """
+        Charge des documents sauvegardés avec save_store. Les textes ne sont pas chargés en mémoire :
+        ils sont lus dans le fichier projeté en mémoire quand document.text est utilisé.
+        Les auteurs sont reconstruits à partir des documents.
+        Args:
+            dossier: str - Dossier écrit par save_store
+        """
+        from DocumentStore import load_documents
+        id2doc, metadonnees = load_documents(dossier)
+        id2aut = {}
+        for doc_id, document in id2doc.items():
+            for author_name in document.get_authors_list():
+                _ajouter_publication(id2aut, author_name, doc_id)
+        self.title = metadonnees.get("title", self.title)
+        self._derniere_synchro = metadonnees.get("derniere_synchro", {})
+        self.id2document = id2doc
+        self.id2author = id2aut
+        self.ndoc = len(id2doc)
+        self.nauth = len(id2aut)
+
+    def compacter_documents(self):
+        """
+        Range les documents dans un DocumentStore en mémoire (colonnes de tableaux typés, chaînes
+        internées) et les remplace par des documents légers qui lisent leurs attributs dans ces colonnes.
+        Les ids, les valeurs et l'API des documents ne changent pas, les analyses restent valables ;
+        seule la mémoire occupée diminue (utile pour des millions de documents).
+        Returns:
+            DocumentStore - Le store créé
+        """
+        from DocumentStore import DocumentStore
+        store, documents = DocumentStore.depuis_documents(self.id2document.values())
+        # Mêmes documents (mêmes valeurs) : pas besoin d'invalider les caches via _documents_modifies
+        for doc_id, document in zip(list(self.id2document), documents):
+            dict.__setitem__(self.id2document, doc_id, document)
+        return store
+
+    def _texte_complet(self):
+        # Concaténation de tous les textes (séparés par une espace) et position de chaque document,
+        # calculées une seule fois puis invalidées à chaque modification des documents
+        if self._concordance is None:
+            from Concordance import Concordance
+            self._concordance = Concordance(list(self.id2document), [doc.text for doc in self.id2document.values()])
+            self._full_text = self._concordance.texte
+        return self._concordance
+
+    def search(self, mot, par_document=False, nb_documents=None): 
+        """
+        Recherche un mot (mot entier, insensible à la casse) dans tous les textes.
+        Args:
+            mot: str - Mot recherché
+            par_document: bool - Si True, retourne le nombre d'occurrences par document
+            nb_documents: int - Avec par_document, s'arrêter après les nb_documents premiers documents trouvés
+        Returns:
+            list - Les occurrences trouvées, ou dict doc_id -> nombre d'occurrences si par_document
+        """
+        # self._full_text concatène tous les textes des documents la première fois qu'il est utilisé,
+        # avec la position de début de chaque document (pour retrouver le document d'une occurrence)
+        concordance = self._texte_complet()
+        if par_document:
+            return concordance.comptes_par_document(mot, nb_documents)
+        # Occurrences dans un seul document (une expression ne passe pas d'un document au suivant)
+        debuts, fins = concordance.positions(mot)
+        matches = [self._full_text[debut:fin] for debut, fin in zip(debuts.tolist(), fins.tolist())]
         return matches
 
-    def concorde(self,mot, taille_context=30):
-        
-        if self._full_text is None:
-            self._full_text = " ".join(doc.text for doc in self.id2document.values())
-            # self._full_text est initialisé à None et concatène tous les textes des documents la première fois que search est appelé.​
-            # Trouver toutes les positions du mot-clé (mot entier)
-        pattern = r'\b' + re.escape(mot) + r'\b'
-        # On cherche toutes les occurrences du mot avec leur position
-        matches = re.finditer(pattern, self._full_text, re.IGNORECASE)
-        # DataFrame pour stocker les résultats
-        results = pd.DataFrame(columns=["contexteGauche", "keyword", "contexteDroite"])
-
-        for match in matches:
-            start_pos = match.start()
-            end_pos = match.end()
-
-            # Recherche du début du contexte (30 caractères avant ou jusqu'à un espace) 
-            context_start = max(0, start_pos - taille_context)
-            # Trouver le dernier espace avant la position cible
-            space_before = self._full_text.rfind(' ', context_start, start_pos -taille_context)
-            if space_before != -1:
-                context_start = space_before + 1
-
-            # Recherche de la fin du contexte (30 caractères après ou jusqu'à un espace)
-            context_end = min(len(self._full_text), end_pos + taille_context)
-            # Trouver le prochain espace après la position cible
-            space_after = self._full_text.find(' ', end_pos + taille_context, context_end)
-            if space_after != -1:
-                context_end = space_after
-
-            
-            # Ajouter le résultat au DataFrame
-            results.loc[len(results)] = {
-                "contexteGauche": self._full_text[context_start:start_pos],
-                "keyword": mot,
-                "contexteDroite": self._full_text[end_pos:context_end],
-            }
-        return results
-        
-            # re.escape(keyword) permet d’échapper les caractères spéciaux du mot-clé pour éviter des erreurs dans la regex.​
-            # \b garantit qu’on cherche le mot entier, pas une sous-partie.​
-            # re.IGNORECASE rend la recherche insensible à la casse.​
-            # re.findall retourne toutes les occurrences du mot-clé.​
-    
+    def concorde(self, mot, taille_context=30, premier=0, nb_resultats=None):
+        """
+        Concordancier : pour chaque occurrence du mot (mot entier, insensible à la casse),
+        le contexte gauche et droit, coupé aux limites du document qui contient l'occurrence.
+        Args:
+            mot: str - Mot recherché
+            taille_context: int - Nombre de caractères de contexte de chaque côté
+            premier: int - Nombre d'occurrences à sauter (pagination)
+            nb_resultats: int - Nombre maximum d'occurrences retournées (None = toutes)
+        Returns:
+            pd.DataFrame - Colonnes doc_id, debut, fin (position dans le document),
+            contexteGauche, keyword, contexteDroite
+        """
+        return self._texte_complet().concorde(mot, taille_context, premier, nb_resultats)
+
+    def concorde_multiple(self, mots, taille_context=30, premier=0, nb_resultats=None):
+        """
+        Concordancier pour plusieurs mots à la fois : chaque mot donne les mêmes occurrences que
+        concorde pour ce mot seul (les mots simples sont cherchés en un seul parcours du texte).
+        Args:
+            mots: list - Mots recherchés
+            taille_context: int - Nombre de caractères de contexte de chaque côté
+            premier: int - Nombre d'occurrences à sauter (pagination)
+            nb_resultats: int - Nombre maximum d'occurrences retournées (None = toutes)
+        Returns:
+            pd.DataFrame - Mêmes colonnes que concorde, keyword = le mot trouvé
+        """
+        return self._texte_complet().concorde_multiple(mots, taille_context, premier, nb_resultats)
+
+    def compter_mots(self, mots):
+        """
+        Nombre d'occurrences de plusieurs mots, chacun compté indépendamment des autres.
+        Args:
+            mots: list - Mots recherchés
+        Returns:
+            dict - mot -> nombre d'occurrences
+        """
+        return self._texte_complet().compter(mots)
+
+    def iter_concorde(self, mot, taille_context=30):
+        """
+        Comme concorde, mais produit les occurrences une par une (dict par occurrence) :
+        utile pour parcourir les mots très fréquents sans construire tout le DataFrame.
+        """
+        return self._texte_complet().iter_concorde(mot, taille_context)
+
     def nettoyer_texte_full_text(self):
         """
         Nettoie une chaîne :
@@ -228,38 +591,11 @@ class Corpus:
           - suppression de la ponctuation
           - normalisation des espaces
         """
-        if self._full_text is None:
-            self._full_text = " ".join(doc.text for doc in self.id2document.values())
-        
-        texte = self._full_text
-
-        # minuscules
-        texte_nettoye = texte.lower()
-        # normalisation des sauts de ligne et tabulations
-        texte_nettoye = texte_nettoye.replace("\r\n", "\n").replace("\r", "\n")
-        texte_nettoye = texte_nettoye.replace("\n", " ").replace("\t", " ")
-        # suppression des URLs
-        texte_nettoye = re.sub(r"https?://\S+|www\.\S+", "", texte_nettoye)
-        # suppression de la ponctuation (conserve lettres/chiffres/espaces)
-        texte_nettoye = re.sub(r"[^\w\s]", " ", texte_nettoye, flags=re.UNICODE)
-        # normalisation des espaces
-        texte_nettoye = re.sub(r"\s+", " ", texte_nettoye).strip()
-        
-        return texte_nettoye
+        return " ".join(self.tokenizer.decouper(self._texte_complet().texte))
 
     # méthode interne à l'objet pour nettoyer le texte de chaque document
     def _nettoyer_texte(self, texte):
-        texte_nettoye = texte.lower()
-        # normalisation des sauts de ligne et tabulations
-        texte_nettoye = texte_nettoye.replace("\r\n", "\n").replace("\r", "\n")
-        texte_nettoye = texte_nettoye.replace("\n", " ").replace("\t", " ")
-        # suppression des URLs
-        texte_nettoye = re.sub(r"https?://\S+|www\.\S+", "", texte_nettoye)
-        # suppression de la ponctuation (conserve lettres/chiffres/espaces)
-        texte_nettoye = re.sub(r"[^\w\s]", " ", texte_nettoye, flags=re.UNICODE)
-        # normalisation des espaces
-        texte_nettoye = re.sub(r"\s+", " ", texte_nettoye).strip()
-        return texte_nettoye
+        return " ".join(self.tokenizer.decouper(texte))
     
     def vocabulaire(self, display=False):
         """
@@ -267,28 +603,16 @@ class Corpus:
         Retourne un DataFrame avec les mots, leur fréquence et le nombre de documents où ils apparaissent.
         """
 
-        mot_freq = {}
-        # 1 boucle pour nettoyer et avoir les mots dans chaque document
-        for doc_id, document in self.id2document.items():
-            texte_nettoye = self._nettoyer_texte(document.text)
-            mots = texte_nettoye.split()
-
-            # 1 boucle pour compter les fréquences 
-            for mot in mots:
-                if mot not in mot_freq:
-                    mot_freq[mot] = {"frequence": 0, "frequence_nb_doc": set()}
-                mot_freq[mot]["frequence"] += 1
-                mot_freq[mot]["frequence_nb_doc"].add(doc_id)
-
-        # Construction du DataFrame
-        data = []
-        for mot, data_mot in mot_freq.items():
-            data.append({
-                "mot": mot,
-                "frequence": data_mot["frequence"],
-                "frequence_nb_doc": len(data_mot["frequence_nb_doc"])
-            })
-        freq = pd.DataFrame(data)
+        # Les mots et leurs fréquences viennent de l'analyse du corpus (textes nettoyés une seule fois)
+        import pandas as pd
+        analyse = self.analyse()
+        freq = pd.DataFrame({
+            "mot": analyse.mots,
+            "frequence": analyse.frequences,
+            "frequence_nb_doc": analyse.frequences_nb_doc
+        })
+        # Mots qui n'apparaissent plus que dans des documents supprimés (en attente de compactage)
+        freq = freq[freq["frequence_nb_doc"] > 0]
 
         if display:
             import matplotlib.pyplot as plt
@@ -333,70 +657,99 @@ class Corpus:
 
         return freq
     
+    def analyse(self, nb_processus=None):
+        """
+        Retourne l'analyse du corpus (chaque document nettoyé et converti en ids de mots une seule fois).
+        Elle est gardée en cache et n'est refaite que si les documents changent.
+        Args:
+            nb_processus: int - Nombre de processus pour analyser les documents (par défaut NB_PROCESSUS) ;
+                le résultat est identique quel que soit le nombre de processus
+        """
+        nb_processus = self.NB_PROCESSUS if nb_processus is None else nb_processus
+        if self._analyse is None:
+            analyse = CorpusAnalysis(self.tokenizer.decouper)
+            analyse.ajouter_documents(((doc_id, document.text) for doc_id, document in self.id2document.items()),
+                                      nb_processus=nb_processus)
+            self._analyse = analyse
+            self._ajouts_en_attente = []
+        elif self._ajouts_en_attente:
+            # Seuls les documents ajoutés depuis la dernière analyse sont nettoyés
+            ajouts, self._ajouts_en_attente = self._ajouts_en_attente, []
+            self._analyse.ajouter_documents(((doc_id, self.id2document[doc_id].text) for doc_id in ajouts),
+                                            nb_processus=nb_processus)
+        return self._analyse
+
     #TD7 
     def _construire_dictionnaire_vocab(self):
-        # Appel de la fonction précédente pour obtenir les mots et fréquences
-        df_vocab = self.vocabulaire()
-        df_vocab.sort_values(by="mot", inplace=True)
+        # Dictionnaire trié par mot, l'id est l'indice de colonne du mot dans les matrices
+        analyse = self.analyse()
         vocab = {}
-        for i, row in df_vocab.iterrows():
-            vocab[row["mot"]] = {
+        for i in sorted(np.flatnonzero(analyse.frequences_nb_doc), key=analyse.mots.__getitem__):
+            vocab[analyse.mots[i]] = {
                 "id": i,
-                "frequence": row["frequence"],
-                "frequence_nb_doc": row["frequence_nb_doc"]
+                "frequence": analyse.frequences[i],
+                "frequence_nb_doc": analyse.frequences_nb_doc[i]
             }
 
         return vocab
     
     def construire_matrice_tf(self):
-
-        vocab = self._construire_dictionnaire_vocab()
-
-        # vocab est le dictionnaire avec les mots et leurs id
-        num_docs = len(self.id2document)
-        num_terms = len(vocab)
-        
-        # Préparer les listes pour csr_matrix
-        data = []
-        row_indices = []
-        col_indices = []
-        #On récupère la liste des IDs de documents et on crée un mapping ID -> index
-        doc_ids = list(self.id2document.keys())
-        doc_id_to_index = {doc_id: index for index, doc_id in enumerate(doc_ids)}
-
-
-        for doc_id, document in self.id2document.items():
-            texte_nettoye = self._nettoyer_texte(document.text)
-            mots = texte_nettoye.split()
-            
-            # On va recalculer la fréquence des mots dans chaque document mais cette fois dans une matrice creuse
-            # On utilise vocab pour obtenir l'index de chaque mot dans la matrice   
-            for mot in mots:
-                if mot in vocab:
-                    data.append(1)  # Incrémenter pour chaque occurrence
-                    row_indices.append(doc_id_to_index[doc_id])
-                    col_indices.append(vocab[mot]["id"])
-        
-        # Créer la matrice creuse
-        mat_TF = csr_matrix((data, (row_indices, col_indices)), shape=(num_docs, num_terms))
-        return mat_TF
+        # Les lignes suivent l'ordre des documents de l'analyse (sans les documents supprimés)
+        # et les colonnes les ids du vocabulaire. On retourne une copie car la matrice est en cache.
+        analyse = self.analyse()
+        return analyse.matrice_tf()[~analyse.supprime]
 
 # TFxIDF(mot,document)=TF(mot,document)×log( N/NbDoc(mot))
     def construire_matrice_tfidf(self):
-        #On utilise le dictionnaire vocab qui contient "mot", "frequence", "frequence_nb_doc" et "id"
-        vocab = self._construire_dictionnaire_vocab()
-        # On construit la matrice TF classique
-        mat_TF = self.construire_matrice_tf()
-        # Nombre total de documents
-        N = len(self.id2document)
-        # Appliquer la formule TFxIDF
-        # Calculer IDF pour chaque mot
-        idf = np.array([np.log(N / info["frequence_nb_doc"]) for info in vocab.values()])
-        # Appliquer IDF à chaque colonne de la matrice TF
-        mat_TFxIDF = mat_TF.multiply(idf)
+        analyse = self.analyse()
+        # IDF calculé pour chaque mot dans l'ordre des colonnes de la matrice TF
+        # puis appliqué à chaque colonne de la matrice TF
+        mat_TFxIDF = analyse.matrice_tfidf()[~analyse.supprime]
         return mat_TFxIDF
     
 
+    def dates_publication(self, doc_ids=None):
+        """
+        Dates de publication normalisées (voir Dates.py), calculées quand les documents ont été ajoutés.
+        Une date modifiée directement sur un document (document.published = ...) n'est pas vue :
+        il faut remplacer le document (update_document).
+        Args:
+            doc_ids: itérable d'ids (None : tous les documents, dans l'ordre d'ajout)
+        Returns:
+            np.ndarray - Secondes depuis 1970 (UTC) en int64, Dates.INCONNUE si la date est inconnue ;
+            sans doc_ids, le couple (ids, dates)
+        """
+        if doc_ids is None:
+            return self._dates.tous()
+        return self._dates.dates(doc_ids)
+
+    def documents_entre(self, debut=None, fin=None):
+        """
+        Ids des documents publiés entre debut et fin (inclus), en une comparaison sur le tableau des dates.
+        Une fin donnée au jour près inclut toute la journée.
+        Args:
+            debut, fin: datetime, date ou chaîne de date (None : pas de limite)
+        Returns:
+            np.ndarray - Les ids, dans l'ordre d'ajout
+        Raises:
+            ValueError - Si une borne n'est pas une date lisible
+        """
+        doc_ids, epochs = self._dates.tous()
+        return doc_ids[Dates.entre(epochs, debut, fin)]
+
+    def documents_recents(self, nb_documents=None):
+        """
+        Ids des documents du plus récent au plus ancien (dates inconnues à la fin).
+        Args:
+            nb_documents: int - Nombre de documents retournés (None : tous)
+        Returns:
+            np.ndarray - Les ids
+        """
+        doc_ids, epochs = self._dates.tous()
+        # Tri stable par date décroissante ; INCONNUE est le plus petit int64 : elle finit dernière
+        ordre = np.argsort(-epochs.astype(np.float64), kind="stable")
+        return doc_ids[ordre[:nb_documents]]
+
     def get_all_publication_dates(self):
         dates = []
         for document in self.id2document.values():
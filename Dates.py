@@ -0,0 +1,185 @@
+from array import array
+from datetime import date, datetime, timezone
+from functools import lru_cache
+import numpy as np
+
+# Dates de publication normalisées en secondes depuis le 1er janvier 1970 (UTC), sur int64.
+# Les formats d'origine sont variés : datetime, "dd-mm-YYYY" (Reddit), ISO 8601 (arXiv),
+# "Month D, YYYY" (discours_US.csv). Une date sans fuseau horaire est considérée en UTC.
+# INCONNUE (le plus petit int64) est la valeur de NaT : un tableau d'epochs vu en datetime64[s]
+# donne directement NaT pour les dates inconnues.
+INCONNUE = np.iinfo(np.int64).min
+FORMATS = ("%d-%m-%Y", "%B %d, %Y")
+# Granularités des périodes : unité numpy (datetime64) de chaque période
+GRANULARITES = {"jour": "D", "mois": "M", "annee": "Y"}
+JOUR = 86400  # Secondes
+
+
+def epoch(published):
+    """
+    Args:
+        published: datetime, date ou chaîne dans un des formats du corpus
+    Returns:
+        int - Secondes depuis le 1er janvier 1970 (UTC), ou INCONNUE si la date est absente ou illisible
+    """
+    if isinstance(published, datetime):
+        if published.tzinfo is None:
+            published = published.replace(tzinfo=timezone.utc)
+        return int(published.timestamp())
+    if isinstance(published, date):
+        return int(datetime(published.year, published.month, published.day, tzinfo=timezone.utc).timestamp())
+    if isinstance(published, str):
+        return _epoch_chaine(published.strip())
+    return INCONNUE
+
+
+@lru_cache(maxsize=4096)
+def _epoch_chaine(chaine):
+    # Les mêmes chaînes reviennent souvent (un jour = beaucoup de posts) : chacune n'est lue qu'une fois
+    if not chaine:
+        return INCONNUE
+    try:
+        return epoch(datetime.fromisoformat(chaine.replace("Z", "+00:00")))
+    except ValueError:
+        pass
+    for format_date in FORMATS:
+        try:
+            return epoch(datetime.strptime(chaine, format_date))
+        except ValueError:
+            pass
+    return INCONNUE
+
+
+def vers_datetime64(epochs):
+    """Tableau d'epochs -> tableau datetime64[s] (NaT pour les dates inconnues), sans copie."""
+    return np.asarray(epochs, dtype=np.int64).view("datetime64[s]")
+
+
+def periodes(epochs, granularite):
+    """
+    Période (jour, mois ou année) de chaque date, en datetime64 (NaT pour les dates inconnues).
+    Args:
+        epochs: np.ndarray - Dates en epochs
+        granularite: str - "jour", "mois" ou "annee"
+    """
+    if granularite not in GRANULARITES:
+        raise ValueError(f"Unknown granularity: {granularite}")
+    return vers_datetime64(epochs).astype(f"datetime64[{GRANULARITES[granularite]}]")
+
+
+def granularite_auto(epochs, max_periodes=20):
+    """Granularité la plus fine qui donne au plus max_periodes périodes distinctes."""
+    epochs = np.asarray(epochs, dtype=np.int64)
+    epochs = epochs[epochs != INCONNUE]
+    for granularite in ("jour", "mois"):
+        if len(np.unique(periodes(epochs, granularite))) <= max_periodes:
+            return granularite
+    return "annee"
+
+
+def entre(epochs, debut=None, fin=None):
+    """
+    Masque des dates comprises entre debut et fin (inclus) ; les dates inconnues sont exclues.
+    Une fin donnée au jour près (date, "2025-12-25", "25-12-2025"...) inclut toute la journée.
+    Args:
+        debut, fin: datetime, date ou chaîne (None : pas de limite)
+    Raises:
+        ValueError - Si une borne n'est pas une date lisible
+    """
+    epochs = np.asarray(epochs, dtype=np.int64)
+    masque = epochs != INCONNUE
+    if debut is not None:
+        masque &= epochs >= _borne(debut)
+    if fin is not None:
+        # Fin exclusive : début du jour suivant pour une date sans heure, seconde suivante sinon
+        masque &= epochs < _borne(fin) + (JOUR if _jour_seul(fin) else 1)
+    return masque
+
+
+def _borne(valeur):
+    resultat = epoch(valeur)
+    if resultat == INCONNUE:
+        raise ValueError(f"Unknown date: {valeur!r}")
+    return resultat
+
+
+def _jour_seul(valeur):
+    # Vrai si la date n'a pas d'heure : date, chaîne ISO "YYYY-MM-DD" ou un des FORMATS (tous au jour près)
+    if isinstance(valeur, datetime):
+        return False
+    if isinstance(valeur, date):
+        return True
+    chaine = valeur.strip()
+    try:
+        date.fromisoformat(chaine)
+        return True
+    except ValueError:
+        pass
+    try:
+        datetime.fromisoformat(chaine.replace("Z", "+00:00"))
+        return False
+    except ValueError:
+        return True
+
+
+class DatesDocuments:
+    """
+    Date (epoch) de chaque document du corpus, calculée une seule fois, quand le document est ajouté.
+    Deux tableaux alignés (array int64) : id du document et date ; un document supprimé garde sa place
+    avec une date INCONNUE, les places libres sont retirées quand elles deviennent majoritaires.
+    """
+
+    def __init__(self):
+        self._doc_ids = array("q")
+        self._epochs = array("q")
+        self._positions = {}  # doc_id -> position dans les tableaux
+
+    @classmethod
+    def depuis_documents(cls, id2document):
+        dates = cls()
+        for doc_id, document in id2document.items():
+            dates.ajouter(doc_id, document.published)
+        return dates
+
+    def __len__(self):
+        return len(self._positions)
+
+    def ajouter(self, doc_id, published):
+        valeur = epoch(published)
+        position = self._positions.get(doc_id)
+        if position is None:
+            self._positions[doc_id] = len(self._epochs)
+            self._doc_ids.append(doc_id)
+            self._epochs.append(valeur)
+        else:
+            self._epochs[position] = valeur
+
+    def supprimer(self, doc_id):
+        position = self._positions.pop(doc_id, None)
+        if position is None:
+            return
+        self._epochs[position] = INCONNUE
+        if len(self._positions) < len(self._epochs) // 2:
+            self._compacter()
+
+    def _compacter(self):
+        gardees = sorted(self._positions.values())
+        self._doc_ids = array("q", (self._doc_ids[p] for p in gardees))
+        self._epochs = array("q", (self._epochs[p] for p in gardees))
+        self._positions = {doc_id: p for p, doc_id in enumerate(self._doc_ids)}
+
+    def tous(self):
+        """
+        Returns:
+            (np.ndarray, np.ndarray) - Ids des documents du corpus et leurs dates (int64), dans l'ordre d'ajout
+        """
+        positions = np.sort(np.fromiter(self._positions.values(), dtype=np.int64, count=len(self._positions)))
+        return np.array(self._doc_ids, dtype=np.int64)[positions], np.array(self._epochs, dtype=np.int64)[positions]
+
+    def dates(self, doc_ids):
+        """Dates (int64) des documents donnés, INCONNUE pour les ids absents."""
+        doc_ids = np.asarray(doc_ids).tolist()
+        positions = np.fromiter((self._positions.get(doc_id, -1) for doc_id in doc_ids), dtype=np.int64, count=len(doc_ids))
+        # Copie (np.array) : une vue sur l'array l'empêcherait de grandir
+        epochs = np.append(np.array(self._epochs, dtype=np.int64), INCONNUE)
+        return epochs[positions]
@@ -3,6 +3,15 @@ from abc import ABC, abstractmethod
 # Classe Document mere avec uniquement le setter authors abstrait ainsi que le constructeur
 #  il devront etre reécrits dans les classes filles
 class Document(ABC):
+    # __slots__ : pas de __dict__ par document (beaucoup moins de mémoire pour des millions de documents)
+    __slots__ = ("_title", "_authors", "_text", "_published", "_link", "_source", "_store", "_row")
+    # Type utilisé par DocumentFactory (et pour relire les documents sauvegardés)
+    doc_type = None
+    # Document lié à la ligne _row d'un DocumentStore : le texte et les attributs qui n'ont pas été
+    # modifiés sur le document (slots vides) sont lus dans les colonnes du store (voir __getattr__)
+    _COLONNES = {"_title": "title", "_authors": "authors", "_published": "published", "_link": "link",
+                 "_source": "source", "_comments_count": "comments_count", "_subreddit": "subreddit"}
+
     @abstractmethod
     def __init__(self, title, authors, text, published, link, source="unknown"):
         self._title = title
@@ -11,6 +20,30 @@ class Document(ABC):
         self._published = published
         self._link = link
         self._source = source
+        self._store = None
+        self._row = None
+
+    def __getattr__(self, nom):
+        # Appelé seulement si l'attribut n'est pas trouvé, donc pour un slot vide d'un document du store
+        colonne = self._COLONNES.get(nom)
+        if colonne is None or self._store is None:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {nom!r}")
+        return self._store.valeur(colonne, self._row)
+
+    def __getstate__(self):
+        # Le document est picklé avec toutes ses valeurs (lues dans le store si besoin), sans le store
+        etat = {nom: getattr(self, nom) for nom in _slots(type(self))}
+        etat["_text"] = self.text
+        etat["_store"] = None
+        etat["_row"] = None
+        return etat
+
+    def __setstate__(self, etat):
+        # Accepte aussi les anciens pickles (__dict__ sans _store ni _row)
+        self._store = None
+        self._row = None
+        for nom, valeur in etat.items():
+            setattr(self, nom, valeur)
 
     @property
     def source(self):
@@ -39,6 +72,8 @@ class Document(ABC):
             self._authors = value
     @property
     def text(self):
+        if self._text is None and self._store is not None:
+            return self._store.texte(self._row)
         return self._text
     @text.setter
     def text(self, value):
@@ -86,6 +121,16 @@ class Document(ABC):
                 self.published == other.published and
                 self.link == other.link)
      
+    def get_authors_list(self):
+        # Liste des noms d'auteurs, que les auteurs soient stockés en chaîne, en liste de noms ou de dicts
+        auteurs = self._authors
+        if isinstance(auteurs, str):
+            return [auteurs]
+        if isinstance(auteurs, dict):
+            auteurs = [auteurs]
+        noms = [a.get('name', 'Auteur inconnu') if isinstance(a, dict) else str(a) for a in auteurs or []]
+        return noms if noms else ["Auteur inconnu"]
+
     def get_citation(self):
         authors_str = ', '.join(self.authors)
         return f"{authors_str} ({self.published}). {self.title}. Retrieved from {self.link}"
@@ -93,6 +138,9 @@ class Document(ABC):
 # La classe RedditDocument hérite de Document et ajoute des attributs spécifiques à Reddit et leurs getters et setters
 # On reécris aussi les méthodes __str__ et __repr__
 class RedditDocument(Document):
+    __slots__ = ("_comments_count", "_subreddit")
+    doc_type = "reddit"
+
     def __init__(self, title, authors, text, published, link, source="reddit", comments_count=0, subreddit=None):
         super().__init__(title, authors, text, published, link, source)
         self._comments_count = comments_count
@@ -139,6 +187,9 @@ class RedditDocument(Document):
 
 # La classe ArxivDocument hérite de Document et on réécris le setter de authors pour gérer les auteurs sous forme de liste de dictionnaires /liste
 class ArxivDocument(Document):
+    __slots__ = ()
+    doc_type = "arxiv"
+
     def __init__(self, title, authors, text, published, link, source="arxiv"):
   
         # Appel du constructeur de la classe mère 
@@ -167,6 +218,31 @@ class ArxivDocument(Document):
             raise TypeError("authors must be a list/tuple of strings or a comma-separated string")
 
 
+# La classe SpeechDocument représente un discours (ex : discours_US.csv), l'auteur est l'orateur
+class SpeechDocument(Document):
+    __slots__ = ()
+    doc_type = "speech"
+
+    def __init__(self, title, authors, text, published, link, source="speech"):
+        super().__init__(title, authors, text, published, link, source)
+
+    @property
+    def authors(self):
+        return super().authors
+    @authors.setter
+    def authors(self, value):
+        super(SpeechDocument, self.__class__).authors.fset(self, value)
+
+    @property
+    def speaker(self):
+        return self._authors
+
+
+def _slots(classe):
+    # Tous les slots d'une classe de document (ceux des classes mères compris)
+    return [nom for c in classe.__mro__ for nom in c.__dict__.get("__slots__", ())]
+
+
 # Création d'une factory pour créer des documents en fonction de leur type, pratique pour le code dans Corpus.py
 class DocumentFactory:
     @staticmethod
@@ -175,5 +251,7 @@ class DocumentFactory:
             return RedditDocument(*args, **kwargs)
         elif doc_type == "arxiv":
             return ArxivDocument(*args, **kwargs)
+        elif doc_type == "speech":
+            return SpeechDocument(*args, **kwargs)
         else:
             raise ValueError(f"Unknown document type: {doc_type}")
\ No newline at end of file
@@ -0,0 +1,296 @@
+import json
+import mmap
+import os
+import sys
+from array import array
+from datetime import date, datetime
+import numpy as np
+
+# Stockage des documents en colonnes (DocumentStore) : une colonne par attribut, dans des tableaux
+# typés (array) plutôt qu'un objet Python par valeur. Les documents du corpus ne sont plus que des
+# références (store, ligne) dont les attributs sont lus dans les colonnes à la demande.
+#
+# Stockage des documents sur disque, sans pickle :
+#   - texts.bin     : tous les textes encodés en UTF-8, les uns à la suite des autres
+#   - offsets.npy   : position de début de chaque texte dans texts.bin (n + 1 valeurs)
+#   - doc_ids.npy   : id de chaque document
+#   - metadata.json : les autres attributs, une liste par colonne (titre, auteurs, lien, ...)
+# Les textes sont lus à la demande dans le fichier projeté en mémoire (mmap).
+TEXTES = "texts.bin"
+OFFSETS = "offsets.npy"
+DOC_IDS = "doc_ids.npy"
+METADONNEES = "metadata.json"
+
+
+class TextStore:
+    """
+    Accès en lecture aux textes d'un fichier texts.bin : le texte i est la tranche
+    [offsets[i], offsets[i + 1]) du fichier projeté en mémoire, décodée à chaque lecture.
+    """
+
+    def __init__(self, dossier):
+        self.dossier = dossier
+        self.offsets = np.load(os.path.join(dossier, OFFSETS), mmap_mode="r")
+        self._fichier = open(os.path.join(dossier, TEXTES), "rb")
+        # mmap refuse les fichiers vides
+        taille = os.fstat(self._fichier.fileno()).st_size
+        self._buffer = mmap.mmap(self._fichier.fileno(), 0, access=mmap.ACCESS_READ) if taille else b""
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def texte(self, i):
+        return self._buffer[int(self.offsets[i]):int(self.offsets[i + 1])].decode("utf-8")
+
+    __getitem__ = texte
+
+    def close(self):
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+        self._fichier.close()
+
+    # Un document qui référence le store peut être picklé : on ne garde que le dossier
+    def __getstate__(self):
+        return {"dossier": self.dossier}
+
+    def __setstate__(self, state):
+        self.__init__(state["dossier"])
+
+
+class _Chaines:
+    """
+    Colonne de chaînes toutes différentes (titres, liens, textes) : encodées en UTF-8 les unes à la
+    suite des autres dans un seul bytearray, avec la position de début de chacune (array int64).
+    """
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.offsets = array("q", [0])
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return self.buffer[self.offsets[i]:self.offsets[i + 1]].decode("utf-8")
+
+    def ajouter(self, chaine):
+        self.buffer += (chaine or "").encode("utf-8")
+        self.offsets.append(len(self.buffer))
+
+
+class _Internees:
+    """
+    Colonne de valeurs souvent répétées (type, source, subreddit, date, auteurs) : chaque valeur
+    distincte n'est gardée qu'une fois (chaînes internées avec sys.intern) et la colonne ne contient
+    que son numéro (array int32).
+    """
+
+    def __init__(self):
+        self.valeurs = []
+        self.codes = array("i")
+        self._numeros = {}
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, i):
+        valeur = self.valeurs[self.codes[i]]
+        # Une liste (auteurs) est partagée par plusieurs lignes : on en retourne une copie
+        return list(valeur) if isinstance(valeur, list) else valeur
+
+    def ajouter(self, valeur):
+        if isinstance(valeur, str):
+            valeur = sys.intern(valeur)
+        elif isinstance(valeur, list):
+            valeur = [sys.intern(v) if isinstance(v, str) else v for v in valeur]
+        try:
+            cle = (type(valeur), tuple(valeur) if isinstance(valeur, list) else valeur)
+            numero = self._numeros.get(cle)
+        except TypeError:
+            # Valeur non hachable (ex : liste de dicts) : gardée telle quelle
+            cle, numero = None, None
+        if numero is None:
+            numero = len(self.valeurs)
+            self.valeurs.append(valeur)
+            if cle is not None:
+                self._numeros[cle] = numero
+        self.codes.append(numero)
+
+
+class DocumentStore:
+    """
+    Documents rangés en colonnes : titres et liens dans des _Chaines, type, auteurs, source,
+    subreddit et date dans des colonnes _Internees, nombre de commentaires dans un array int64,
+    textes dans des _Chaines (en mémoire) ou un TextStore (fichier projeté en mémoire).
+    document(ligne) donne un document léger : un objet de la classe habituelle (RedditDocument...)
+    dont seuls le store et la ligne sont remplis, les attributs étant lus dans les colonnes
+    (un attribut modifié sur le document est gardé dans le document, le store n'est pas modifié).
+    """
+
+    def __init__(self, textes=None):
+        """
+        Args:
+            textes: TextStore - Textes déjà sur disque (None : les textes sont gardés en mémoire)
+        """
+        self._textes_en_memoire = textes is None
+        self._colonnes = {
+            "type": _Internees(),
+            "title": _Chaines(),
+            "authors": _Internees(),
+            "published": _Internees(),
+            "link": _Chaines(),
+            "source": _Internees(),
+            "comments_count": array("q"),
+            "subreddit": _Internees(),
+            "text": _Chaines() if textes is None else textes,
+        }
+
+    @classmethod
+    def depuis_documents(cls, documents):
+        """
+        Range des documents (en mémoire) dans un nouveau store.
+        Returns:
+            (DocumentStore, list) - Le store, et un document léger par document, dans le même ordre
+        """
+        store = cls()
+        lignes = [store.ajouter(document) for document in documents]
+        return store, [store.document(ligne) for ligne in lignes]
+
+    def __len__(self):
+        return len(self._colonnes["type"])
+
+    def ajouter(self, document=None, texte=None, **valeurs):
+        """
+        Ajoute une ligne, à partir d'un document ou des valeurs de ses colonnes (type, title, authors...).
+        Returns:
+            int - La ligne ajoutée
+        """
+        if document is not None:
+            valeurs = {"type": document.doc_type, "title": document.title, "authors": document._authors,
+                       "published": document.published, "link": document.link, "source": document.source,
+                       "comments_count": getattr(document, "comments_count", 0),
+                       "subreddit": getattr(document, "subreddit", None)}
+            texte = document.text
+        for nom in ("type", "title", "authors", "published", "link", "source", "subreddit"):
+            self._colonnes[nom].ajouter(valeurs.get(nom))
+        self._colonnes["comments_count"].append(valeurs.get("comments_count") or 0)
+        if self._textes_en_memoire:
+            self._colonnes["text"].ajouter(texte)
+        return len(self) - 1
+
+    def valeur(self, colonne, ligne):
+        return self._colonnes[colonne][ligne]
+
+    def texte(self, ligne):
+        return self._colonnes["text"][ligne]
+
+    def document(self, ligne):
+        """Document léger de la ligne (créé à chaque appel, ne contient que le store et la ligne)"""
+        from Document import RedditDocument, ArxivDocument, SpeechDocument
+        classe = {"reddit": RedditDocument, "arxiv": ArxivDocument, "speech": SpeechDocument}[self.valeur("type", ligne)]
+        document = classe.__new__(classe)
+        document._store = self
+        document._row = ligne
+        document._text = None
+        return document
+
+
+def _valeur_json(valeur):
+    # Valeurs que json ne sait pas écrire : scalaires numpy, dates (ISO 8601), autres objets (str)
+    if isinstance(valeur, np.generic):
+        return valeur.item()
+    if isinstance(valeur, date):
+        return valeur.isoformat()
+    return str(valeur)
+
+
+def _type_publication(published):
+    # Type de la date de publication, gardé dans metadata.json pour la relire à l'identique
+    if isinstance(published, datetime):
+        return "datetime"
+    if isinstance(published, date):
+        return "date"
+    return None
+
+
+def _lire_publication(published, type_publication):
+    if type_publication == "datetime":
+        return datetime.fromisoformat(published)
+    if type_publication == "date":
+        return date.fromisoformat(published)
+    return published
+
+
+def save_documents(dossier, id2document, **metadonnees):
+    """
+    Écrit les documents dans un dossier (textes dans un seul fichier + colonnes de métadonnées).
+    Chaque fichier est d'abord écrit à côté (.tmp) puis renommé, metadata.json en dernier :
+    une erreur pendant l'écriture laisse le store précédent intact, et les textes d'un store
+    déjà ouvert (projetés en mémoire) ne sont pas écrasés.
+    Args:
+        dossier: str - Dossier de destination (créé si besoin)
+        id2document: dict - id -> Document
+        metadonnees: informations supplémentaires gardées dans metadata.json (ex : titre du corpus)
+    """
+    os.makedirs(dossier, exist_ok=True)
+    colonnes = {nom: [] for nom in ("type", "title", "authors", "link", "source", "published",
+                                    "published_type", "comments_count", "subreddit")}
+    offsets = [0]
+    temporaires = {nom: os.path.join(dossier, nom + ".tmp") for nom in (TEXTES, OFFSETS, DOC_IDS, METADONNEES)}
+    try:
+        with open(temporaires[TEXTES], "wb") as f:
+            for document in id2document.values():
+                texte = document.text.encode("utf-8")
+                f.write(texte)
+                offsets.append(offsets[-1] + len(texte))
+                colonnes["type"].append(document.doc_type)
+                colonnes["title"].append(document.title)
+                colonnes["authors"].append(document._authors)
+                colonnes["link"].append(document.link)
+                colonnes["source"].append(document.source)
+                colonnes["published"].append(document.published)
+                colonnes["published_type"].append(_type_publication(document.published))
+                colonnes["comments_count"].append(getattr(document, "comments_count", 0))
+                colonnes["subreddit"].append(getattr(document, "subreddit", None))
+        contenu = json.dumps({"colonnes": colonnes, **metadonnees}, ensure_ascii=False, default=_valeur_json)
+        with open(temporaires[OFFSETS], "wb") as f:
+            np.save(f, np.array(offsets, dtype=np.int64))
+        with open(temporaires[DOC_IDS], "wb") as f:
+            np.save(f, np.array(list(id2document.keys()), dtype=np.int64))
+        with open(temporaires[METADONNEES], "w", encoding="utf-8") as f:
+            f.write(contenu)
+    except BaseException:
+        for chemin in temporaires.values():
+            if os.path.exists(chemin):
+                os.remove(chemin)
+        raise
+    for nom, chemin in temporaires.items():
+        os.replace(chemin, os.path.join(dossier, nom))
+
+
+def load_documents(dossier):
+    """
+    Relit un dossier écrit par save_documents dans un DocumentStore : les documents retournés sont
+    des documents légers, leurs attributs sont lus dans les colonnes du store et leur texte dans le
+    fichier projeté en mémoire, à chaque accès.
+    Returns:
+        (dict, dict) - id -> Document, et les métadonnées supplémentaires
+    """
+    with open(os.path.join(dossier, METADONNEES), encoding="utf-8") as f:
+        metadonnees = json.load(f)
+    colonnes = metadonnees.pop("colonnes")
+    doc_ids = np.load(os.path.join(dossier, DOC_IDS))
+    store = DocumentStore(TextStore(dossier))
+    id2document = {}
+    # Les anciens stores n'ont que published_datetime (True pour un datetime)
+    if "published_type" in colonnes:
+        types_publication = colonnes["published_type"]
+    else:
+        types_publication = ["datetime" if est_datetime else None for est_datetime in colonnes["published_datetime"]]
+    for i, doc_id in enumerate(doc_ids.tolist()):
+        published = _lire_publication(colonnes["published"][i], types_publication[i])
+        store.ajouter(type=colonnes["type"][i], title=colonnes["title"][i], authors=colonnes["authors"][i],
+                      published=published, link=colonnes["link"][i], source=colonnes["source"][i],
+                      comments_count=colonnes["comments_count"][i], subreddit=colonnes["subreddit"][i])
+        id2document[doc_id] = store.document(i)
+    return id2document, metadonnees
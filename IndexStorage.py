@@ -0,0 +1,107 @@
+import json
+import os
+import numpy as np
+
+# Format de l'index sur disque : un dossier avec un manifeste JSON et un fichier .npy par tableau.
+# Les tableaux sont ouverts en lecture seule avec np.load(mmap_mode="r") : l'ouverture ne lit
+# presque rien, et plusieurs processus qui ouvrent le même index partagent le cache de pages du système.
+FORMAT = "projetPythonM1A-index"
+FORMAT_VERSION = 2
+MANIFESTE = "manifest.json"
+
+
+def sauvegarder_index(dossier, tableaux, metadonnees):
+    """
+    Écrit un index sur disque.
+    Args:
+        dossier: str - Dossier de l'index (créé si besoin)
+        tableaux: dict - nom -> np.ndarray, un fichier <nom>.npy par tableau
+        metadonnees: dict - Informations ajoutées au manifeste (doivent être sérialisables en JSON)
+    """
+    os.makedirs(dossier, exist_ok=True)
+    for nom, tableau in tableaux.items():
+        np.save(os.path.join(dossier, nom + ".npy"), np.ascontiguousarray(tableau), allow_pickle=False)
+    manifeste = {"format": FORMAT, "version": FORMAT_VERSION, "tableaux": sorted(tableaux)}
+    manifeste.update(metadonnees)
+    # Le manifeste est écrit en dernier : un index incomplet ne peut pas être ouvert
+    chemin_tmp = os.path.join(dossier, MANIFESTE + ".tmp")
+    with open(chemin_tmp, "w", encoding="utf-8") as f:
+        json.dump(manifeste, f, indent=2)
+    os.replace(chemin_tmp, os.path.join(dossier, MANIFESTE))
+
+
+def ouvrir_index(dossier):
+    """
+    Ouvre un index écrit par sauvegarder_index, sans charger les tableaux en mémoire.
+    Returns:
+        (dict, dict) - Le manifeste et les tableaux (nom -> np.memmap en lecture seule)
+    """
+    with open(os.path.join(dossier, MANIFESTE), encoding="utf-8") as f:
+        manifeste = json.load(f)
+    if manifeste.get("format") != FORMAT:
+        raise ValueError(f"Not an index directory: {dossier}")
+    if manifeste.get("version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported index version: {manifeste.get('version')} (expected {FORMAT_VERSION})")
+    tableaux = {nom: np.load(os.path.join(dossier, nom + ".npy"), mmap_mode="r", allow_pickle=False)
+                for nom in manifeste["tableaux"]}
+    return manifeste, tableaux
+
+
+class VocabulaireTrie:
+    """
+    Recherche mot -> id dans le vocabulaire stocké sur disque (recherche dichotomique),
+    pour ne pas reconstruire de dictionnaire Python à l'ouverture de l'index.
+    Les mots sont stockés une seule fois, comme les textes de DocumentStore : un bloc d'octets UTF-8
+    et les offsets de chaque mot (n + 1 valeurs int64) ; ids_tries est la permutation des ids
+    dans l'ordre des mots (l'ordre des octets UTF-8 est celui des chaînes Python).
+    S'utilise comme un dictionnaire en lecture (get, in, len).
+    """
+
+    def __init__(self, octets, offsets, ids_tries):
+        self.octets = octets
+        self.offsets = offsets
+        self.ids_tries = ids_tries
+
+    @staticmethod
+    def tableaux(mots):
+        """
+        Args:
+            mots: list - Mots du vocabulaire (position = id du mot)
+        Returns:
+            (np.ndarray, np.ndarray, np.ndarray) - Octets UTF-8 (uint8), offsets (int64) et ids triés par mot (int64)
+        """
+        encodes = [mot.encode("utf-8") for mot in mots]
+        offsets = np.zeros(len(encodes) + 1, dtype=np.int64)
+        np.cumsum([len(mot) for mot in encodes], out=offsets[1:])
+        octets = np.frombuffer(b"".join(encodes), dtype=np.uint8)
+        ids_tries = np.array(sorted(range(len(encodes)), key=encodes.__getitem__), dtype=np.int64)
+        return octets, offsets, ids_tries
+
+    def _octets(self, id_mot):
+        return self.octets[self.offsets[id_mot]:self.offsets[id_mot + 1]].tobytes()
+
+    def mot(self, id_mot):
+        return self._octets(id_mot).decode("utf-8")
+
+    def mots(self):
+        # Liste id -> mot
+        return [self.mot(id_mot) for id_mot in range(len(self))]
+
+    def get(self, mot, defaut=None):
+        cible = mot.encode("utf-8")
+        bas, haut = 0, len(self.ids_tries)
+        while bas < haut:
+            milieu = (bas + haut) // 2
+            if self._octets(self.ids_tries[milieu]) < cible:
+                bas = milieu + 1
+            else:
+                haut = milieu
+        if bas < len(self.ids_tries) and self._octets(self.ids_tries[bas]) == cible:
+            return int(self.ids_tries[bas])
+        return defaut
+
+    def __contains__(self, mot):
+        return self.get(mot) is not None
+
+    def __len__(self):
+        return len(self.ids_tries)
@@ -0,0 +1,320 @@
+import asyncio
+import hashlib
+import io
+import json
+import os
+import time
+import urllib.parse
+import urllib.request
+from datetime import datetime, timezone
+from Document import DocumentFactory
+from ArxivParser import ArxivParser
+
+# Récupération des documents Reddit et arXiv en parallèle (asyncio) :
+# - Reddit : listing JSON public (r/<sujet>/hot.json), page par page avec le curseur "after"
+# - arXiv  : API Atom, pages de taille_page résultats (start / max_results) téléchargées en même temps
+# Les requêtes HTTP (bloquantes, urllib) tournent dans des threads, au plus nb_connexions à la fois.
+# Chaque page est transformée en documents dès qu'elle arrive ; l'ordre final est celui des pages.
+# Synchronisation (depuis_reddit / depuis_arxiv) : seuls les posts et articles plus récents que la
+# dernière ingestion sont demandés (listing "new" arrêté au premier post déjà vu, requête arXiv
+# limitée par submittedDate), le coût ne dépend que du nombre de nouveaux documents.
+URL_REDDIT = "https://www.reddit.com"
+URL_ARXIV = "http://export.arxiv.org/api/query"
+# Taille minimale d'un texte pour garder le document (comme load_from_net)
+TAILLE_MIN_TEXTE = 20
+
+
+def document_reddit(post, sujet):
+    """
+    Crée un RedditDocument à partir d'un post du listing JSON de Reddit.
+    Returns:
+        (Document, list) - Le document et ses auteurs, ou None si le texte est trop court
+    """
+    text = (post.get("selftext") or "").replace('\n', '')
+    if text == "" or len(text) <= TAILLE_MIN_TEXTE:
+        return None
+    author_name = post.get("author") or "Auteur inconnu"
+    published_str = datetime.fromtimestamp(post.get("created_utc", 0), timezone.utc).strftime("%d-%m-%Y")
+    document = DocumentFactory.create_document("reddit",
+        title=post.get("title", ""),
+        authors=[author_name],
+        text=text,
+        published=published_str,
+        link=post.get("url", ""),
+        comments_count=post.get("num_comments", 0),
+        subreddit=post.get("subreddit", sujet),
+        source="reddit_" + sujet
+    )
+    return document, [author_name]
+
+
+def document_arxiv(entry, sujet):
+    """
+    Crée un ArxivDocument à partir d'une entrée arXiv (dict avec title, summary, published, id, author).
+    author peut être un dict (un seul auteur) ou une liste de dicts, comme dans xmltodict.
+    Returns:
+        (Document, list) - Le document et ses auteurs, ou None si le texte est trop court
+    """
+    text = (entry.get('summary') or '').replace('\n', ' ')
+    if text == "" or len(text) <= TAILLE_MIN_TEXTE:
+        return None
+    authors = entry.get('author', [])
+    if isinstance(authors, dict):
+        authors = [authors.get('name', 'Auteur inconnu')]
+    else:
+        authors = [a.get('name', 'Auteur inconnu') for a in authors]
+    document = DocumentFactory.create_document("arxiv",
+        title=entry.get('title', 'Titre inconnu'),
+        authors=authors,
+        text=text,
+        published=entry.get('published', 'Inconnu'),
+        link=entry.get('id', 'Inconnu'),
+        source="arxiv_" + sujet
+    )
+    return document, authors
+
+
+def _resultats(resultats):
+    # Résultats de asyncio.gather(..., return_exceptions=True) : en cas d'erreur, les autres pages
+    # en cours ont pu se terminer (et être enregistrées pour la reprise) avant que l'erreur remonte
+    for resultat in resultats:
+        if isinstance(resultat, BaseException):
+            raise resultat
+    return tuple(resultats)
+
+
+class CacheHTTP:
+    """
+    Cache sur disque des réponses HTTP : un fichier par URL (paramètres compris),
+    nommé par le hash de l'URL. Une réponse plus vieille que ttl secondes n'est plus servie.
+    """
+
+    def __init__(self, dossier, ttl=3600):
+        self.dossier = dossier
+        self.ttl = ttl
+        os.makedirs(dossier, exist_ok=True)
+
+    def _chemin(self, url):
+        return os.path.join(self.dossier, hashlib.sha256(url.encode("utf-8")).hexdigest() + ".bin")
+
+    def lire(self, url, ttl=-1):
+        """
+        Args:
+            url: str - URL complète de la requête
+            ttl: float - Âge maximum en secondes (-1 : celui du cache, None : pas de limite)
+        Returns:
+            bytes - La réponse gardée, ou None si elle est absente ou trop vieille
+        """
+        ttl = self.ttl if ttl == -1 else ttl
+        chemin = self._chemin(url)
+        try:
+            if ttl is not None and time.time() - os.path.getmtime(chemin) > ttl:
+                return None
+            with open(chemin, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def ecrire(self, url, donnees):
+        chemin = self._chemin(url)
+        # Écriture dans un fichier temporaire puis renommage : pas de réponse à moitié écrite
+        with open(chemin + ".tmp", "wb") as f:
+            f.write(donnees)
+        os.replace(chemin + ".tmp", chemin)
+
+
+class EtatIngestion:
+    """
+    Points de reprise d'une ingestion, gardés dans un fichier JSON mis à jour après chaque page :
+    curseurs Reddit ("after", fullname du dernier post) et débuts (start) des pages arXiv déjà lues.
+    Si l'ingestion s'arrête en cours de route, la suivante (avec les mêmes paramètres) relit ces
+    pages depuis le cache, même expirées, puis continue là où la première s'est arrêtée.
+    Le fichier est supprimé quand l'ingestion se termine.
+    """
+
+    def __init__(self, chemin, parametres):
+        self.chemin = chemin
+        self.parametres = parametres
+        self.reddit = []  # curseurs des pages Reddit lues ("" pour la première page)
+        self.arxiv = []   # start des pages arXiv lues
+        if os.path.exists(chemin):
+            with open(chemin, encoding="utf-8") as f:
+                etat = json.load(f)
+            # Un état laissé par une ingestion avec d'autres paramètres ne s'applique pas
+            if etat.get("parametres") == parametres:
+                self.reddit = etat["reddit"]
+                self.arxiv = etat["arxiv"]
+
+    def page_reddit_lue(self, after):
+        return (after or "") in self.reddit
+
+    def page_arxiv_lue(self, start):
+        return start in self.arxiv
+
+    def marquer_reddit(self, after):
+        if not self.page_reddit_lue(after):
+            self.reddit.append(after or "")
+            self.sauvegarder()
+
+    def marquer_arxiv(self, start):
+        if not self.page_arxiv_lue(start):
+            self.arxiv.append(start)
+            self.sauvegarder()
+
+    def sauvegarder(self):
+        with open(self.chemin + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"parametres": self.parametres, "reddit": self.reddit, "arxiv": self.arxiv}, f)
+        os.replace(self.chemin + ".tmp", self.chemin)
+
+    def terminer(self):
+        if os.path.exists(self.chemin):
+            os.remove(self.chemin)
+
+
+class Ingestion:
+    """
+    Téléchargement asynchrone des documents d'un sujet sur Reddit et arXiv.
+    Utilisation : reddit, arxiv = await Ingestion("MachineLearning").telecharger()
+    (chaque liste contient des couples (document, auteurs), dans l'ordre des sources).
+    Avec dossier_cache, les réponses sont gardées sur disque (ttl secondes) et l'avancement est
+    enregistré dans dossier_cache/etat.json : une ingestion interrompue reprend là où elle s'est arrêtée.
+    """
+
+    def __init__(self, sujet, user_agent="projetPythonM1A", taille_page=100, max_reddit=1000,
+                 max_arxiv=10000, nb_connexions=4, url_reddit=URL_REDDIT, url_arxiv=URL_ARXIV, timeout=30,
+                 dossier_cache=None, ttl=3600, depuis_reddit=None, depuis_arxiv=None):
+        self.sujet = sujet
+        self.user_agent = user_agent
+        self.taille_page = taille_page
+        self.max_reddit = max_reddit
+        self.max_arxiv = max_arxiv
+        self.nb_connexions = nb_connexions
+        self.url_reddit = url_reddit
+        self.url_arxiv = url_arxiv
+        self.timeout = timeout
+        self.depuis_reddit = depuis_reddit  # created_utc du post le plus récent déjà connu
+        self.depuis_arxiv = depuis_arxiv    # date published (ISO) de l'article le plus récent déjà connu
+        # Dates les plus récentes vues pendant le téléchargement (point de départ de la synchro suivante)
+        self.plus_recent = {"reddit": None, "arxiv": None}
+        self.cache = None
+        self.etat = None
+        if dossier_cache is not None:
+            self.cache = CacheHTTP(os.path.join(dossier_cache, "reponses"), ttl)
+            parametres = {"sujet": sujet, "taille_page": taille_page, "max_reddit": max_reddit,
+                          "max_arxiv": max_arxiv, "url_reddit": url_reddit, "url_arxiv": url_arxiv,
+                          "depuis_reddit": depuis_reddit, "depuis_arxiv": depuis_arxiv}
+            self.etat = EtatIngestion(os.path.join(dossier_cache, "etat.json"), parametres)
+
+    async def telecharger(self):
+        """
+        Télécharge Reddit et arXiv en même temps.
+        Returns:
+            (list, list) - Documents Reddit et documents arXiv : couples (document, auteurs)
+        """
+        self._semaphore = asyncio.Semaphore(self.nb_connexions)
+        resultat = _resultats(await asyncio.gather(self._reddit(), self._arxiv(), return_exceptions=True))
+        if self.etat is not None:
+            self.etat.terminer()
+        return resultat
+
+    async def _get(self, url, reprise=False):
+        # reprise : page déjà lue par une ingestion interrompue, servie par le cache même expirée
+        if self.cache is not None:
+            donnees = self.cache.lire(url, ttl=None if reprise else -1)
+            if donnees is not None:
+                return donnees
+        # Requête HTTP bloquante exécutée dans un thread, avec au plus nb_connexions en même temps
+        async with self._semaphore:
+            donnees = await asyncio.get_running_loop().run_in_executor(None, self._lire, url)
+        if self.cache is not None:
+            self.cache.ecrire(url, donnees)
+        return donnees
+
+    def _lire(self, url):
+        requete = urllib.request.Request(url, headers={"User-Agent": self.user_agent})
+        with urllib.request.urlopen(requete, timeout=self.timeout) as response:
+            return response.read()
+
+    def _url_reddit(self, after):
+        params = {"limit": min(100, self.taille_page)}
+        if after:
+            params["after"] = after
+        # En synchronisation, le listing "new" donne les posts du plus récent au plus ancien
+        listing = "hot" if self.depuis_reddit is None else "new"
+        return f"{self.url_reddit}/r/{urllib.parse.quote(self.sujet)}/{listing}.json?{urllib.parse.urlencode(params)}"
+
+    def _url_arxiv(self, start, nb):
+        requete = f"all:{self.sujet}"
+        if self.depuis_arxiv is not None:
+            # Filtre de l'API à la minute près : les articles de la même minute sont écartés ensuite
+            debut = datetime.fromisoformat(self.depuis_arxiv.replace("Z", "+00:00")).strftime("%Y%m%d%H%M")
+            requete += f" AND submittedDate:[{debut} TO 999912312359]"
+        params = {"search_query": requete, "start": start, "max_results": nb}
+        return f"{self.url_arxiv}?{urllib.parse.urlencode(params)}"
+
+    async def _reddit(self):
+        # Les pages Reddit se suivent (curseur "after") : elles sont lues l'une après l'autre,
+        # pendant que les pages arXiv sont téléchargées en parallèle
+        documents = []
+        after = None
+        nb_posts = 0
+        while nb_posts < self.max_reddit:
+            reprise = self.etat is not None and self.etat.page_reddit_lue(after)
+            listing = json.loads(await self._get(self._url_reddit(after), reprise))["data"]
+            if self.etat is not None:
+                self.etat.marquer_reddit(after)
+            posts = [enfant["data"] for enfant in listing.get("children", [])][:self.max_reddit - nb_posts]
+            nb_posts += len(posts)
+            deja_vu = False
+            if self.depuis_reddit is not None:
+                # Listing du plus récent au plus ancien : on s'arrête au premier post déjà connu
+                nouveaux = [post for post in posts if post.get("created_utc", 0) > self.depuis_reddit]
+                deja_vu = len(nouveaux) < len(posts)
+                posts = nouveaux
+            self._plus_recent("reddit", (post.get("created_utc", 0) for post in posts))
+            documents.extend(d for d in (document_reddit(post, self.sujet) for post in posts) if d is not None)
+            after = listing.get("after")
+            if not posts or not after or deja_vu:
+                break
+        return documents
+
+    async def _arxiv(self):
+        # La première page donne le nombre total de résultats, les pages suivantes sont
+        # ensuite demandées toutes en même temps (limitées par le sémaphore)
+        premiere, total = await self._page_arxiv(0)
+        total = self.max_arxiv if total is None else min(total, self.max_arxiv)
+        suivantes = _resultats(await asyncio.gather(*(self._page_arxiv(start)
+                                                      for start in range(self.taille_page, total, self.taille_page)),
+                                                    return_exceptions=True))
+        documents = list(premiere)
+        for page, _ in suivantes:
+            documents.extend(page)
+        return documents
+
+    async def _page_arxiv(self, start):
+        nb = min(self.taille_page, self.max_arxiv - start)
+        reprise = self.etat is not None and self.etat.page_arxiv_lue(start)
+        parser = ArxivParser(io.BytesIO(await self._get(self._url_arxiv(start, nb), reprise)))
+        # Les documents de la page sont créés dès qu'elle arrive
+        documents = [d for d in (document_arxiv(entree, self.sujet) for entree in self._nouvelles(parser))
+                     if d is not None]
+        if self.etat is not None:
+            self.etat.marquer_arxiv(start)
+        return documents, parser.total
+
+    def _nouvelles(self, entrees):
+        # Entrées arXiv plus récentes que depuis_arxiv (dates ISO 8601 en UTC : l'ordre des chaînes
+        # est celui des dates), en notant la plus récente
+        for entree in entrees:
+            published = entree.get("published", "")
+            if self.depuis_arxiv is not None and published <= self.depuis_arxiv:
+                continue
+            self._plus_recent("arxiv", [published])
+            yield entree
+
+    def _plus_recent(self, source, dates):
+        dates = [date for date in dates if date is not None and date != "Inconnu"]
+        if self.plus_recent[source] is not None:
+            dates.append(self.plus_recent[source])
+        if dates:
+            self.plus_recent[source] = max(dates)
@@ -0,0 +1,115 @@
+import heapq
+from bisect import bisect_left
+import numpy as np
+
+
+class InvertedIndex:
+    """
+    Index inversé construit à partir d'une matrice creuse documents x termes.
+    Pour chaque id de mot du vocabulaire on garde :
+      - la liste de postings (ligne du document, poids) triée par ligne
+      - la borne supérieure du poids du mot (utilisée par MaxScore pour ignorer des documents)
+    """
+
+    def __init__(self, matrice):
+        # Le format CSC donne directement, pour chaque colonne (= mot), les lignes triées et leurs poids
+        from scipy.sparse import csc_matrix
+        csc = csc_matrix(matrice, dtype=np.float64)
+        csc.sum_duplicates()
+        csc.eliminate_zeros()
+        self.nb_documents, self.nb_termes = csc.shape
+        self.indptr = csc.indptr
+        self.lignes = csc.indices
+        self.poids = csc.data
+        # Borne supérieure par mot = poids maximal de ses postings
+        self.bornes = np.zeros(self.nb_termes)
+        non_vides = np.flatnonzero(np.diff(self.indptr))
+        if len(non_vides):
+            self.bornes[non_vides] = np.maximum.reduceat(self.poids, self.indptr[non_vides])
+
+    def __len__(self):
+        return self.nb_termes
+
+    def postings(self, id_mot):
+        """Retourne les tableaux (lignes, poids) des postings d'un mot, triés par ligne."""
+        debut, fin = self.indptr[id_mot], self.indptr[id_mot + 1]
+        return self.lignes[debut:fin], self.poids[debut:fin]
+
+    def top_k(self, poids_requete, k):
+        """
+        Calcule les k meilleurs documents pour une requête avec l'algorithme MaxScore.
+        Seuls les postings des mots de la requête sont parcourus, et les documents qui ne peuvent
+        plus entrer dans le top k sont sautés sans être évalués.
+        Args:
+            poids_requete: dict - id du mot -> poids du mot dans la requête
+            k: int - Le nombre de documents à retourner
+        Returns:
+            (np.ndarray, np.ndarray) - Les lignes et les scores, triés par score décroissant
+            puis par ligne croissante (seuls les documents de score non nul sont retournés)
+        """
+        termes = []
+        for id_mot, q in poids_requete.items():
+            if q > 0 and 0 <= id_mot < self.nb_termes and self.indptr[id_mot + 1] > self.indptr[id_mot]:
+                termes.append((self.bornes[id_mot] * q, id_mot, q))
+        if k <= 0 or not termes:
+            return np.array([], dtype=np.int64), np.array([])
+
+        # Termes triés par borne croissante : les premiers sont les "non essentiels"
+        termes.sort()
+        bornes = [borne for borne, _, _ in termes]
+        cumul = np.cumsum(bornes).tolist()  # cumul[i] = somme des bornes des termes 0..i
+        lignes, poids = [], []
+        for _, id_mot, q in termes:
+            lignes_mot, poids_mot = self.postings(id_mot)
+            lignes.append(lignes_mot.tolist())
+            poids.append((poids_mot * q).tolist())
+        n = len(termes)
+        positions = [0] * n
+
+        tas = []  # min-tas de (score, -ligne) : le minimum est le k-ième meilleur document
+        seuil = 0.0
+        premier_essentiel = 0
+        while premier_essentiel < n:
+            # Candidat = plus petite ligne courante parmi les termes essentiels
+            candidat = None
+            for i in range(premier_essentiel, n):
+                p = positions[i]
+                if p < len(lignes[i]) and (candidat is None or lignes[i][p] < candidat):
+                    candidat = lignes[i][p]
+            if candidat is None:
+                break
+
+            score = 0.0
+            for i in range(premier_essentiel, n):
+                p = positions[i]
+                if p < len(lignes[i]) and lignes[i][p] == candidat:
+                    score += poids[i][p]
+                    positions[i] = p + 1
+
+            # Termes non essentiels, du plus fort au plus faible : on arrête dès que
+            # même la somme des bornes restantes ne permet plus d'entrer dans le top k
+            for i in range(premier_essentiel - 1, -1, -1):
+                if len(tas) == k and score + cumul[i] <= seuil:
+                    break
+                p = bisect_left(lignes[i], candidat, positions[i])
+                positions[i] = p
+                if p < len(lignes[i]) and lignes[i][p] == candidat:
+                    score += poids[i][p]
+                    positions[i] = p + 1
+
+            entree = (score, -candidat)
+            if len(tas) < k:
+                heapq.heappush(tas, entree)
+            elif entree > tas[0]:
+                heapq.heapreplace(tas, entree)
+            if len(tas) == k:
+                seuil = tas[0][0]
+                # Un terme dont les bornes cumulées ne dépassent pas le seuil ne peut plus
+                # faire entrer seul un document : il devient non essentiel
+                while premier_essentiel < n and cumul[premier_essentiel] <= seuil:
+                    premier_essentiel += 1
+
+        resultats = sorted(tas, reverse=True)
+        lignes_top = np.array([-ligne for _, ligne in resultats], dtype=np.int64)
+        scores_top = np.array([score for score, _ in resultats])
+        return lignes_top, scores_top
@@ -0,0 +1,111 @@
+import numpy as np
+
+
+class PositionalIndex:
+    """
+    Index positionnel : pour chaque mot, les lignes (documents) qui le contiennent et,
+    pour chaque couple (mot, ligne), les positions du mot dans le document.
+    Les positions d'un couple sont triées et stockées en écarts (delta) : la première est
+    absolue, les suivantes sont la différence avec la précédente (petits entiers sur int32).
+    Les requêtes par expression / proximité intersectent d'abord les postings des mots
+    (on ne regarde les positions que des documents qui contiennent tous les mots).
+    """
+
+    def __init__(self, tokens, nb_mots, supprime=None):
+        """
+        Args:
+            tokens: list - ligne -> tableau des ids de mots du document, dans l'ordre du texte
+            nb_mots: int - Taille du vocabulaire
+            supprime: np.ndarray - Masque des lignes supprimées (ignorées)
+        """
+        self.nb_mots = nb_mots
+        longueurs = np.array([0 if supprime is not None and supprime[ligne] else len(ids)
+                              for ligne, ids in enumerate(tokens)], dtype=np.int64)
+        gardes = [ids for ids, n in zip(tokens, longueurs) if n]
+        mots = np.concatenate(gardes).astype(np.int64) if gardes else np.zeros(0, dtype=np.int64)
+        lignes = np.repeat(np.arange(len(tokens)), longueurs)
+        # Position de chaque mot dans son document
+        positions = np.arange(len(mots)) - np.repeat(np.cumsum(longueurs) - longueurs, longueurs)
+        ordre = np.lexsort((positions, lignes, mots))
+        mots, lignes, positions = mots[ordre], lignes[ordre], positions[ordre]
+
+        # Début de chaque couple (mot, ligne) distinct
+        nouveau = np.ones(len(mots), dtype=bool)
+        nouveau[1:] = (mots[1:] != mots[:-1]) | (lignes[1:] != lignes[:-1])
+        debuts = np.flatnonzero(nouveau)
+        self.lignes = lignes[debuts]
+        self.indptr = np.searchsorted(mots[debuts], np.arange(nb_mots + 1))
+        self.indptr_positions = np.append(debuts, len(mots))
+        deltas = positions.copy()
+        deltas[1:] -= positions[:-1]
+        deltas[debuts] = positions[debuts]
+        self.deltas = deltas.astype(np.int32)
+
+    def lignes_mot(self, id_mot):
+        """Lignes (triées) des documents qui contiennent le mot."""
+        if id_mot is None or not 0 <= id_mot < self.nb_mots:
+            return np.zeros(0, dtype=np.int64)
+        return self.lignes[self.indptr[id_mot]:self.indptr[id_mot + 1]]
+
+    def positions(self, id_mot, ligne):
+        """Positions (triées) du mot dans le document de la ligne donnée."""
+        debut, fin = self.indptr[id_mot], self.indptr[id_mot + 1]
+        k = debut + np.searchsorted(self.lignes[debut:fin], ligne)
+        if k == fin or self.lignes[k] != ligne:
+            return np.zeros(0, dtype=np.int64)
+        return np.cumsum(self.deltas[self.indptr_positions[k]:self.indptr_positions[k + 1]], dtype=np.int64)
+
+    def candidats(self, ids_mots):
+        # Lignes qui contiennent tous les mots (en partant du mot le plus rare)
+        postings = sorted((self.lignes_mot(id_mot) for id_mot in ids_mots), key=len)
+        lignes = postings[0]
+        for autres in postings[1:]:
+            lignes = np.intersect1d(lignes, autres, assume_unique=True)
+        return lignes
+
+    def expression(self, ids_mots):
+        """
+        Lignes des documents qui contiennent les mots consécutifs, dans l'ordre.
+        Args:
+            ids_mots: list - Ids des mots de l'expression (None pour un mot inconnu)
+        Returns:
+            np.ndarray - Lignes triées
+        """
+        if not ids_mots or any(id_mot is None for id_mot in ids_mots):
+            return np.zeros(0, dtype=np.int64)
+        trouvees = []
+        for ligne in self.candidats(ids_mots):
+            # Positions de départ possibles de l'expression
+            departs = self.positions(ids_mots[0], ligne)
+            for decalage, id_mot in enumerate(ids_mots[1:], 1):
+                departs = np.intersect1d(departs, self.positions(id_mot, ligne) - decalage, assume_unique=True)
+                if not len(departs):
+                    break
+            if len(departs):
+                trouvees.append(ligne)
+        return np.array(trouvees, dtype=np.int64)
+
+    def proximite(self, id_a, id_b, k):
+        """
+        Lignes des documents où les deux mots apparaissent à au plus k positions l'un de l'autre
+        (dans n'importe quel ordre).
+        Returns:
+            np.ndarray - Lignes triées
+        """
+        if id_a is None or id_b is None:
+            return np.zeros(0, dtype=np.int64)
+        trouvees = []
+        for ligne in self.candidats([id_a, id_b]):
+            positions_a = self.positions(id_a, ligne)
+            positions_b = self.positions(id_b, ligne)
+            # Pour chaque position de a, les positions de b juste avant et juste après
+            i = np.searchsorted(positions_b, positions_a)
+            apres = positions_b[np.minimum(i, len(positions_b) - 1)]
+            avant = positions_b[np.maximum(i - 1, 0)]
+            distances = np.minimum(np.abs(apres - positions_a), np.abs(positions_a - avant))
+            if id_a == id_b:
+                # Un mot n'est pas proche de lui-même : il faut deux occurrences distinctes
+                distances = np.diff(positions_a)
+            if len(distances) and distances.min() <= k:
+                trouvees.append(ligne)
+        return np.array(trouvees, dtype=np.int64)
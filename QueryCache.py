@@ -0,0 +1,67 @@
+from collections import OrderedDict
+
+
+class QueryCache:
+    """
+    Cache LRU des résultats de requêtes : clé -> (lignes, scores).
+    Les entrées sont évincées de la moins récemment utilisée à la plus récente dès que le nombre
+    d'entrées dépasse taille_max ou que la mémoire des tableaux gardés dépasse memoire_max octets.
+    Chaque lecture donne la génération du corpus : si elle a changé depuis les écritures,
+    le cache est vidé (les résultats gardés ne correspondent plus aux documents).
+    """
+
+    def __init__(self, taille_max=256, memoire_max=64 * 2**20):
+        """
+        Args:
+            taille_max: int - Nombre maximum d'entrées (0 désactive le cache)
+            memoire_max: int - Mémoire maximum des tableaux gardés, en octets
+        """
+        self.taille_max = taille_max
+        self.memoire_max = memoire_max
+        self.succes = 0  # Requêtes servies par le cache
+        self.echecs = 0  # Requêtes calculées
+        self.generation = None
+        self._entrees = OrderedDict()
+        self._memoire = 0
+
+    def __len__(self):
+        return len(self._entrees)
+
+    def lire(self, cle, generation):
+        """
+        Returns:
+            (np.ndarray, np.ndarray) - Copie des lignes et scores gardés, ou None si la clé est absente
+        """
+        if generation != self.generation:
+            self.vider()
+            self.generation = generation
+        resultat = self._entrees.get(cle)
+        if resultat is None:
+            self.echecs += 1
+            return None
+        self.succes += 1
+        self._entrees.move_to_end(cle)
+        # Copies : le résultat retourné peut être modifié sans toucher au cache
+        return resultat[0].copy(), resultat[1].copy()
+
+    def ecrire(self, cle, lignes, scores):
+        if self.taille_max <= 0:
+            return
+        if cle in self._entrees:
+            self._memoire -= sum(tableau.nbytes for tableau in self._entrees.pop(cle))
+        self._entrees[cle] = (lignes.copy(), scores.copy())
+        self._memoire += lignes.nbytes + scores.nbytes
+        while self._entrees and (len(self._entrees) > self.taille_max or self._memoire > self.memoire_max):
+            _, evincee = self._entrees.popitem(last=False)
+            self._memoire -= sum(tableau.nbytes for tableau in evincee)
+
+    def vider(self):
+        self._entrees.clear()
+        self._memoire = 0
+
+    def infos(self):
+        """
+        Returns:
+            dict - Succès, échecs, nombre d'entrées et mémoire utilisée (octets), pour dimensionner le cache
+        """
+        return {"succes": self.succes, "echecs": self.echecs, "entrees": len(self._entrees), "memoire": self._memoire}
@@ -1,15 +1,233 @@
+import re
 import numpy as np
-import pandas as pd
-from tqdm import tqdm
 from Corpus import Corpus
-import matplotlib.pyplot as plt
+from InvertedIndex import InvertedIndex
+from BM25 import BM25
+from PositionalIndex import PositionalIndex
+from IndexStorage import sauvegarder_index, ouvrir_index, VocabulaireTrie
+from QueryCache import QueryCache
+import Dates
+# pandas, scipy et matplotlib sont importés à la première utilisation (import du module plus rapide)
+
+
+def _top_k(scores, k):
+    """
+    Sélectionne les indices des k plus grands scores avec argpartition (O(n) au lieu d'un tri complet).
+    Les résultats sont triés par score décroissant puis par indice croissant en cas d'égalité.
+    """
+    n = len(scores)
+    k = max(0, min(int(k), n))
+    if k == 0:
+        return np.array([], dtype=np.int64)
+    if k < n:
+        seuil = scores[np.argpartition(-scores, k - 1)[k - 1]]
+        # Tous les scores strictement au-dessus du seuil, complétés par les premiers ex aequo
+        candidats = np.flatnonzero(scores > seuil)
+        ex_aequo = np.flatnonzero(scores == seuil)[:k - len(candidats)]
+        candidats = np.concatenate([candidats, ex_aequo])
+    else:
+        candidats = np.arange(n)
+    return candidats[np.lexsort((candidats, -scores[candidats]))]
+
+
+# Syntaxe des requêtes : "mots consécutifs" et mot1 NEAR/k mot2 (au plus k positions d'écart)
+EXPRESSION = re.compile(r'"([^"]*)"')
+PROXIMITE = re.compile(r'(\S+)\s+NEAR/(\d+)\s+(\S+)')
+NEAR = re.compile(r'NEAR/\d+')
+
+
+def _normaliser_requete(mots_cle):
+    # Deux requêtes qui ne diffèrent que par la casse ou les espaces ont les mêmes résultats
+    # (NEAR/k garde sa casse : c'est un opérateur, "near/3" est un mot ordinaire)
+    return " ".join(mot if NEAR.fullmatch(mot) else mot.lower() for mot in mots_cle.split())
+
+
+def _analyser_requete(mots_cle, decouper):
+    """
+    Sépare les contraintes d'une requête (expressions entre guillemets, NEAR/k) des mots-clés.
+    Les mots des contraintes sont découpés comme les textes du corpus : "deep-learning" ou
+    "U.S. economy" donnent les mêmes mots que dans les documents. Un opérande de NEAR/k qui donne
+    plusieurs mots devient aussi une expression ; la distance est alors mesurée entre le dernier mot
+    de l'opérande gauche et le premier mot de l'opérande droit.
+    Les mots des contraintes restent dans les mots-clés pour le calcul du score.
+    Args:
+        mots_cle: str - La requête
+        decouper: fonction texte -> liste de mots (decouper du tokenizer du corpus)
+    Returns:
+        (list, str) - Contraintes ("expression", [mots]) ou ("proximite", [mot1, mot2], k), et les mots-clés
+    """
+    contraintes = []
+
+    def expression(match):
+        mots = decouper(match.group(1))
+        if mots:
+            contraintes.append(("expression", mots))
+        return " " + " ".join(mots) + " "
+
+    def proximite(match):
+        gauche, droite = decouper(match.group(1)), decouper(match.group(3))
+        if gauche and droite:
+            for mots in (gauche, droite):
+                if len(mots) > 1:
+                    contraintes.append(("expression", mots))
+            contraintes.append(("proximite", [gauche[-1], droite[0]], int(match.group(2))))
+        return " ".join(gauche + droite)
+
+    mots_cle = EXPRESSION.sub(expression, mots_cle)
+    mots_cle = PROXIMITE.sub(proximite, mots_cle)
+    return contraintes, mots_cle
+
 
 class SearchEngine:
-    def __init__(self, corpus: Corpus):
+    # Structures de recherche disponibles :
+    # - "matrice" : produit matrice creuse-vecteur sur tous les documents
+    # - "index"   : index inversé + MaxScore, ne parcourt que les postings des mots de la requête
+    #               (seuls les documents de similarité non nulle sont retournés)
+    BACKENDS = ("matrice", "index")
+    # Classements disponibles : similarité cosinus TF-IDF ou score BM25 (sur la matrice TF)
+    RANKINGS = ("cosinus", "bm25")
+    # Cache des résultats (voir QueryCache.py) : nombre d'entrées et mémoire maximum
+    TAILLE_CACHE = 256
+    MEMOIRE_CACHE = 64 * 2**20
+    # Nombre de requêtes évaluées ensemble par search_many (borne la taille de la matrice des scores)
+    TAILLE_PAQUET_REQUETES = 256
 
+    def __init__(self, corpus: Corpus, backend="matrice", ranking="cosinus", k1=1.2, b=0.75):
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown backend: {backend}")
+        if ranking not in self.RANKINGS:
+            raise ValueError(f"Unknown ranking: {ranking}")
         self.corpus = corpus
-        self.matriceRecherche = corpus.construire_matrice_tfidf()
-        self.vocabulaire = corpus._construire_dictionnaire_vocab()
+        self.backend = backend
+        self.ranking = ranking
+        self.k1 = k1
+        self.b = b
+        self._generation = None
+        self._disque = None  # Tableaux de l'index quand le moteur est ouvert depuis le disque
+        self.cache = QueryCache(self.TAILLE_CACHE, self.MEMOIRE_CACHE)
+        self._mettre_a_jour()
+
+    @classmethod
+    def open(cls, path, corpus=None, backend="matrice", ranking="cosinus", k1=1.2, b=0.75):
+        """
+        Ouvre un index sauvegardé avec save() : les tableaux sont projetés en mémoire (mmap)
+        en lecture seule, rien n'est recalculé, le démarrage est donc quasi immédiat.
+        Args:
+            path: str - Dossier de l'index
+            corpus: Corpus - Corpus correspondant à l'index (facultatif, nécessaire pour les
+                fonctions qui lisent les textes ; s'il est modifié ensuite, l'index est recalculé)
+        Returns:
+            SearchEngine
+        """
+        if backend not in cls.BACKENDS:
+            raise ValueError(f"Unknown backend: {backend}")
+        if ranking not in cls.RANKINGS:
+            raise ValueError(f"Unknown ranking: {ranking}")
+        from scipy.sparse import csr_matrix
+        manifeste, tableaux = ouvrir_index(path)
+        moteur = cls.__new__(cls)
+        moteur.corpus = corpus
+        moteur.backend = backend
+        moteur.ranking = ranking
+        moteur.k1 = k1
+        moteur.b = b
+        moteur._generation = corpus._generation if corpus is not None else None
+        moteur._disque = dict(tableaux, nb_documents=manifeste["nb_documents"])
+        forme = tuple(manifeste["shape"])
+        moteur._matrice_normalisee = csr_matrix(
+            (tableaux["data"], tableaux["indices"], tableaux["indptr"]), shape=forme)
+        moteur._normes = tableaux["normes"]
+        moteur._doc_ids = tableaux["doc_ids"]
+        moteur._supprime = tableaux["supprime"]
+        moteur._mot2id = VocabulaireTrie(tableaux["mots_utf8"], tableaux["offsets_mots"], tableaux["ids_mots_tries"])
+        moteur.matriceRecherche = None
+        moteur._vocabulaire = None
+        moteur._bm25 = None
+        moteur._index = None
+        moteur._positions = None
+        moteur._dates = None
+        moteur._periodes = {}
+        moteur.cache = QueryCache(cls.TAILLE_CACHE, cls.MEMOIRE_CACHE)
+        return moteur
+
+    def save(self, path):
+        """
+        Sauvegarde l'index sur disque dans un format versionné (un fichier .npy par tableau) :
+        matrice normalisée (data / indices / indptr), normes, IDF, matrice TF, vocabulaire
+        et correspondance ligne -> doc_id. Le dossier peut ensuite être ouvert avec SearchEngine.open.
+        """
+        self._mettre_a_jour()
+        tf = self._matrice_tf()
+        mots_utf8, offsets_mots, ids_mots_tries = VocabulaireTrie.tableaux(self._mots())
+        tableaux = {
+            "data": self._matrice_normalisee.data,
+            "indices": self._matrice_normalisee.indices,
+            "indptr": self._matrice_normalisee.indptr,
+            "normes": self._normes,
+            "idf": self._idf(),
+            "tf_data": tf.data,
+            "tf_indices": tf.indices,
+            "tf_indptr": tf.indptr,
+            "doc_ids": self._doc_ids,
+            "supprime": self._supprime,
+            "mots_utf8": mots_utf8,
+            "offsets_mots": offsets_mots,
+            "ids_mots_tries": ids_mots_tries,
+            "frequences": self._frequences()[0],
+            "frequences_nb_doc": self._frequences()[1],
+        }
+        nb_documents = self._disque["nb_documents"] if self._disque is not None else self.corpus.analyse().nb_documents
+        sauvegarder_index(path, tableaux, {"shape": list(self._matrice_normalisee.shape),
+                                           "nb_documents": int(nb_documents)})
+
+    def _mettre_a_jour(self):
+        # Les structures de recherche sont recalculées (à partir de l'analyse du corpus, sans
+        # renettoyer les textes) seulement si les documents du corpus ont changé depuis
+        if self.corpus is None or self._generation == self.corpus._generation:
+            return
+        self._disque = None
+        # Matrice alignée sur les lignes de l'analyse : les lignes des documents supprimés
+        # (en attente de compactage) sont à zéro et masquées au moment du classement
+        self.matriceRecherche = self.corpus.analyse().matrice_tfidf()
+        self._vocabulaire = None
+        self._bm25 = None
+        self._preparer_scoring()
+        self._generation = self.corpus._generation
+
+    @property
+    def vocabulaire(self):
+        # Dictionnaire mot -> {id, frequence, frequence_nb_doc}, construit seulement s'il est utilisé
+        self._mettre_a_jour()
+        if self._vocabulaire is None:
+            if self._disque is None:
+                self._vocabulaire = self.corpus._construire_dictionnaire_vocab()
+            else:
+                frequences, frequences_nb_doc = self._frequences()
+                self._vocabulaire = {self._mot2id.mot(i): {"id": int(i), "frequence": frequences[i], "frequence_nb_doc": frequences_nb_doc[i]}
+                                     for i in self._disque["ids_mots_tries"] if frequences_nb_doc[i] > 0}
+        return self._vocabulaire
+
+    # Accès aux données de l'index, qu'il vienne du corpus ou du disque
+    def _matrice_tf(self):
+        # Matrice TF alignée sur les lignes de l'index (lignes supprimées à zéro)
+        if self._disque is not None:
+            from scipy.sparse import csr_matrix
+            return csr_matrix((self._disque["tf_data"], self._disque["tf_indices"], self._disque["tf_indptr"]),
+                              shape=self._matrice_normalisee.shape)
+        analyse = self.corpus.analyse()
+        return analyse.masquer_supprimes(analyse.matrice_tf())
+
+    def _idf(self):
+        return self._disque["idf"] if self._disque is not None else self.corpus.analyse().idf()
+
+    def _mots(self):
+        return self._mot2id.mots() if self._disque is not None else self.corpus.analyse().mots
+
+    def _frequences(self):
+        if self._disque is not None:
+            return self._disque["frequences"], self._disque["frequences_nb_doc"]
+        analyse = self.corpus.analyse()
+        return analyse.frequences, analyse.frequences_nb_doc
 
     # On reprend les fonctions du corpus pour que ca soit plus propre à l'utilisation
     def load_from_pickle(self, filepath):
@@ -18,37 +236,255 @@ class SearchEngine:
     def load_from_net(self, client_id, client_secret, user_agent):
         self.corpus.load_from_net(client_id, client_secret, user_agent)
 
-    def search(self, mots_cle, nb_doc_retour=5) :
+    async def load_from_net_async(self, user_agent="projetPythonM1A", **options):
+        await self.corpus.load_from_net_async(user_agent, **options)
 
-        resultat = pd.DataFrame()
-        matrice_csr = self.matriceRecherche.tocsr() # On reconverti la matrice pour la recherche
-        
+    async def sync_from_net_async(self, user_agent="projetPythonM1A", **options):
+        """Ajoute seulement les documents publiés depuis la dernière ingestion (voir Corpus.sync_from_net_async)."""
+        return await self.corpus.sync_from_net_async(user_agent, **options)
+
+    def load_from_csv(self, filename, chunksize=1000):
+        return self.corpus.load_from_csv(filename, chunksize=chunksize)
+
+    def load_from_store(self, dossier):
+        self.corpus.load_from_store(dossier)
+
+    def remove_documents(self, doc_ids):
+        """Supprime des documents du corpus (voir Corpus.remove_documents)."""
+        self.corpus.remove_documents(doc_ids)
+
+    def update_document(self, doc_id, document):
+        """Remplace un document du corpus en gardant son id (voir Corpus.update_document)."""
+        self.corpus.update_document(doc_id, document)
+
+    def add_documents(self, documents):
+        """
+        Ajoute des documents au corpus (voir Corpus.add_documents).
+        Les structures de recherche sont mises à jour à la prochaine requête.
+        Returns:
+            list - Les ids attribués aux nouveaux documents
+        """
+        return self.corpus.add_documents(documents)
+
+    def search(self, mots_cle, nb_doc_retour=5, ranking=None, k1=None, b=None) :
+        """
+        Recherche les documents les plus proches des mots-clés (similarité cosinus ou BM25).
+        Args:
+            mots_cle: str - Les mots-clés de recherche ; "mots entre guillemets" pour une expression exacte,
+                mot1 NEAR/k mot2 pour deux mots à au plus k positions d'écart
+            nb_doc_retour: int - Le nombre de documents à retourner
+            ranking: str - "cosinus" ou "bm25" (par défaut celui du constructeur)
+            k1, b: float - Paramètres BM25 pour cette requête (par défaut ceux du constructeur)
+        Returns:
+            pd.DataFrame - Les documents triés par similarité décroissante (similarités nulles comprises)
+        """
+        lignes, scores = self._scores_top_k(mots_cle, nb_doc_retour, ranking, k1, b)
+        return self._resultat(lignes, scores)
+
+    def search_many(self, requetes, nb_doc_retour=5, ranking=None, k1=None, b=None):
+        """
+        Recherche de nombreuses requêtes à la fois. En similarité cosinus, les requêtes sont encodées
+        dans une matrice creuse (requêtes x mots) et classées par paquets de TAILLE_PAQUET_REQUETES
+        avec un seul produit matrice creuse-matrice creuse par paquet, sans boucle Python par document.
+        Les requêtes avec expression / NEAR, et le classement BM25, passent par le calcul de search2.
+        Args:
+            requetes: list - Les requêtes (même syntaxe que search)
+            nb_doc_retour: int - Le nombre de documents à retourner par requête
+            ranking, k1, b: comme pour search
+        Returns:
+            pd.DataFrame - Colonnes requete (position dans la liste), doc_id et similarity, triées par requête
+            puis par similarité décroissante (seules les similarités non nulles sont gardées, comme search2)
+        """
+        import pandas as pd
+        self._mettre_a_jour()
+        ranking = self.ranking if ranking is None else ranking
+        if ranking not in self.RANKINGS:
+            raise ValueError(f"Unknown ranking: {ranking}")
+        requetes = list(requetes)
+        simples, parties = [], []
+        for position, mots_cle in enumerate(requetes):
+            if ranking == "cosinus" and not _analyser_requete(mots_cle, self._decouper)[0]:
+                simples.append(position)
+                continue
+            lignes, scores = self._scores_top_k(mots_cle, nb_doc_retour, ranking, k1, b)
+            non_nuls = scores != 0.0
+            parties.append((np.full(non_nuls.sum(), position), lignes[non_nuls], scores[non_nuls]))
+        for debut in range(0, len(simples), self.TAILLE_PAQUET_REQUETES):
+            paquet = simples[debut:debut + self.TAILLE_PAQUET_REQUETES]
+            parties.append(self._top_k_paquet([requetes[position] for position in paquet], np.array(paquet), nb_doc_retour))
+        if not parties:
+            return pd.DataFrame({"requete": np.zeros(0, dtype=np.int64), "doc_id": self._doc_ids[:0],
+                                 "similarity": np.zeros(0)})
+        positions, lignes, scores = (np.concatenate(colonne) for colonne in zip(*parties))
+        ordre = np.lexsort((lignes, -scores, positions))
+        return pd.DataFrame({"requete": positions[ordre], "doc_id": self._doc_ids[lignes[ordre]],
+                             "similarity": scores[ordre]})
+
+    def _top_k_paquet(self, requetes, positions, k):
+        # Matrice creuse des requêtes (une ligne par requête, poids = nombre d'occurrences des mots)
+        from scipy.sparse import csr_matrix
+        indptr, indices, donnees = [0], [], []
+        for mots_cle in requetes:
+            poids = self._poids_requete(mots_cle)
+            indices.extend(poids)
+            donnees.extend(poids.values())
+            indptr.append(len(indices))
+        matrice_requetes = csr_matrix((np.array(donnees, dtype=np.float64), np.array(indices, dtype=np.int64),
+                                       np.array(indptr)), shape=(len(requetes), self._matrice_normalisee.shape[1]))
+        # Scores de tous les couples (requête, document) en un produit creux : (documents x requêtes)
+        # transposé en (requêtes x documents) ; seuls les scores non nuls sont stockés
+        scores = (self._matrice_normalisee @ matrice_requetes.T).T.tocsr()
+        scores.sum_duplicates()
+        scores.eliminate_zeros()
+        # k meilleurs documents de chaque ligne : tri par requête, score décroissant puis ligne croissante,
+        # et rang de chaque score dans sa requête
+        nb_par_requete = np.diff(scores.indptr)
+        requete = np.repeat(np.arange(len(requetes)), nb_par_requete)
+        ordre = np.lexsort((scores.indices, -scores.data, requete))
+        rang = np.arange(len(ordre)) - np.repeat(scores.indptr[:-1], nb_par_requete)
+        ordre = ordre[rang < k]
+        return positions[requete[ordre]], scores.indices[ordre].astype(np.int64), scores.data[ordre]
+
+    def _preparer_scoring(self):
+        # Précalculs faits une seule fois (à la construction puis après chaque modification du corpus) :
+        # - la matrice TF-IDF dont chaque ligne est normalisée (norme L2)
+        # - la norme de chaque document
+        # - le tableau ligne -> doc_id, repris de l'analyse du corpus
+        from scipy.sparse import csr_matrix
+        matrice = csr_matrix(self.matriceRecherche, dtype=np.float64)
+        matrice.sum_duplicates()
+        longueurs = np.diff(matrice.indptr)
+        self._normes = np.sqrt(np.asarray(matrice.multiply(matrice).sum(axis=1)).ravel())
+        normes_lignes = np.repeat(self._normes, longueurs)
+        donnees = np.divide(matrice.data, normes_lignes, out=np.zeros_like(matrice.data), where=normes_lignes != 0)
+        self._matrice_normalisee = csr_matrix((donnees, matrice.indices, matrice.indptr), shape=matrice.shape)
+        analyse = self.corpus.analyse()
+        self._doc_ids = np.array(analyse.doc_ids)
+        self._supprime = analyse.supprime.copy()
+        self._mot2id = analyse.mot2id
+        self._index = None
+        self._positions = None
+        self._dates = None  # Date de chaque ligne (epoch int64), pour les tendances
+        self._periodes = {}  # Granularité -> (périodes, matrice mots x périodes)
+
+    def _index_inverse(self):
+        # L'index inversé est construit au premier besoin
+        if self._index is None:
+            self._index = InvertedIndex(self._matrice_normalisee)
+        return self._index
 
-        mots_cle = mots_cle.lower().strip()
-
-        for mot in mots_cle.split():
-            vecteur_mot_cle = self.encodage_vecteur(mot).reshape(1, -1) # On shape pour avoir un vecteur ligne et 
-                                                                        # pouvoir l'utiliser dans le calcul de similarité
-            #Vectorisation du mot clé
-            similarites = []
-            for i in range(self.matriceRecherche.shape[0]): #On parcourt chaque document
-                # On extrait le vecteur du document i de la matrice TF-IDF
-                vecteur_doc = matrice_csr[i, :].toarray().reshape(-1, 1) # Extraction du vecteur du document i
-                # Calcul de la similarité cosinus entre le vecteur du mot clé et le vecteur du document
-                sim = self._cosinus(vecteur_mot_cle, vecteur_doc)
-                similarites.append(sim)
-            # Ajout des similarités au DataFrame des résultats
-            if resultat.empty:
-                resultat = pd.DataFrame({'doc_id': list(self.corpus.id2document.keys()), 'similarity': similarites})
+    def _index_positionnel(self):
+        # L'index positionnel n'est construit qu'à la première requête qui en a besoin
+        if self._positions is None:
+            if self.corpus is None:
+                raise ValueError("Phrase and NEAR queries need the corpus (SearchEngine.open(path, corpus=...))")
+            analyse = self.corpus.analyse()
+            self._positions = PositionalIndex(analyse.tokens, analyse.nb_mots, analyse.supprime)
+        return self._positions
+
+    def _decouper(self, texte):
+        # Découpage des mots des contraintes, le même que celui des textes du corpus
+        tokenizer = self.corpus.tokenizer if self.corpus is not None else Corpus.tokenizer
+        return tokenizer.decouper(texte)
+
+    def _lignes_contraintes(self, contraintes):
+        # Lignes des documents qui respectent toutes les contraintes de la requête
+        index = self._index_positionnel()
+        analyse = self.corpus.analyse()
+        lignes = None
+        for contrainte in contraintes:
+            ids_mots = [analyse.mot2id.get(mot) for mot in contrainte[1]]
+            if contrainte[0] == "expression":
+                trouvees = index.expression(ids_mots)
             else:
-                resultat['similarity'] += similarites  
-        # Tri des résultats par similarité décroissante
-        resultat = resultat.sort_values(by='similarity', ascending=False)
-        return resultat.head(nb_doc_retour)
+                trouvees = index.proximite(ids_mots[0], ids_mots[1], contrainte[2])
+            lignes = trouvees if lignes is None else np.intersect1d(lignes, trouvees, assume_unique=True)
+        if self._disque is not None:
+            # Index ouvert depuis le disque : ses lignes peuvent différer de celles de l'analyse
+            doc_ids = np.asarray(analyse.doc_ids)[lignes]
+            lignes = np.flatnonzero(np.isin(self._doc_ids, doc_ids) & ~self._supprime)
+        return lignes
 
-    
-    
+    def _poids_requete(self, mots_cle):
+        # Comptage des mots de la requête (id du mot -> nombre d'occurrences) : la somme des
+        # cosinus mot par mot de l'ancienne boucle revient à un produit scalaire avec ces poids
+        poids = {}
+        nb_mots = self._matrice_normalisee.shape[1]
+        for mot in mots_cle.lower().strip().split():
+            id_mot = self._mot2id.get(mot)
+            if id_mot is not None and id_mot < nb_mots:
+                poids[id_mot] = poids.get(id_mot, 0) + 1
+        return poids
+
+    def _vecteur_requete(self, mots_cle):
+        vecteur = np.zeros(self._matrice_normalisee.shape[1])
+        for id_mot, poids in self._poids_requete(mots_cle).items():
+            vecteur[id_mot] = poids
+        return vecteur
+
+    def _scorer_bm25(self):
+        # Le scorer BM25 est construit une seule fois, au premier besoin
+        if self._bm25 is None:
+            nb_documents = self._disque["nb_documents"] if self._disque is not None else self.corpus.analyse().nb_documents
+            self._bm25 = BM25(self._matrice_tf(), k1=self.k1, b=self.b, nb_documents=nb_documents)
+        return self._bm25
 
+    def _scores_top_k(self, mots_cle, k, ranking=None, k1=None, b=None):
+        # Retourne les lignes des k meilleurs documents et leurs scores, en passant par le cache
+        # (vidé dès que la génération du corpus change)
+        self._mettre_a_jour()
+        ranking = self.ranking if ranking is None else ranking
+        if ranking not in self.RANKINGS:
+            raise ValueError(f"Unknown ranking: {ranking}")
+        k1 = self.k1 if k1 is None else k1
+        b = self.b if b is None else b
+        cle = (_normaliser_requete(mots_cle), int(k), ranking, self.backend, k1, b)
+        resultat = self.cache.lire(cle, self._generation)
+        if resultat is None:
+            resultat = self._calculer_top_k(mots_cle, k, ranking, k1, b)
+            self.cache.ecrire(cle, *resultat)
+        return resultat
+
+    def _calculer_top_k(self, mots_cle, k, ranking, k1, b):
+        if not mots_cle.strip():
+            return np.array([], dtype=np.int64), np.array([])
+        contraintes, mots_cle = _analyser_requete(mots_cle, self._decouper)
+        if contraintes:
+            return self._scores_contraintes(contraintes, mots_cle, k, ranking, k1, b)
+        if ranking == "bm25":
+            lignes, scores = self._scorer_bm25().scores(self._poids_requete(mots_cle), k1=k1, b=b)
+            top = _top_k(scores, k)
+            return lignes[top], scores[top]
+        if self.backend == "index":
+            return self._index_inverse().top_k(self._poids_requete(mots_cle), k)
+        scores = self._matrice_normalisee @ self._vecteur_requete(mots_cle)
+        if self._supprime.any():
+            # Les documents supprimés ne doivent pas apparaître, même avec une similarité nulle
+            scores[self._supprime] = -np.inf
+            lignes = _top_k(scores, k)
+            lignes = lignes[np.isfinite(scores[lignes])]
+        else:
+            lignes = _top_k(scores, k)
+        return lignes, scores[lignes]
+
+    def _scores_contraintes(self, contraintes, mots_cle, k, ranking, k1, b):
+        # Seuls les documents qui respectent les contraintes sont classés
+        lignes = self._lignes_contraintes(contraintes)
+        if ranking == "bm25":
+            lignes_bm25, scores_bm25 = self._scorer_bm25().scores(self._poids_requete(mots_cle), k1=k1, b=b)
+            garder = np.isin(lignes_bm25, lignes)
+            lignes, scores = lignes_bm25[garder], scores_bm25[garder]
+        else:
+            scores = self._matrice_normalisee[lignes] @ self._vecteur_requete(mots_cle)
+            if self.backend == "index":
+                lignes, scores = lignes[scores != 0], scores[scores != 0]
+        top = _top_k(scores, k)
+        return lignes[top], scores[top]
+
+    def _resultat(self, lignes, scores):
+        # Mise en forme commune des résultats : doc_id + similarité, indexés par ligne de la matrice
+        import pandas as pd
+        return pd.DataFrame({'doc_id': self._doc_ids[lignes], 'similarity': scores}, index=lignes)
 
     # calcul similarité cosinus entre vecteur mot clé et chaque document
     def _cosinus(self, vec1, vec2):
@@ -63,139 +499,127 @@ class SearchEngine:
 
     # transformer les mots clés en vecteur TF-IDF
     def encodage_vecteur(self, mot):
-        # Le vecteur doit prendre des 0 jusqua l'id du mot dans le vocabulaire qui doit etre a 1
-        if mot in self.vocabulaire:
-            index_mot = self.vocabulaire[mot]['id']
-            vecteur_mot_cle = np.zeros(len(self.vocabulaire)) # On mets des 0 partout
-            vecteur_mot_cle[index_mot] = 1 # On mets un 1 a l'index du mot clé
-        else:
-            vecteur_mot_cle = np.zeros(len(self.vocabulaire)) # On mets des 0 partout
+        # Le vecteur doit prendre des 0 jusqua l'id du mot dans le vocabulaire qui doit etre a 1.
+        # Sa taille est le nombre de colonnes de la matrice : tant que l'analyse n'est pas compactée,
+        # les mots des documents supprimés gardent leur colonne et les ids ne sont pas renumérotés,
+        # le vocabulaire peut donc avoir moins d'entrées que la matrice n'a de colonnes
+        vocabulaire = self.vocabulaire
+        vecteur_mot_cle = np.zeros(self._matrice_normalisee.shape[1]) # On mets des 0 partout
+        if mot in vocabulaire:
+            vecteur_mot_cle[vocabulaire[mot]['id']] = 1 # On mets un 1 a l'index du mot clé
         
         return vecteur_mot_cle
         
 
  
-    def search2(self, mots_cle, nb_doc_retour=5):
+    def search2(self, mots_cle, nb_doc_retour=5, ranking=None, k1=None, b=None):
         """
-        Fonction de recherche améliorée qui calcule la similarité cosinus entre les mots-clés et chaque document avec une barre de progression.
+        Fonction de recherche améliorée qui calcule la similarité cosinus entre les mots-clés et chaque document.
+        Le calcul se fait en un seul produit matrice creuse-vecteur, puis les meilleurs documents
+        sont sélectionnés avec argpartition.
         Args:
-            mots_cle: str - Les mots-clés de recherche
+            mots_cle: str - Les mots-clés de recherche ; "mots entre guillemets" pour une expression exacte,
+                mot1 NEAR/k mot2 pour deux mots à au plus k positions d'écart
             nb_doc_retour: int - Le nombre de documents à retourner
+            ranking: str - "cosinus" ou "bm25" (par défaut celui du constructeur)
+            k1, b: float - Paramètres BM25 pour cette requête (par défaut ceux du constructeur)
         Returns:
             pd.DataFrame - Un DataFrame contenant les documents triés par similarité décroissante
             (ne retourne que les documents avec une similarité non nulle)
 
         """
-        resultat = pd.DataFrame()
-        matrice_csr = self.matriceRecherche.tocsr() # On reconverti la matrice pour la recherche
-        mots_cle = mots_cle.lower().strip()
-        mots_cle_list = mots_cle.split()
-
-        # Barre de progression pour les mots-clés + calcul des similarités
-        for mot in mots_cle_list:
-            # On encodage le mot clé en vecteur TF-IDF
-            vecteur_mot_cle = self.encodage_vecteur(mot).reshape(1, -1)
-            # On set up une liste pour stocker les similarités
-            similarites = []
-
-            for i in tqdm(range(self.matriceRecherche.shape[0]), desc=f"Calcul des similarités pour le mot '{mot}'", unit="doc"):  
-                # On extrait le vecteur du document i de la matrice TF-IDF
-                #np.array(vec2).reshape(-1)
-                vecteur_doc = matrice_csr[i, :].toarray().reshape(-1, 1)
-                np.array(vecteur_doc).reshape(-1)
-                # Calcul de la similarité cosinus
-                sim = self._cosinus(vecteur_mot_cle, vecteur_doc)
-                similarites.append(sim)
-            
-            # Ajout des similarités au DataFrame des résultats
-            if resultat.empty:
-                resultat = pd.DataFrame({
-                    'doc_id': list(self.corpus.id2document.keys()), 
-                    'similarity': similarites
-                })
-            else:  
-                # Si le dataframe n'est pas vide, on additionne les similarités (utile pour plusieurs mots-clés)
-                resultat['similarity'] = resultat['similarity'].add(similarites, fill_value=0)
-
-        
-        # Tri des résultats par similarité décroissante
-        resultat = resultat.sort_values(by='similarity', ascending=False)
-        resultats_non_nuls = resultat[resultat['similarity'] != 0.0]
-        # Retour des nb_doc_retour premiers documents
-        return resultats_non_nuls.head(nb_doc_retour)
+        lignes, scores = self._scores_top_k(mots_cle, nb_doc_retour, ranking, k1, b)
+        non_nuls = scores != 0.0
+        return self._resultat(lignes[non_nuls], scores[non_nuls])
     
 
-    def evolution_presence_mot(self, mots):  
+    def _dates_lignes(self):
+        # Date de publication (epoch int64, voir Dates.py) de chaque ligne de l'index, reprise du tableau
+        # des dates du corpus ; INCONNUE pour les lignes des documents supprimés
+        if self._dates is None:
+            if self.corpus is None:
+                raise ValueError("Word trends need the corpus (SearchEngine.open(path, corpus=...))")
+            dates = self.corpus.dates_publication(self._doc_ids)
+            dates[self._supprime] = Dates.INCONNUE
+            self._dates = dates
+        return self._dates
+
+    def _matrice_periodes(self, granularite):
+        # Matrice creuse mots x périodes : nombre de documents de la période qui contiennent le mot.
+        # C'est le produit de la matrice (périodes x documents) d'appartenance des documents à leur
+        # période par la matrice TF binarisée (documents x mots) ; elle est gardée par granularité.
+        if granularite not in self._periodes:
+            from scipy.sparse import csr_matrix
+            dates = self._dates_lignes()
+            lignes = np.flatnonzero(dates != Dates.INCONNUE)
+            periodes, colonnes = np.unique(Dates.periodes(dates[lignes], granularite), return_inverse=True)
+            appartenance = csr_matrix((np.ones(len(lignes), dtype=np.int64), (colonnes.ravel(), lignes)),
+                                      shape=(len(periodes), len(dates)))
+            presence = (self._matrice_tf() > 0).astype(np.int64)
+            self._periodes[granularite] = (periodes, (appartenance @ presence).T.tocsr())
+        return self._periodes[granularite]
+
+    def presence_mots(self, mots, granularite=None):
+        """
+        Nombre de documents qui contiennent chaque mot (mot entier, comme la recherche), par période.
+        Ne fait aucun graphique (utilisable sans matplotlib) : chaque mot est une ligne de la matrice
+        mots x périodes, calculée une seule fois par granularité.
+        Args:
+            mots: str ou list - Un mot ou une liste de mots
+            granularite: str - "jour", "mois" ou "annee" (None : la plus fine avec au plus 20 périodes)
+        Returns:
+            dict - mot -> {période: nombre de documents}, pour toutes les périodes du corpus
+            (date pour un jour, "AAAA-MM" pour un mois, "AAAA" pour une année)
+        """
+        self._mettre_a_jour()
+        if isinstance(mots, str):
+            mots = [mots]
+        if granularite is None:
+            granularite = Dates.granularite_auto(self._dates_lignes())
+        if granularite not in Dates.GRANULARITES:
+            raise ValueError(f"Unknown granularity: {granularite}")
+        periodes, matrice = self._matrice_periodes(granularite)
+        etiquettes = periodes.astype(object).tolist() if granularite == "jour" else [str(p) for p in periodes]
+        resultats = {}
+        for mot in mots:
+            id_mot = self._mot2id.get(mot.lower())
+            if id_mot is None or id_mot >= matrice.shape[0]:
+                comptes = np.zeros(len(etiquettes), dtype=np.int64)
+            else:
+                comptes = matrice[id_mot].toarray().ravel()
+            resultats[mot] = dict(zip(etiquettes, comptes.tolist()))
+        return resultats
+
+    def evolution_presence_mot(self, mots, granularite=None):
         """
         Trace l'évolution de la présence d'un ou plusieurs mots dans les documents.
         Args:
             mots: str ou list - Un mot ou une liste de mots à analyser
+            granularite: str - "jour", "mois" ou "annee" (None : choisie pour avoir au plus 20 dates)
         Returns:
             dict - Un dictionnaire avec les mots comme clés et les occurrences par date comme valeurs
         Affiche un graphique de l'évolution des occurrences au fil du temps.
+        Les données viennent de presence_mots, seul le graphique est fait ici.
         """
         # Convertir en liste si c'est un seul mot
         if isinstance(mots, str):
             mots = [mots]
-        # Récupérer toutes les dates de publication (déjà en timestamp)
-        dates_dt = list(self.corpus.get_all_publication_dates())
-        if not dates_dt:
+        self._mettre_a_jour()
+        if (self._dates_lignes() == Dates.INCONNUE).all():
             print("Aucune date de publication trouvée dans le corpus")
             return
-        for date in dates_dt:
-            if isinstance(date, str):
-                date = pd.to_datetime(date)
-        # Gérer la granularité de l'axe X pour limiter le nombre de dates affichées
-        max_ticks = 20
-        
-        # Compter le nombre de dates uniques par granularité
-        days = {ts.date() for ts in dates_dt}
-        months = {f"{ts.year:04d}-{ts.month:02d}" for ts in dates_dt}
-        years = {f"{ts.year:04d}" for ts in dates_dt}
-        
-        # Choisir la granularité la plus fine qui tient dans max_ticks
-        if len(days) <= max_ticks:
-            normalize = lambda ts: ts.date()
-        elif len(months) <= max_ticks:
-            normalize = lambda ts: f"{ts.year:04d}-{ts.month:02d}"
-        else:
-            normalize = lambda ts: f"{ts.year:04d}"
-        
-        # Normaliser et trier les dates uniques du corpus
-        dates_corpus = sorted(set(normalize(ts) for ts in dates_dt))
-        
+        resultats = self.presence_mots(mots, granularite)
+        import matplotlib.pyplot as plt
 
-        # Créer un dictionnaire pour chaque mot
-        resultats = {}
-        
-        for mot in mots:
-            # Initialiser avec 0 pour TOUTES les dates
-            occurrences_par_date = {date: 0 for date in dates_corpus}
-            
-            # Parcourir tous les documents
-            for doc in self.corpus.id2document.values():
-                if doc.published is None:
-                    continue
-                
-                # Normaliser la date du document
-                date = normalize(doc.published)
-                
-                # Vérifier si le mot est dans le document 
-                if mot.lower() in doc.text.lower():
-                    occurrences_par_date[date] += 1
-            
-            resultats[mot] = occurrences_par_date
-        
         # Créer le graphique
         plt.figure(figsize=(14, 6))
         
         # Tracer une courbe par mot
         for mot in mots:
             occurrences = resultats[mot]
-            counts = [occurrences[date] for date in dates_corpus]
-            dates_str = [str(date) for date in dates_corpus]
+            dates_str = [str(date) for date in occurrences]
             
-            plt.plot(dates_str, counts, marker='o', label=mot, linewidth=2)
+            plt.plot(dates_str, list(occurrences.values()), marker='o', label=mot, linewidth=2)
         
         plt.title("Évolution de la présence des mots au fil du temps : " + ", ".join(mots))
         plt.xlabel("Date")
@@ -0,0 +1,52 @@
+import re
+
+# Un mot = une suite de caractères \w (lettres, chiffres, _), en minuscules.
+# Les URLs (http://..., https://..., www....) sont ignorées en entier, même collées à un mot.
+MOT = re.compile(r'\w+')
+URL_OU_MOT = re.compile(r'(?:https?://|www\.)\S+|((?:(?!(?:https?://|www\.)\S)\w)+)', re.IGNORECASE)
+
+
+class Tokenizer:
+    """
+    Découpage des textes en mots en un seul parcours (finditer / findall d'une expression compilée),
+    au lieu des remplacements successifs (URLs, ponctuation, espaces) suivis d'un split.
+    Donne les mêmes mots que l'ancien nettoyage : texte en minuscules, URLs supprimées,
+    tout ce qui n'est pas \\w sert de séparateur.
+    On peut fournir son propre découpage au corpus (corpus.tokenizer = ...) en gardant les méthodes
+    decouper et tokens.
+    """
+
+    def decouper(self, texte):
+        """
+        Args:
+            texte: str - Texte à découper
+        Returns:
+            list - Les mots du texte, en minuscules
+        """
+        texte = texte.lower()
+        if "http" not in texte and "www" not in texte:
+            # Pas d'URL possible : l'expression simple suffit (cas le plus courant, plus rapide)
+            return MOT.findall(texte)
+        return [mot for mot in URL_OU_MOT.findall(texte) if mot]
+
+    def tokens(self, texte):
+        """
+        Mots du texte avec leur position dans le texte d'origine (pour surligner, concordancier...).
+        Args:
+            texte: str - Texte à découper
+        Returns:
+            générateur de (mot en minuscules, début, fin)
+        """
+        url_possible = re.search(r"http|www", texte, re.IGNORECASE) is not None
+        for match in (URL_OU_MOT if url_possible else MOT).finditer(texte):
+            mot = match.group(1) if url_possible else match.group()
+            if not mot:
+                continue
+            minuscules = mot.lower()
+            if len(minuscules) == len(mot):
+                yield minuscules, match.start(), match.end()
+            else:
+                # Rare : la mise en minuscules ajoute des caractères (ex : "İ"), qui peuvent couper
+                # le mot comme dans decouper ; les morceaux gardent la position du mot entier
+                for morceau in MOT.findall(minuscules):
+                    yield morceau, match.start(), match.end()
@@ -0,0 +1,150 @@
+import unittest
+import numpy as np
+from datetime import datetime
+from unittest.mock import patch
+from Document import RedditDocument
+from Corpus import Corpus
+from SearchEngine import SearchEngine
+from Analysis import CorpusAnalysis
+from Tokenizer import Tokenizer
+
+
+
+# ============================================
+# TESTS POUR Analysis.py
+# ============================================
+
+class TestCorpusAnalysis(unittest.TestCase):
+    """Tests pour la classe CorpusAnalysis"""
+
+    def setUp(self):
+        self.analyse = CorpusAnalysis(str.split)
+        self.analyse.ajouter_documents([(10, "b a b"), (20, "c a")])
+
+    def test_ids_premiere_apparition(self):
+        """Tester que les mots reçoivent un id dans l'ordre de première apparition"""
+        self.assertEqual(self.analyse.mots, ["b", "a", "c"])
+        self.assertEqual(self.analyse.doc_ids, [10, 20])
+        self.assertEqual(list(self.analyse.tokens[0]), [0, 1, 0])
+
+    def test_frequences(self):
+        """Tester les fréquences totales et par nombre de documents"""
+        self.assertEqual(list(self.analyse.frequences), [2, 2, 1])
+        self.assertEqual(list(self.analyse.frequences_nb_doc), [1, 2, 1])
+
+    def test_matrice_tf(self):
+        """Tester la matrice TF dérivée des tokens"""
+        np.testing.assert_array_equal(self.analyse.matrice_tf().toarray(), [[2, 1, 0], [0, 1, 1]])
+
+    def test_supprimer_et_compacter(self):
+        """Tester la suppression (tombstone) puis le compactage"""
+        self.analyse.supprimer_documents([10])
+        self.assertEqual(list(self.analyse.supprime), [True, False])
+        self.assertEqual(self.analyse.nb_documents, 1)
+        self.assertEqual(list(self.analyse.frequences_nb_doc), [0, 1, 1])
+        self.assertEqual(self.analyse.matrice_tfidf()[0].nnz, 0)
+        self.analyse.compacter()
+        self.assertEqual(self.analyse.mots, ["a", "c"])
+        self.assertEqual(self.analyse.doc_ids, [20])
+        self.assertEqual(self.analyse.mot2id, {"a": 0, "c": 1})
+        np.testing.assert_array_equal(self.analyse.matrice_tf().toarray(), [[1, 1]])
+
+    def test_ajout_lot(self):
+        """Tester l'ajout d'un second lot de documents"""
+        self.analyse.ajouter_documents([(30, "d b")])
+        self.assertEqual(self.analyse.mots, ["b", "a", "c", "d"])
+        self.assertEqual(list(self.analyse.frequences_nb_doc), [2, 2, 1, 1])
+        self.assertEqual(self.analyse.matrice_tf().shape, (3, 4))
+
+
+class TestCorpusAnalyseCache(unittest.TestCase):
+    """Tests du cache d'analyse partagé par le vocabulaire, les matrices et le moteur"""
+
+    def setUp(self):
+        Corpus._instance = None
+        self.corpus = Corpus("MachineLearning")
+        for i, texte in enumerate(["machine learning is great", "deep learning networks", "machine data"], 1):
+            self.corpus.id2document[i] = RedditDocument(
+                title=f"Article {i}",
+                authors=f"Author{i}",
+                text=texte,
+                published=datetime(2025, 12, i),
+                link=f"http://test{i}.com"
+            )
+
+    def test_textes_nettoyes_une_seule_fois(self):
+        """Tester que la construction du moteur ne nettoie chaque document qu'une fois"""
+        with patch.object(Tokenizer, "decouper", side_effect=lambda texte: texte.lower().split()) as nettoyer:
+            SearchEngine(self.corpus)
+            self.corpus.vocabulaire()
+            self.corpus.construire_matrice_tf()
+        self.assertEqual(nettoyer.call_count, 3)
+
+    def test_invalidation_modification_documents(self):
+        """Tester que l'analyse est refaite quand tous les documents sont remplacés"""
+        analyse = self.corpus.analyse()
+        self.assertIs(self.corpus.analyse(), analyse)
+        self.corpus.id2document = {1: RedditDocument("Article 1", "Author1", "quantum", datetime(2025, 12, 1), "http://test1.com")}
+        self.assertIsNot(self.corpus.analyse(), analyse)
+        self.assertEqual(self.corpus.analyse().mots, ["quantum"])
+
+    def test_remplacement_document(self):
+        """Tester qu'un document remplacé est supprimé puis réanalysé sous le même id"""
+        self.corpus.SEUIL_COMPACTAGE = 0.5
+        analyse = self.corpus.analyse()
+        self.corpus.id2document[3] = RedditDocument("Article 3", "Author3", "quantum", datetime(2025, 12, 3), "http://test3.com")
+        self.assertIs(self.corpus.analyse(), analyse)
+        self.assertIn("quantum", analyse.mot2id)
+        # Pas encore de compactage : l'ancienne ligne reste masquée et "data" n'apparaît plus
+        self.assertEqual(analyse.doc_ids, [1, 2, 3, 3])
+        self.assertEqual(analyse.frequences_nb_doc[analyse.mot2id["data"]], 0)
+        self.assertNotIn("data", self.corpus.vocabulaire()["mot"].values)
+
+    def test_ajout_etend_analyse(self):
+        """Tester qu'un ajout de document étend l'analyse existante au lieu de la refaire"""
+        analyse = self.corpus.analyse()
+        self.corpus.id2document[4] = RedditDocument("Article 4", "Author4", "quantum", datetime(2025, 12, 4), "http://test4.com")
+        self.assertIs(self.corpus.analyse(), analyse)
+        self.assertEqual(analyse.doc_ids, [1, 2, 3, 4])
+        self.assertIn("quantum", analyse.mot2id)
+
+    def test_idf_aligne_sur_colonnes(self):
+        """Tester que l'IDF est appliqué à la bonne colonne de la matrice TF"""
+        vocab = self.corpus._construire_dictionnaire_vocab()
+        tfidf = self.corpus.construire_matrice_tfidf().toarray()
+        # "learning" est dans 2 documents sur 3, "deep" dans 1 seul
+        self.assertAlmostEqual(tfidf[0, vocab["learning"]["id"]], np.log(3 / 2))
+        self.assertAlmostEqual(tfidf[1, vocab["deep"]["id"]], np.log(3))
+
+
+class TestAnalyseParallele(unittest.TestCase):
+    """Tests de l'analyse en plusieurs processus"""
+
+    def setUp(self):
+        Corpus._instance = None
+        self.corpus = Corpus("MachineLearning")
+        mots = ["machine", "learning", "deep", "data", "neural", "network", "Model", "science"]
+        for i in range(1, 41):
+            texte = " ".join(mots[(i * j) % len(mots)] for j in range(i % 7)) + f", doc{i % 5}!"
+            self.corpus.id2document[i] = RedditDocument(f"Article {i}", f"Author{i}", texte,
+                                                        datetime(2025, 12, 1), f"http://test{i}.com")
+
+    def test_identique_analyse_serie(self):
+        """Tester que l'analyse parallèle donne exactement le même résultat que l'analyse en série"""
+        serie = self.corpus.analyse(nb_processus=1)
+        self.corpus.id2document = dict(self.corpus.id2document)
+        parallele = self.corpus.analyse(nb_processus=2)
+        self.assertIsNot(serie, parallele)
+        self.assertEqual(parallele.mots, serie.mots)
+        self.assertEqual(parallele.doc_ids, serie.doc_ids)
+        for ids_parallele, ids_serie in zip(parallele.tokens, serie.tokens):
+            np.testing.assert_array_equal(ids_parallele, ids_serie)
+        np.testing.assert_array_equal(parallele.frequences_nb_doc, serie.frequences_nb_doc)
+        self.assertEqual((parallele.matrice_tf() != serie.matrice_tf()).nnz, 0)
+
+    def test_ajout_parallele(self):
+        """Tester l'ajout incrémental en parallèle"""
+        self.corpus.analyse(nb_processus=2)
+        self.corpus.add_documents([RedditDocument("Nouveau", "Author", "quantum machine", datetime(2025, 12, 1), "http://q.com")])
+        analyse = self.corpus.analyse(nb_processus=2)
+        self.assertEqual(list(analyse.tokens[-1]), [analyse.mot2id["quantum"], analyse.mot2id["machine"]])
@@ -0,0 +1,69 @@
+import io
+import unittest
+from ArxivParser import ArxivParser
+from Ingestion import document_arxiv
+
+
+
+# ============================================
+# TESTS POUR ArxivParser.py
+# ============================================
+
+def flux_atom(nb_entrees):
+    entrees = []
+    for i in range(nb_entrees):
+        auteurs = "<author><name>Auteur%d</name></author>" % i
+        if i % 2:
+            auteurs += "<author><name>Second</name></author>"
+        entrees.append(f"<entry>\n  <id>http://arxiv.org/abs/{i}</id>\n  <published>2025-01-01T00:00:00Z</published>\n"
+                       f"  <title>\n  Titre {i}\n  </title>\n  <summary>  Un resume assez long\nsur deux lignes {i}  </summary>\n"
+                       f"  {auteurs}\n</entry>")
+    return ('<?xml version="1.0" encoding="UTF-8"?>\n<feed xmlns="http://www.w3.org/2005/Atom" '
+            'xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/">\n'
+            f'<opensearch:totalResults>{nb_entrees}</opensearch:totalResults>\n{"".join(entrees)}\n</feed>').encode()
+
+
+class FluxSurveille(io.BytesIO):
+    """Flux qui retient jusqu'où il a été lu"""
+
+    def read(self, *args):
+        donnees = super().read(*args)
+        self.lu = self.tell()
+        return donnees
+
+
+class TestArxivParser(unittest.TestCase):
+    """Tests pour la lecture en flux des réponses arXiv"""
+
+    def test_entrees(self):
+        """Tester le contenu des entrées, au format de xmltodict"""
+        parser = ArxivParser(io.BytesIO(flux_atom(2)))
+        entrees = list(parser)
+        self.assertEqual(parser.total, 2)
+        self.assertEqual(entrees[0]["title"], "Titre 0")
+        self.assertEqual(entrees[0]["summary"], "Un resume assez long\nsur deux lignes 0")
+        self.assertEqual(entrees[0]["id"], "http://arxiv.org/abs/0")
+        # Un seul auteur : dict ; plusieurs auteurs : liste
+        self.assertEqual(entrees[0]["author"], {"name": "Auteur0"})
+        self.assertEqual(entrees[1]["author"], [{"name": "Auteur1"}, {"name": "Second"}])
+
+    def test_documents(self):
+        """Tester la création des documents à partir des entrées"""
+        documents = [document_arxiv(entree, "ML") for entree in ArxivParser(io.BytesIO(flux_atom(2)))]
+        self.assertEqual(documents[0][1], ["Auteur0"])
+        self.assertEqual(documents[1][1], ["Auteur1", "Second"])
+        self.assertEqual(documents[1][0].text, "Un resume assez long sur deux lignes 1")
+
+    def test_lecture_en_flux(self):
+        """Tester que la première entrée est produite avant la fin de la lecture"""
+        donnees = flux_atom(2000)
+        flux = FluxSurveille(donnees)
+        premiere = next(iter(ArxivParser(flux)))
+        self.assertEqual(premiere["title"], "Titre 0")
+        self.assertLess(flux.lu, len(donnees))
+
+    def test_flux_vide(self):
+        """Tester une réponse sans entrée"""
+        parser = ArxivParser(io.BytesIO(flux_atom(0)))
+        self.assertEqual(list(parser), [])
+        self.assertEqual(parser.total, 0)
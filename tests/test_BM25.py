@@ -0,0 +1,101 @@
+import unittest
+import numpy as np
+from datetime import datetime
+from scipy.sparse import csr_matrix
+from Document import RedditDocument
+from Corpus import Corpus
+from SearchEngine import SearchEngine
+from BM25 import BM25
+
+
+
+# ============================================
+# TESTS POUR BM25.py
+# ============================================
+
+class TestBM25(unittest.TestCase):
+    """Tests pour la classe BM25"""
+
+    def setUp(self):
+        """Petite matrice TF : 3 documents x 3 mots"""
+        self.tf = csr_matrix(np.array([
+            [2, 1, 0],
+            [0, 1, 0],
+            [1, 0, 3],
+        ], dtype=float))
+        self.bm25 = BM25(self.tf)
+
+    def _score_attendu(self, ligne, id_mot, k1, b):
+        dense = self.tf.toarray()
+        longueurs = dense.sum(axis=1)
+        df = (dense > 0).sum(axis=0)[id_mot]
+        idf = np.log(1 + (3 - df + 0.5) / (df + 0.5))
+        tf = dense[ligne, id_mot]
+        return idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * longueurs[ligne] / longueurs.mean()))
+
+    def test_tableaux_precalcules(self):
+        """Tester les longueurs, la longueur moyenne et l'IDF précalculés"""
+        np.testing.assert_allclose(self.bm25.longueurs, [3, 1, 4])
+        self.assertAlmostEqual(self.bm25.longueur_moyenne, 8 / 3)
+        self.assertEqual(len(self.bm25.idf), 3)
+
+    def test_scores_formule(self):
+        """Tester que les scores suivent la formule BM25"""
+        lignes, scores = self.bm25.scores({0: 1, 2: 1})
+        self.assertEqual(list(lignes), [0, 2])
+        self.assertAlmostEqual(scores[0], self._score_attendu(0, 0, 1.2, 0.75))
+        self.assertAlmostEqual(scores[1], self._score_attendu(2, 0, 1.2, 0.75) + self._score_attendu(2, 2, 1.2, 0.75))
+
+    def test_parametres_par_requete(self):
+        """Tester que k1 et b peuvent changer à chaque requête sans reconstruction"""
+        _, scores = self.bm25.scores({1: 1}, k1=2.0, b=0.0)
+        self.assertAlmostEqual(scores[0], self._score_attendu(0, 1, 2.0, 0.0))
+        self.assertAlmostEqual(scores[0], scores[1])  # b=0 : pas de normalisation par la longueur
+
+    def test_mot_absent(self):
+        """Tester une requête sans mot connu"""
+        lignes, scores = self.bm25.scores({})
+        self.assertEqual(len(lignes), 0)
+
+
+class TestSearchEngineBM25(unittest.TestCase):
+    """Tests du classement BM25 dans le moteur de recherche"""
+
+    def setUp(self):
+        Corpus._instance = None
+        self.corpus = Corpus("MachineLearning")
+        textes = [
+            "machine learning is great powerful algorithm",
+            "deep learning neural networks data science",
+            "machine machine learning classification",
+        ]
+        for i, texte in enumerate(textes, 1):
+            self.corpus.id2document[i] = RedditDocument(
+                title=f"Article {i}",
+                authors=f"Author{i}",
+                text=texte,
+                published=datetime(2025, 12, i),
+                link=f"http://test{i}.com",
+                subreddit="MachineLearning"
+            )
+        self.corpus.ndoc = len(textes)
+
+    def test_ranking_inconnu(self):
+        """Tester qu'un classement inconnu lève une exception"""
+        with self.assertRaises(ValueError):
+            SearchEngine(self.corpus, ranking="inconnu")
+
+    def test_ranking_construction(self):
+        """Tester le classement BM25 choisi à la construction"""
+        moteur = SearchEngine(self.corpus, ranking="bm25")
+        results = moteur.search2("machine", nb_doc_retour=5)
+        self.assertEqual(list(results["doc_id"]), [3, 1])
+
+    def test_ranking_par_requete(self):
+        """Tester le classement BM25 choisi à la requête, avec k1 et b modifiables"""
+        moteur = SearchEngine(self.corpus)
+        results = moteur.search2("machine", nb_doc_retour=5, ranking="bm25", k1=0.5, b=0.0)
+        self.assertEqual(list(results["doc_id"]), [3, 1])
+        results_cosinus = moteur.search2("machine", nb_doc_retour=5)
+        self.assertEqual(moteur.ranking, "cosinus")
+        self.assertTrue((results_cosinus["similarity"] <= 1.0 + 1e-9).all())
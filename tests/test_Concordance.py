@@ -0,0 +1,188 @@
+import unittest
+from datetime import datetime
+from Document import RedditDocument
+from Corpus import Corpus
+from Concordance import Concordance
+
+
+
+# ============================================
+# TESTS POUR Concordance.py
+# ============================================
+
+class TestConcordance(unittest.TestCase):
+    """Tests pour le concordancier"""
+
+    def setUp(self):
+        self.concordance = Concordance([10, 20, 30], [
+            "the machine learns",
+            "Machine vision and machine learning",
+            "no match here",
+        ])
+
+    def test_positions_documents(self):
+        """Tester le rattachement des occurrences à leur document et leur position dans le document"""
+        results = self.concordance.concorde("machine")
+        self.assertEqual(list(results["doc_id"]), [10, 20, 20])
+        self.assertEqual(list(results["debut"]), [4, 0, 19])
+        self.assertEqual(list(results["fin"]), [11, 7, 26])
+
+    def test_contexte_coupe_au_document(self):
+        """Tester que les contextes ne débordent pas sur les documents voisins"""
+        results = self.concordance.concorde("machine", taille_context=100)
+        self.assertEqual(results["contexteGauche"][0], "the ")
+        self.assertEqual(results["contexteDroite"][0], " learns")
+        self.assertEqual(results["contexteGauche"][1], "")
+        self.assertEqual(results["contexteDroite"][2], " learning")
+
+    def test_contexte_taille(self):
+        """Tester la taille des contextes"""
+        results = self.concordance.concorde("vision", taille_context=4)
+        self.assertEqual(results["contexteGauche"][0], "ine ")
+        self.assertEqual(results["contexteDroite"][0], " and")
+
+    def test_pagination(self):
+        """Tester la pagination des occurrences"""
+        toutes = self.concordance.concorde("machine")
+        page = self.concordance.concorde("machine", premier=1, nb_resultats=1)
+        self.assertEqual(len(page), 1)
+        self.assertEqual(page["debut"][0], toutes["debut"][1])
+
+    def test_generateur(self):
+        """Tester que le générateur donne les mêmes occurrences que le DataFrame"""
+        results = self.concordance.concorde("machine")
+        lignes = list(self.concordance.iter_concorde("machine"))
+        self.assertEqual(lignes, results.to_dict("records"))
+
+    def test_expression_entre_deux_documents(self):
+        """Tester qu'une expression ne correspond pas à l'espace qui sépare deux documents"""
+        concordance = Concordance([1, 2, 3], ["I love machine", "learning is fun", "machine learning rocks"])
+        results = concordance.concorde("machine learning")
+        self.assertEqual(list(results["doc_id"]), [3])
+        self.assertEqual((results["debut"][0], results["fin"][0]), (0, 16))
+        self.assertEqual(list(concordance.iter_concorde("machine learning")), results.to_dict("records"))
+        self.assertEqual(concordance.compter(["machine learning"]), {"machine learning": 1})
+        # Une occurrence qui chevauche celle qui est écartée est retrouvée
+        concordance = Concordance([1, 2], ["x a", "a a"])
+        self.assertEqual(list(concordance.concorde("a a")["doc_id"]), [2])
+
+    def test_aucune_occurrence(self):
+        """Tester un mot absent"""
+        results = self.concordance.concorde("absent")
+        self.assertEqual(len(results), 0)
+        self.assertIn("contexteGauche", results.columns)
+
+
+class TestCorpusConcorde(unittest.TestCase):
+    """Tests du concordancier du corpus"""
+
+    def setUp(self):
+        Corpus._instance = None
+        self.corpus = Corpus("MachineLearning")
+        self.corpus.add_documents([
+            RedditDocument("A", "Author1", "machine learning", datetime(2025, 12, 1), "http://a.com"),
+            RedditDocument("B", "Author2", "deep machine", datetime(2025, 12, 2), "http://b.com"),
+        ])
+
+    def test_invalidation(self):
+        """Tester que le concordancier suit les modifications du corpus"""
+        self.assertEqual(list(self.corpus.concorde("machine")["doc_id"]), [1, 2])
+        self.corpus.remove_documents([1])
+        self.assertEqual(list(self.corpus.concorde("machine")["doc_id"]), [2])
+        self.assertEqual(self.corpus.search("machine"), ["machine"])
+
+    def test_search_expression(self):
+        """Tester que search ne trouve pas une expression à cheval sur deux documents"""
+        self.assertEqual(self.corpus.search("learning deep"), [])
+        self.assertEqual(self.corpus.search("Machine Learning"), ["machine learning"])
+
+
+class TestConcordanceMultiple(unittest.TestCase):
+    """Tests du concordancier multi-mots"""
+
+    def setUp(self):
+        self.concordance = Concordance([1, 2], [
+            "Machine learning and deep learning",
+            "deep vision, machine",
+        ])
+
+    def test_identique_aux_recherches_separees(self):
+        """Tester que le résultat regroupe les résultats de concorde pour chaque mot"""
+        results = self.concordance.concorde_multiple(["machine", "deep"])
+        for mot in ("machine", "deep"):
+            seul = self.concordance.concorde(mot)
+            du_mot = results[results["keyword"] == mot].reset_index(drop=True)
+            self.assertEqual(du_mot.to_dict("records"), seul.to_dict("records"))
+        # Ordre du texte
+        self.assertEqual(list(results["keyword"]), ["machine", "deep", "deep", "machine"])
+
+    def test_mots_independants(self):
+        """Tester que chaque mot donne le même résultat que seul, même si ses occurrences en chevauchent d'autres"""
+        mots = ["machine", "machine learning", "learning", "deep learning"]
+        results = self.concordance.concorde_multiple(mots)
+        comptes = self.concordance.compter(mots)
+        for mot in mots:
+            seul = self.concordance.concorde(mot)
+            du_mot = results[results["keyword"] == mot].reset_index(drop=True)
+            self.assertEqual(du_mot.to_dict("records"), seul.to_dict("records"))
+            self.assertEqual(comptes[mot], len(seul))
+        # À la même position, dans l'ordre des mots demandés
+        self.assertEqual(list(results["keyword"][:2]), ["machine", "machine learning"])
+
+    def test_compter_independant(self):
+        """Tester que le compte d'un mot ne dépend pas des autres mots demandés"""
+        concordance = Concordance([1], ["America's future, america"])
+        self.assertEqual(concordance.compter(["america"]), {"america": 2})
+        self.assertEqual(concordance.compter(["america", "america's"]), {"america": 2, "america's": 1})
+
+    def test_compter(self):
+        """Tester le comptage de plusieurs mots"""
+        comptes = self.concordance.compter(["Learning", "deep", "absent"])
+        self.assertEqual(comptes, {"Learning": 2, "deep": 2, "absent": 0})
+        self.assertEqual(self.concordance.compter([]), {})
+
+    def test_expressions_et_mots_simples(self):
+        """Tester que les deux méthodes de parcours (mots simples / expressions) donnent les mêmes occurrences"""
+        simples = self.concordance.concorde_multiple(["deep", "vision"])
+        avec_expression = self.concordance.concorde_multiple(["deep", "vision", "zzz yyy"])
+        self.assertEqual(simples.to_dict("records"), avec_expression.to_dict("records"))
+
+
+class TestComptesParDocument(unittest.TestCase):
+    """Tests de la recherche par document"""
+
+    def setUp(self):
+        Corpus._instance = None
+        self.corpus = Corpus("MachineLearning")
+        self.corpus.add_documents([
+            RedditDocument("A", "Author1", "machine learning machine", datetime(2025, 12, 1), "http://a.com"),
+            RedditDocument("B", "Author2", "deep learning", datetime(2025, 12, 2), "http://b.com"),
+            RedditDocument("C", "Author3", "Machine", datetime(2025, 12, 3), "http://c.com"),
+        ])
+
+    def test_comptes(self):
+        """Tester le nombre d'occurrences par document"""
+        self.assertEqual(self.corpus.search("machine", par_document=True), {1: 2, 3: 1})
+        self.assertEqual(self.corpus.search("absent", par_document=True), {})
+
+    def test_arret_anticipe(self):
+        """Tester l'arrêt après les premiers documents trouvés (comptes complets)"""
+        self.assertEqual(self.corpus.search("machine", par_document=True, nb_documents=1), {1: 2})
+        self.assertEqual(self.corpus.search("learning", par_document=True, nb_documents=5), {1: 1, 2: 1})
+
+    def test_expression_entre_deux_documents(self):
+        """Tester que les comptes n'incluent pas une expression à cheval sur deux documents"""
+        self.corpus.add_documents([
+            RedditDocument("D", "Author4", "I love machine", datetime(2025, 12, 4), "http://d.com"),
+            RedditDocument("E", "Author5", "learning is fun", datetime(2025, 12, 5), "http://e.com"),
+        ])
+        self.assertEqual(self.corpus.search("machine learning", par_document=True), {1: 1})
+        self.assertEqual(self.corpus.search("machine learning", par_document=True, nb_documents=5), {1: 1})
+        # "Machine" (document 3) suivi de "I love" (document 4)
+        self.assertEqual(self.corpus.search("machine i", par_document=True, nb_documents=5), {})
+
+    def test_invalidation(self):
+        """Tester que les positions des documents sont recalculées après une modification"""
+        self.corpus.search("machine", par_document=True)
+        self.corpus.update_document(1, RedditDocument("A", "Author1", "nothing", datetime(2025, 12, 1), "http://a.com"))
+        self.assertEqual(self.corpus.search("machine", par_document=True), {3: 1})
@@ -112,3 +112,63 @@ class TestCorpus(unittest.TestCase):
             self.assertIn("keyword", results.columns)
             self.assertIn("contexteDroite", results.columns)
 
+    def test_add_documents(self):
+        """Tester l'ajout incrémental de documents"""
+        self.corpus.analyse()
+        doc3 = RedditDocument(
+            title="Article 3",
+            authors="Author3",
+            text="quantum computing machine",
+            published=datetime(2025, 12, 30),
+            link="http://test3.com"
+        )
+        ids = self.corpus.add_documents([doc3])
+        self.assertEqual(ids, [3])
+        self.assertEqual(self.corpus.ndoc, 3)
+        self.assertIn("Author3", self.corpus.id2author)
+        self.assertEqual(list(self.corpus.id2author["Author3"].document_ids), [3])
+        # Les caches dérivés des documents sont à jour
+        self.assertEqual(self.corpus.construire_matrice_tf().shape[0], 3)
+        self.assertEqual(len(self.corpus.search("quantum")), 1)
+
+    def test_remove_documents(self):
+        """Tester la suppression de documents et la mise à jour des auteurs"""
+        self.corpus.add_documents([RedditDocument("Article 3", "Author3", "quantum machine", datetime(2025, 12, 30), "http://test3.com")])
+        self.corpus.analyse()
+        self.corpus.remove_documents([3])
+        self.assertEqual(self.corpus.ndoc, 2)
+        self.assertNotIn("Author3", self.corpus.id2author)
+        self.assertEqual(self.corpus.construire_matrice_tf().shape[0], 2)
+        self.assertNotIn("quantum", self.corpus.vocabulaire()["mot"].values)
+
+    def test_update_document(self):
+        """Tester le remplacement d'un document en gardant son id"""
+        self.corpus.add_documents([RedditDocument("Article 3", "Author3", "quantum", datetime(2025, 12, 30), "http://test3.com")])
+        self.corpus.update_document(3, RedditDocument("Article 3", "Author4", "physics", datetime(2025, 12, 31), "http://test3.com"))
+        self.assertEqual(self.corpus.id2document[3].text, "physics")
+        self.assertNotIn("Author3", self.corpus.id2author)
+        self.assertEqual(list(self.corpus.id2author["Author4"].document_ids), [3])
+        self.assertEqual(len(self.corpus.search("quantum")), 0)
+
+    def test_load_from_csv(self):
+        """Tester le chargement en flux d'un fichier de discours"""
+        import os
+        import tempfile
+        contenu = (
+            '"speaker"\t"text"\t"date"\t"descr"\t"link"\n'
+            '"CLINTON"\t"Americans need a champion"\t"April 12, 2015"\t"Video Remarks"\t"http://a.com"\n'
+            '"TRUMP"\t"We will make America great"\t"June 16, 2015"\t"Remarks Announcing Candidacy"\t"http://b.com"\n'
+            '"CLINTON"\t"Everyday Americans"\t"April 12, 2015"\t"Interview"\t"http://c.com"\n'
+        )
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False, encoding="utf-8") as f:
+            f.write(contenu)
+        try:
+            ids = self.corpus.load_from_csv(f.name, chunksize=2)
+        finally:
+            os.remove(f.name)
+        self.assertEqual(ids, [3, 4, 5])
+        self.assertEqual(self.corpus.ndoc, 5)
+        self.assertEqual(list(self.corpus.id2author["CLINTON"].document_ids), [3, 5])
+        self.assertEqual(self.corpus.id2document[4].published, datetime(2015, 6, 16))
+        self.assertEqual(self.corpus.id2document[4].speaker, "TRUMP")
+        self.assertIn("americans", self.corpus.analyse().mot2id)
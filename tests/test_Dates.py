@@ -0,0 +1,110 @@
+import pickle
+import unittest
+from datetime import datetime, date, timedelta, timezone
+import numpy as np
+import Dates
+from Dates import DatesDocuments, INCONNUE, epoch
+from Document import RedditDocument, ArxivDocument, SpeechDocument
+from Corpus import Corpus
+
+
+
+# ============================================
+# TESTS POUR Dates.py
+# ============================================
+
+JOUR = 86400
+NOEL = int(datetime(2025, 12, 25, tzinfo=timezone.utc).timestamp())
+
+
+class TestDates(unittest.TestCase):
+    """Tests de la normalisation des dates"""
+
+    def test_formats(self):
+        """Tester que tous les formats du corpus donnent la même date"""
+        for published in (datetime(2025, 12, 25), date(2025, 12, 25), "25-12-2025", "2025-12-25T00:00:00Z",
+                          "December 25, 2025", datetime(2025, 12, 25, 1, tzinfo=timezone(timedelta(hours=1)))):
+            self.assertEqual(epoch(published), NOEL, published)
+
+    def test_inconnue(self):
+        """Tester les dates absentes ou illisibles"""
+        for published in (None, "", "Inconnu", 12):
+            self.assertEqual(epoch(published), INCONNUE)
+        self.assertTrue(np.isnat(Dates.vers_datetime64([INCONNUE])[0]))
+
+    def test_periodes_et_filtre(self):
+        """Tester les périodes et le filtrage par intervalle"""
+        epochs = np.array([NOEL, NOEL + 10 * JOUR, INCONNUE])
+        self.assertEqual([str(p) for p in Dates.periodes(epochs[:2], "mois")], ["2025-12", "2026-01"])
+        self.assertEqual(list(Dates.entre(epochs, debut="2025-12-26")), [False, True, False])
+        self.assertEqual(list(Dates.entre(epochs, fin=datetime(2025, 12, 25))), [True, False, False])
+        # Une fin au jour près inclut toute la journée, une fin avec heure est prise à la seconde
+        matin = np.array([NOEL + 10, NOEL + 10 * JOUR + 10, INCONNUE])
+        self.assertEqual(list(Dates.entre(matin, fin=date(2025, 12, 25))), [True, False, False])
+        self.assertEqual(list(Dates.entre(matin, fin="25-12-2025")), [True, False, False])
+        self.assertEqual(list(Dates.entre(matin, fin=datetime(2025, 12, 25))), [False, False, False])
+        self.assertEqual(list(Dates.entre(epochs, fin="2026-01-03")), [True, False, False])
+        self.assertEqual(Dates.granularite_auto(epochs), "jour")
+        with self.assertRaises(ValueError):
+            Dates.periodes(epochs, "semaine")
+
+    def test_dates_documents(self):
+        """Tester l'ajout, le remplacement et la suppression des dates"""
+        dates = DatesDocuments()
+        for doc_id in range(1, 5):
+            dates.ajouter(doc_id, datetime(2025, 12, 24 + doc_id))
+        dates.supprimer(2)
+        dates.supprimer(3)
+        dates.ajouter(2, "01-01-2026")
+        doc_ids, epochs = dates.tous()
+        self.assertEqual(list(doc_ids), [1, 4, 2])
+        self.assertEqual(list(epochs), [NOEL, NOEL + 3 * JOUR, NOEL + 7 * JOUR])
+        self.assertEqual(list(dates.dates([1, 2, 3])), [NOEL, NOEL + 7 * JOUR, INCONNUE])
+        # Les places libres sont retirées quand elles deviennent majoritaires
+        dates.supprimer(1)
+        dates.supprimer(4)
+        self.assertEqual(len(dates._epochs), 1)
+        self.assertEqual(list(dates.tous()[0]), [2])
+
+
+class TestDatesCorpus(unittest.TestCase):
+    """Tests des dates tenues à jour par le corpus"""
+
+    def setUp(self):
+        Corpus._instance = None
+        self.corpus = Corpus("MachineLearning")
+        self.corpus.add_documents([
+            RedditDocument(title="R", authors="A", text="texte", published="26-12-2025", link="http://r.com"),
+            ArxivDocument(title="X", authors=["B"], text="texte", published="2025-12-25T10:00:00Z", link="http://x.com"),
+            SpeechDocument(title="S", authors="C", text="texte", published=datetime(2025, 12, 28), link="http://s.com"),
+            SpeechDocument(title="I", authors="D", text="texte", published="Inconnu", link="http://i.com"),
+        ])
+
+    def test_filtre_et_tri(self):
+        """Tester le filtrage par intervalle et le tri par date"""
+        self.assertEqual(list(self.corpus.documents_entre("2025-12-26", "2025-12-31")), [1, 3])
+        self.assertEqual(list(self.corpus.documents_entre("2025-12-25", "2025-12-25")), [2])
+        self.assertEqual(list(self.corpus.documents_entre(fin="2025-12-25T09:59:59Z")), [])
+
+    def test_borne_invalide(self):
+        """Tester qu'une borne illisible lève une erreur au lieu d'être ignorée"""
+        with self.assertRaises(ValueError):
+            self.corpus.documents_entre("2025/12/30")
+        with self.assertRaises(ValueError):
+            self.corpus.documents_entre(fin="Inconnu")
+        self.assertEqual(list(self.corpus.documents_recents()), [3, 1, 2, 4])
+        self.assertEqual(list(self.corpus.documents_recents(2)), [3, 1])
+
+    def test_mise_a_jour(self):
+        """Tester que les dates suivent les ajouts, remplacements et suppressions"""
+        self.corpus.remove_documents([3])
+        self.corpus.update_document(1, RedditDocument(title="R", authors="A", text="texte", published="01-01-2026",
+                                                      link="http://r.com"))
+        self.assertEqual(list(self.corpus.documents_recents()), [1, 2, 4])
+        self.assertEqual(self.corpus.dates_publication([1, 3])[1], INCONNUE)
+
+    def test_pickle(self):
+        """Tester que les dates sont recalculées après un aller-retour pickle"""
+        doc_ids, epochs = pickle.loads(pickle.dumps(self.corpus)).dates_publication()
+        self.assertEqual(list(doc_ids), [1, 2, 3, 4])
+        self.assertEqual(epochs[0], NOEL + JOUR)
@@ -0,0 +1,222 @@
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from datetime import date, datetime
+from Document import RedditDocument, ArxivDocument, SpeechDocument
+from Corpus import Corpus
+from SearchEngine import SearchEngine
+from DocumentStore import TextStore, DocumentStore, save_documents, load_documents
+from Authors import Author
+
+
+
+# ============================================
+# TESTS POUR DocumentStore.py
+# ============================================
+
+class TestDocumentStore(unittest.TestCase):
+    """Tests de la sauvegarde des documents (textes en un seul fichier, lus à la demande)"""
+
+    def setUp(self):
+        Corpus._instance = None
+        self.corpus = Corpus("MachineLearning")
+        self.corpus.add_documents([
+            RedditDocument(title="Reddit", authors=["Alice"], text="machine learning é à ü",
+                           published="01-12-2025", link="http://r.com", comments_count=3, subreddit="ML"),
+            ArxivDocument(title="Arxiv", authors=["Bob", "Carol"], text="deep learning networks",
+                          published="2025-12-02T00:00:00Z", link="http://a.com"),
+            SpeechDocument(title="Speech", authors="CLINTON", text="",
+                           published=datetime(2016, 4, 7), link="http://s.com"),
+        ])
+        self.dossier = tempfile.mkdtemp()
+        self.corpus.save_store(self.dossier)
+
+    def tearDown(self):
+        shutil.rmtree(self.dossier)
+
+    def _recharger(self):
+        originaux = dict(self.corpus.id2document)
+        Corpus._instance = None
+        corpus = Corpus("Autre")
+        corpus.load_from_store(self.dossier)
+        return originaux, corpus
+
+    def test_aller_retour(self):
+        """Tester que les documents relus sont identiques aux originaux"""
+        originaux, corpus = self._recharger()
+        self.assertEqual(corpus.title, "MachineLearning")
+        self.assertEqual(list(corpus.id2document), list(originaux))
+        for doc_id, document in originaux.items():
+            relu = corpus.id2document[doc_id]
+            self.assertIs(type(relu), type(document))
+            self.assertEqual(relu, document)
+            self.assertEqual(relu.source, document.source)
+        self.assertEqual(corpus.id2document[1].comments_count, 3)
+        self.assertEqual(corpus.id2document[3].published, datetime(2016, 4, 7))
+        self.assertEqual((corpus.ndoc, corpus.nauth), (3, 4))
+        self.assertEqual(list(corpus.id2author["Bob"].document_ids), [2])
+
+    def test_date_et_valeurs_numpy(self):
+        """Tester qu'une date (sans heure) et un entier numpy sont écrits et relus"""
+        self.corpus.add_documents([
+            RedditDocument(title="Date", authors=["Dan"], text="date only", published=date(2025, 12, 3),
+                           link="http://d.com", comments_count=np.int64(7)),
+        ])
+        self.corpus.save_store(self.dossier)
+        _, corpus = self._recharger()
+        self.assertEqual(corpus.id2document[4].published, date(2025, 12, 3))
+        self.assertEqual(corpus.id2document[4].comments_count, 7)
+        self.assertEqual(corpus.id2document[3].published, datetime(2016, 4, 7))
+
+    def test_erreur_garde_le_store(self):
+        """Tester qu'une erreur pendant la sauvegarde laisse le store précédent intact"""
+        fichiers = sorted(os.listdir(self.dossier))
+        circulaire = []
+        circulaire.append(circulaire)
+        with self.assertRaises(ValueError):
+            # Métadonnées impossibles à écrire en JSON, découvertes après l'écriture des textes
+            save_documents(self.dossier, {1: self.corpus.id2document[2]}, circulaire=circulaire)
+        self.assertEqual(sorted(os.listdir(self.dossier)), fichiers)
+        id2document, _ = load_documents(self.dossier)
+        self.assertEqual(id2document[2].text, "deep learning networks")
+
+    def test_ancien_format(self):
+        """Tester la relecture d'un store écrit avec la colonne published_datetime"""
+        chemin = os.path.join(self.dossier, "metadata.json")
+        with open(chemin, encoding="utf-8") as f:
+            metadonnees = json.load(f)
+        types = metadonnees["colonnes"].pop("published_type")
+        metadonnees["colonnes"]["published_datetime"] = [t == "datetime" for t in types]
+        with open(chemin, "w", encoding="utf-8") as f:
+            json.dump(metadonnees, f)
+        id2document, _ = load_documents(self.dossier)
+        self.assertEqual(id2document[3].published, datetime(2016, 4, 7))
+        self.assertEqual(id2document[1].published, "01-12-2025")
+
+    def test_texte_lu_a_la_demande(self):
+        """Tester que les textes ne sont pas stockés dans les documents relus"""
+        _, corpus = self._recharger()
+        document = corpus.id2document[1]
+        self.assertIsNone(document._text)
+        self.assertEqual(document.text, "machine learning é à ü")
+        document.text = "nouveau texte"
+        self.assertEqual(document.text, "nouveau texte")
+
+    def test_recherche_apres_chargement(self):
+        """Tester que le moteur fonctionne sur un corpus relu depuis le disque"""
+        _, corpus = self._recharger()
+        results = SearchEngine(corpus).search2("learning", nb_doc_retour=5)
+        self.assertEqual(sorted(results["doc_id"]), [1, 2])
+
+    def test_pickle_document_relu(self):
+        """Tester qu'un document relu peut être picklé (le store est rouvert)"""
+        _, corpus = self._recharger()
+        copie = pickle.loads(pickle.dumps(corpus.id2document[2]))
+        self.assertEqual(copie.text, "deep learning networks")
+
+    def test_text_store(self):
+        """Tester la lecture directe des textes par position"""
+        store = TextStore(self.dossier)
+        self.assertEqual(len(store), 3)
+        self.assertEqual(store.texte(1), "deep learning networks")
+        self.assertEqual(store.texte(2), "")
+        store.close()
+
+
+class TestColonnes(unittest.TestCase):
+    """Tests du stockage en colonnes (DocumentStore) et des documents légers"""
+
+    def setUp(self):
+        Corpus._instance = None
+        self.corpus = Corpus("MachineLearning")
+        self.documents = [
+            RedditDocument(title="Reddit %d" % i, authors=["Alice"], text="machine learning %d" % i,
+                           published="01-12-2025", link="http://r.com/%d" % i, comments_count=i,
+                           subreddit="ML", source="reddit_ML") for i in range(3)
+        ] + [ArxivDocument(title="Arxiv", authors=["Bob", "Carol"], text="deep learning networks",
+                           published="2025-12-02T00:00:00Z", link="http://a.com", source="arxiv_ML")]
+        self.corpus.add_documents(self.documents)
+
+    def test_documents_legers(self):
+        """Tester que les documents du store ont les mêmes valeurs, sans rien stocker eux-mêmes"""
+        store, legers = DocumentStore.depuis_documents(self.documents)
+        for original, leger in zip(self.documents, legers):
+            self.assertIs(type(leger), type(original))
+            self.assertEqual(leger, original)
+            self.assertEqual(leger.source, original.source)
+            self.assertFalse(hasattr(leger, "__dict__"))
+        self.assertEqual(legers[2].comments_count, 2)
+        self.assertEqual(legers[3].get_authors_list(), ["Bob", "Carol"])
+        # Les valeurs répétées ne sont gardées qu'une fois dans leur colonne
+        self.assertEqual(store._colonnes["source"].valeurs, ["reddit_ML", "arxiv_ML"])
+        self.assertEqual(len(store._colonnes["authors"].valeurs), 2)
+
+    def test_modification(self):
+        """Tester qu'un attribut modifié est gardé dans le document, sans toucher au store"""
+        store, legers = DocumentStore.depuis_documents(self.documents)
+        legers[0].title = "Nouveau titre"
+        legers[0].text = "nouveau texte"
+        self.assertEqual((legers[0].title, legers[0].text), ("Nouveau titre", "nouveau texte"))
+        self.assertEqual(store.document(0).title, "Reddit 0")
+        with self.assertRaises(TypeError):
+            legers[1].comments_count = -1
+
+    def test_pickle(self):
+        """Tester qu'un document léger est picklé avec ses valeurs, sans le store"""
+        _, legers = DocumentStore.depuis_documents(self.documents)
+        copie = pickle.loads(pickle.dumps(legers[3]))
+        self.assertIsNone(copie._store)
+        self.assertEqual(copie, self.documents[3])
+
+    def test_compacter_documents(self):
+        """Tester que compacter_documents garde les ids, les résultats et l'analyse déjà faite"""
+        moteur = SearchEngine(self.corpus)
+        avant = moteur.search2("learning networks", nb_doc_retour=5)
+        generation = self.corpus._generation
+        self.corpus.compacter_documents()
+        self.assertEqual(self.corpus._generation, generation)
+        self.assertIsNotNone(self.corpus.id2document[4]._store)
+        self.assertEqual(self.corpus.id2document[4], self.documents[3])
+        self.assertTrue(avant.equals(moteur.search2("learning networks", nb_doc_retour=5)))
+        self.assertEqual(self.corpus.search("networks", par_document=True), {4: 1})
+
+    def test_auteur(self):
+        """Tester que les ids des documents d'un auteur sont gardés dans un array"""
+        auteur = self.corpus.id2author["Alice"]
+        self.assertEqual(list(auteur.document_ids), [1, 2, 3])
+        self.assertEqual(auteur._document_ids.typecode, "q")
+        # Les ids sont modifiables directement, comme quand document_ids était une liste
+        self.assertIs(auteur.document_ids, auteur._document_ids)
+        auteur.document_ids.append(4)
+        self.assertTrue(auteur.a_publie(4))
+        auteur.document_ids.remove(4)
+        self.assertTrue(auteur.a_publie(2))
+        auteur.remove_publication(2)
+        self.assertEqual((list(auteur.document_ids), auteur.nb_publications), ([1, 3], 2))
+        copie = pickle.loads(pickle.dumps(auteur))
+        self.assertEqual((copie.name, list(copie.document_ids)), ("Alice", [1, 3]))
+        self.assertFalse(hasattr(Author("X"), "__dict__"))
+
+
+class TestLoadFromPickle(unittest.TestCase):
+    """Tests du rechargement d'un pickle"""
+
+    def test_compteurs_mis_a_jour(self):
+        """Tester que ndoc et nauth sont mis à jour après load_from_pickle"""
+        Corpus._instance = None
+        corpus = Corpus("MachineLearning")
+        corpus.add_documents([RedditDocument(title="T", authors=["Alice"], text="machine learning",
+                                             published="01-12-2025", link="http://r.com")])
+        dossier = tempfile.mkdtemp()
+        try:
+            chemin = os.path.join(dossier, "corpus.pkl")
+            corpus.save_pickle(chemin)
+            corpus.ndoc, corpus.nauth = 0, 0
+            corpus.load_from_pickle(chemin)
+            self.assertEqual((corpus.ndoc, corpus.nauth), (1, 1))
+        finally:
+            shutil.rmtree(dossier)
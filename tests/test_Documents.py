@@ -4,7 +4,7 @@
 # ============================================
 import unittest
 from datetime import datetime
-from Document import RedditDocument, ArxivDocument, DocumentFactory
+from Document import RedditDocument, ArxivDocument, SpeechDocument, DocumentFactory
 
 
 
@@ -122,4 +122,17 @@ class TestArxivDocument(unittest.TestCase):
             published="2025-12-29",
             link="http://test.com"
         )
-        self.assertIsInstance(doc, ArxivDocument)
\ No newline at end of file
+        self.assertIsInstance(doc, ArxivDocument)
+    def test_document_factory_speech(self):
+        """Tester la factory pour créer un discours"""
+        doc = DocumentFactory.create_document(
+            "speech",
+            title="Remarks in Keene, New Hampshire",
+            authors="CLINTON",
+            text="Thank you all very much",
+            published=datetime(2015, 4, 20),
+            link="http://www.presidency.ucsb.edu/ws/index.php?pid=110045"
+        )
+        self.assertIsInstance(doc, SpeechDocument)
+        self.assertEqual(doc.speaker, "CLINTON")
+        self.assertEqual(doc.get_authors_list(), ["CLINTON"])
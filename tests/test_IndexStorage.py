@@ -0,0 +1,113 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from datetime import datetime
+from Document import RedditDocument
+from Corpus import Corpus
+from SearchEngine import SearchEngine
+from IndexStorage import VocabulaireTrie, FORMAT_VERSION
+
+
+
+# ============================================
+# TESTS POUR IndexStorage.py
+# ============================================
+
+class TestVocabulaireTrie(unittest.TestCase):
+    """Tests pour la recherche dans le vocabulaire trié"""
+
+    def test_get(self):
+        """Tester la recherche mot -> id"""
+        vocabulaire = VocabulaireTrie(*VocabulaireTrie.tableaux(["machine", "deep", "learning"]))
+        self.assertEqual(vocabulaire.get("machine"), 0)
+        self.assertEqual(vocabulaire.get("learning"), 2)
+        self.assertIsNone(vocabulaire.get("zzz"))
+        self.assertIn("deep", vocabulaire)
+        self.assertEqual(len(vocabulaire), 3)
+
+    def test_utf8(self):
+        """Tester la recherche de mots non ASCII et la relecture des mots"""
+        mots = ["zèbre", "été", "eau", "étés", "œuvre"]
+        vocabulaire = VocabulaireTrie(*VocabulaireTrie.tableaux(mots))
+        for id_mot, mot in enumerate(mots):
+            self.assertEqual(vocabulaire.get(mot), id_mot)
+        self.assertIsNone(vocabulaire.get("ét"))
+        self.assertEqual(vocabulaire.mots(), mots)
+        self.assertEqual(len(VocabulaireTrie(*VocabulaireTrie.tableaux([]))), 0)
+
+
+class TestSearchEngineDisque(unittest.TestCase):
+    """Tests de la sauvegarde et de l'ouverture (mmap) de l'index"""
+
+    def setUp(self):
+        Corpus._instance = None
+        self.corpus = Corpus("MachineLearning")
+        textes = [
+            "machine learning is great powerful algorithm",
+            "deep learning neural networks data science",
+            "machine learning classification regression",
+        ]
+        for i, texte in enumerate(textes, 1):
+            self.corpus.id2document[i] = RedditDocument(
+                title=f"Article {i}",
+                authors=f"Author{i}",
+                text=texte,
+                published=datetime(2025, 12, i),
+                link=f"http://test{i}.com"
+            )
+        self.search_engine = SearchEngine(self.corpus)
+        self.dossier = tempfile.mkdtemp()
+        self.search_engine.save(self.dossier)
+
+    def tearDown(self):
+        shutil.rmtree(self.dossier)
+
+    def test_open_memes_resultats(self):
+        """Tester que l'index ouvert donne les mêmes résultats que le moteur d'origine"""
+        moteur = SearchEngine.open(self.dossier)
+        for requete in ["machine", "deep learning", "xyzunknown"]:
+            attendu = self.search_engine.search2(requete)
+            obtenu = moteur.search2(requete)
+            self.assertEqual(list(obtenu["doc_id"]), list(attendu["doc_id"]))
+            np.testing.assert_allclose(obtenu["similarity"].values, attendu["similarity"].values)
+        attendu = self.search_engine.search2("learning", ranking="bm25")
+        obtenu = moteur.search2("learning", ranking="bm25")
+        np.testing.assert_allclose(obtenu["similarity"].values, attendu["similarity"].values)
+
+    def test_open_memory_map(self):
+        """Tester que les tableaux de l'index sont projetés en mémoire en lecture seule"""
+        moteur = SearchEngine.open(self.dossier)
+        self.assertIsInstance(moteur._disque["data"], np.memmap)
+        self.assertTrue(np.shares_memory(moteur._matrice_normalisee.data, moteur._disque["data"]))
+        self.assertFalse(moteur._disque["data"].flags.writeable)
+        self.assertEqual(moteur.vocabulaire["machine"]["frequence_nb_doc"], 2)
+
+    def test_open_version_inconnue(self):
+        """Tester qu'un index d'une autre version n'est pas ouvert"""
+        chemin = os.path.join(self.dossier, "manifest.json")
+        with open(chemin) as f:
+            manifeste = json.load(f)
+        manifeste["version"] = FORMAT_VERSION + 1
+        with open(chemin, "w") as f:
+            json.dump(manifeste, f)
+        with self.assertRaises(ValueError):
+            SearchEngine.open(self.dossier)
+
+    def test_taille_vocabulaire(self):
+        """Tester qu'un mot très long n'agrandit pas les autres mots du vocabulaire sauvegardé"""
+        long_mot = "a" * 5000
+        self.corpus.id2document[4] = RedditDocument(title="Article 4", authors="Author4", text="machine " + long_mot,
+                                                    published=datetime(2025, 12, 4), link="http://test4.com")
+        SearchEngine(self.corpus).save(self.dossier)
+        moteur = SearchEngine.open(self.dossier)
+        mots = moteur._mots()
+        self.assertIn(long_mot, mots)
+        self.assertIsNotNone(moteur._mot2id.get(long_mot))
+        nb_octets = sum(len(mot.encode("utf-8")) for mot in mots)
+        self.assertEqual(moteur._disque["mots_utf8"].nbytes, nb_octets)
+        # Octets des mots + en-têtes .npy : le vocabulaire n'est stocké qu'une fois, sans largeur fixe
+        self.assertLessEqual(os.path.getsize(os.path.join(self.dossier, "mots_utf8.npy")), nb_octets + 128)
+        self.assertFalse(os.path.exists(os.path.join(self.dossier, "mots_tries.npy")))
@@ -0,0 +1,201 @@
+import asyncio
+import json
+import re
+import shutil
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from Corpus import Corpus
+from Ingestion import Ingestion
+
+
+
+# ============================================
+# TESTS POUR Ingestion.py (serveur HTTP local, sans réseau)
+# ============================================
+
+NB_ARXIV = 5
+TEXTE = "un texte assez long pour etre garde dans le corpus"
+DATE = 1735689600
+POSTS = [("t3_1", "court", DATE), ("t3_2", TEXTE, DATE), ("t3_3", TEXTE, DATE)]
+
+
+def page_atom(start, nb, requete=""):
+    # Filtre submittedDate:[AAAAMMJJHHMM TO ...] de l'API arXiv (utilisé par la synchronisation)
+    depuis = re.search(r"submittedDate:\[(\d{12}) TO", requete)
+    numeros = [i for i in range(ServeurStub.nb_arxiv)
+               if depuis is None or f"202501{i + 1:02d}0000" >= depuis.group(1)]
+    entrees = []
+    for i in numeros[start:start + nb]:
+        # Un seul auteur pour les entrées paires, deux pour les impaires
+        auteurs = "<author><name>Auteur%d</name></author>" % i
+        if i % 2:
+            auteurs += "<author><name>Commun</name></author>"
+        entrees.append(f"<entry><id>http://arxiv.org/abs/{i}</id><published>2025-01-{i + 1:02d}T00:00:00Z</published>"
+                       f"<title>Arxiv {i}</title><summary>{TEXTE}\n{i}</summary>{auteurs}</entry>")
+    return ('<?xml version="1.0" encoding="UTF-8"?><feed xmlns="http://www.w3.org/2005/Atom" '
+            'xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/">'
+            f'<opensearch:totalResults>{len(numeros)}</opensearch:totalResults>{"".join(entrees)}</feed>').encode()
+
+
+def page_reddit(after, limite):
+    # Les posts de ServeurStub.posts, limite par page, le curseur étant le nom du dernier post de la page
+    noms = [nom for nom, _, _ in ServeurStub.posts]
+    debut = 0 if after is None else noms.index(after) + 1
+    posts = ServeurStub.posts[debut:debut + limite]
+    enfants = [{"data": {"name": nom, "title": nom, "author": "redditor", "selftext": texte,
+                         "created_utc": date, "url": f"http://reddit/{nom}",
+                         "num_comments": 1, "subreddit": "ML"}} for nom, texte, date in posts]
+    suivant = posts[-1][0] if debut + limite < len(noms) else None
+    return json.dumps({"data": {"children": enfants, "after": suivant}}).encode()
+
+
+class ServeurStub(BaseHTTPRequestHandler):
+    requetes = []
+    pannes = set()  # start des pages arXiv qui échouent (une fois)
+    posts = POSTS
+    nb_arxiv = NB_ARXIV
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {cle: valeurs[0] for cle, valeurs in parse_qs(url.query).items()}
+        ServeurStub.requetes.append((url.path, params))
+        if url.path == "/api/query" and int(params["start"]) in ServeurStub.pannes:
+            ServeurStub.pannes.discard(int(params["start"]))
+            self.send_response(500)
+            self.end_headers()
+            return
+        if url.path == "/api/query":
+            corps = page_atom(int(params["start"]), int(params["max_results"]), params["search_query"])
+        else:
+            corps = page_reddit(params.get("after"), int(params["limit"]))
+        self.send_response(200)
+        self.end_headers()
+        self.wfile.write(corps)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestIngestion(unittest.TestCase):
+    """Tests du téléchargement asynchrone Reddit + arXiv"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.serveur = ThreadingHTTPServer(("127.0.0.1", 0), ServeurStub)
+        threading.Thread(target=cls.serveur.serve_forever, daemon=True).start()
+        cls.url = f"http://127.0.0.1:{cls.serveur.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.serveur.shutdown()
+        cls.serveur.server_close()
+
+    def setUp(self):
+        ServeurStub.requetes = []
+        ServeurStub.pannes = set()
+        ServeurStub.posts = POSTS
+        ServeurStub.nb_arxiv = NB_ARXIV
+        Corpus._instance = None
+        self.corpus = Corpus("ML")
+        self.options = {"url_reddit": self.url, "url_arxiv": self.url + "/api/query", "taille_page": 2}
+
+    def test_pagination(self):
+        """Tester que les pages arXiv et Reddit sont toutes demandées"""
+        reddit, arxiv = asyncio.run(Ingestion("ML", **self.options).telecharger())
+        starts = sorted(int(p["start"]) for chemin, p in ServeurStub.requetes if chemin == "/api/query")
+        self.assertEqual(starts, [0, 2, 4])
+        self.assertEqual(len([1 for chemin, _ in ServeurStub.requetes if chemin == "/r/ML/hot.json"]), 2)
+        self.assertEqual([document.title for document, _ in arxiv], [f"Arxiv {i}" for i in range(NB_ARXIV)])
+        # Le post trop court est ignoré
+        self.assertEqual([document.title for document, _ in reddit], ["t3_2", "t3_3"])
+
+    def test_corpus(self):
+        """Tester le chargement du corpus : ids, auteurs et documents"""
+        asyncio.run(self.corpus.load_from_net_async(**self.options))
+        self.assertEqual(self.corpus.ndoc, 7)
+        self.assertEqual(self.corpus.id2document[1].source, "reddit_ML")
+        self.assertEqual(self.corpus.id2document[3].title, "Arxiv 0")
+        self.assertEqual(list(self.corpus.id2author["redditor"].document_ids), [1, 2])
+        self.assertEqual(list(self.corpus.id2author["Commun"].document_ids), [4, 6])
+        self.assertEqual(list(self.corpus.id2author["Auteur0"].document_ids), [3])
+
+    def test_limite(self):
+        """Tester le nombre maximum de résultats arXiv"""
+        _, arxiv = asyncio.run(Ingestion("ML", max_arxiv=3, **self.options).telecharger())
+        self.assertEqual(len(arxiv), 3)
+        tailles = sorted(int(p["max_results"]) for chemin, p in ServeurStub.requetes if chemin == "/api/query")
+        self.assertEqual(tailles, [1, 2])
+
+    def test_synchronisation(self):
+        """Tester qu'une synchronisation ne télécharge et n'ajoute que les nouveaux documents"""
+        asyncio.run(self.corpus.load_from_net_async(**self.options))
+        self.assertEqual(self.corpus._derniere_synchro, {"reddit": DATE, "arxiv": "2025-01-05T00:00:00Z"})
+        # Un nouveau post (en tête du listing "new") et deux nouveaux articles
+        ServeurStub.posts = [("t3_4", TEXTE, DATE + 3600)] + POSTS
+        ServeurStub.nb_arxiv = NB_ARXIV + 2
+        ServeurStub.requetes = []
+        ids = asyncio.run(self.corpus.sync_from_net_async(**self.options))
+        self.assertEqual(ids, [8, 9, 10])
+        self.assertEqual([self.corpus.id2document[i].title for i in ids], ["t3_4", "Arxiv 5", "Arxiv 6"])
+        # Les documents déjà présents gardent leur id
+        self.assertEqual(self.corpus.id2document[1].title, "t3_2")
+        self.assertEqual(self.corpus.id2document[7].title, "Arxiv 4")
+        self.assertEqual(list(self.corpus.id2author["redditor"].document_ids), [1, 2, 8])
+        # Une seule page Reddit (le post suivant est déjà connu), arXiv limité aux dates récentes
+        chemins = [chemin for chemin, _ in ServeurStub.requetes]
+        self.assertEqual(chemins.count("/r/ML/new.json"), 1)
+        requetes_arxiv = [p["search_query"] for chemin, p in ServeurStub.requetes if chemin == "/api/query"]
+        self.assertEqual(requetes_arxiv, ["all:ML AND submittedDate:[202501050000 TO 999912312359]"] * 2)
+        self.assertEqual(self.corpus._derniere_synchro, {"reddit": DATE + 3600, "arxiv": "2025-01-07T00:00:00Z"})
+        # Rien de nouveau : aucun document ajouté
+        self.assertEqual(asyncio.run(self.corpus.sync_from_net_async(**self.options)), [])
+        self.assertEqual(self.corpus.ndoc, 10)
+
+    def test_synchronisation_doublons(self):
+        """Tester que les documents déjà présents (même lien) ne sont pas ajoutés une seconde fois"""
+        asyncio.run(self.corpus.load_from_net_async(**self.options))
+        self.corpus._derniere_synchro = {}
+        self.assertEqual(asyncio.run(self.corpus.sync_from_net_async(**self.options)), [])
+        self.assertEqual(self.corpus.ndoc, 7)
+
+
+class TestCacheEtReprise(TestIngestion):
+    """Tests du cache des réponses et de la reprise d'une ingestion interrompue"""
+
+    def setUp(self):
+        super().setUp()
+        self.dossier = tempfile.mkdtemp()
+        self.options["dossier_cache"] = self.dossier
+
+    def tearDown(self):
+        shutil.rmtree(self.dossier)
+
+    def _telecharger(self, **options):
+        return asyncio.run(Ingestion("ML", **dict(self.options, **options)).telecharger())
+
+    def test_cache(self):
+        """Tester qu'une requête répétée est servie par le disque, sauf si elle a expiré"""
+        premier = self._telecharger()
+        self.assertEqual(len(ServeurStub.requetes), 5)
+        ServeurStub.requetes = []
+        second = self._telecharger()
+        self.assertEqual(ServeurStub.requetes, [])
+        self.assertEqual([d.title for d, _ in second[1]], [d.title for d, _ in premier[1]])
+        self._telecharger(ttl=0)
+        self.assertEqual(len(ServeurStub.requetes), 5)
+
+    def test_reprise(self):
+        """Tester qu'une ingestion interrompue reprend sans retélécharger les pages déjà lues"""
+        ServeurStub.pannes = {4}
+        with self.assertRaises(Exception):
+            self._telecharger(ttl=0)
+        ServeurStub.requetes = []
+        reddit, arxiv = self._telecharger(ttl=0)
+        # Seule la page en échec est redemandée : les autres viennent du cache malgré ttl=0
+        pages_arxiv = [params["start"] for chemin, params in ServeurStub.requetes if chemin == "/api/query"]
+        self.assertEqual(pages_arxiv, ["4"])
+        self.assertEqual(len(arxiv), NB_ARXIV)
+        self.assertEqual(len(reddit), 2)
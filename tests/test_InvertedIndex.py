@@ -0,0 +1,91 @@
+import unittest
+import numpy as np
+from datetime import datetime
+from scipy.sparse import random as sparse_random
+from Document import RedditDocument
+from Corpus import Corpus
+from SearchEngine import SearchEngine
+from InvertedIndex import InvertedIndex
+
+
+
+# ============================================
+# TESTS POUR InvertedIndex.py
+# ============================================
+
+class TestInvertedIndex(unittest.TestCase):
+    """Tests pour la classe InvertedIndex"""
+
+    def setUp(self):
+        """Construire un index sur une matrice creuse aléatoire"""
+        self.matrice = sparse_random(200, 30, density=0.1, format="csr", random_state=42)
+        self.index = InvertedIndex(self.matrice)
+
+    def test_postings_tries_par_ligne(self):
+        """Tester que chaque liste de postings est triée et contient les bons poids"""
+        dense = self.matrice.toarray()
+        for id_mot in range(30):
+            lignes, poids = self.index.postings(id_mot)
+            self.assertTrue(np.all(np.diff(lignes) > 0))
+            np.testing.assert_allclose(poids, dense[lignes, id_mot])
+
+    def test_bornes_superieures(self):
+        """Tester que la borne de chaque mot est le poids maximal de ses postings"""
+        dense = self.matrice.toarray()
+        np.testing.assert_allclose(self.index.bornes, dense.max(axis=0))
+
+    def test_top_k_identique_calcul_exhaustif(self):
+        """Tester que MaxScore donne le même top k que le calcul de tous les scores"""
+        dense = self.matrice.toarray()
+        poids_requete = {3: 1, 7: 2, 12: 1, 25: 1}
+        scores = sum(dense[:, id_mot] * q for id_mot, q in poids_requete.items())
+        for k in (1, 5, 20):
+            lignes, scores_top = self.index.top_k(poids_requete, k)
+            attendu = sorted(np.flatnonzero(scores), key=lambda i: (-scores[i], i))[:k]
+            self.assertEqual(list(lignes), attendu)
+            np.testing.assert_allclose(scores_top, scores[attendu])
+
+    def test_top_k_mot_absent(self):
+        """Tester qu'une requête sans mot connu ne retourne rien"""
+        lignes, scores = self.index.top_k({}, 5)
+        self.assertEqual(len(lignes), 0)
+        self.assertEqual(len(scores), 0)
+
+
+class TestSearchEngineIndex(unittest.TestCase):
+    """Tests du moteur de recherche avec le backend index inversé"""
+
+    def setUp(self):
+        Corpus._instance = None
+        self.corpus = Corpus("MachineLearning")
+        textes = [
+            "machine learning is great powerful algorithm",
+            "deep learning neural networks data science",
+            "machine learning classification regression",
+            "reinforcement learning agents deep learning",
+        ]
+        for i, texte in enumerate(textes, 1):
+            self.corpus.id2document[i] = RedditDocument(
+                title=f"Article {i}",
+                authors=f"Author{i}",
+                text=texte,
+                published=datetime(2025, 12, i),
+                link=f"http://test{i}.com",
+                subreddit="MachineLearning"
+            )
+        self.corpus.ndoc = len(textes)
+
+    def test_backend_inconnu(self):
+        """Tester qu'un backend inconnu lève une exception"""
+        with self.assertRaises(ValueError):
+            SearchEngine(self.corpus, backend="inconnu")
+
+    def test_memes_resultats_que_matrice(self):
+        """Tester que les deux backends retournent les mêmes documents"""
+        moteur_matrice = SearchEngine(self.corpus)
+        moteur_index = SearchEngine(self.corpus, backend="index")
+        for requete in ["machine", "deep learning", "learning learning neural", "xyzunknown"]:
+            attendu = moteur_matrice.search2(requete, nb_doc_retour=3)
+            obtenu = moteur_index.search2(requete, nb_doc_retour=3)
+            self.assertEqual(list(obtenu["doc_id"]), list(attendu["doc_id"]))
+            np.testing.assert_allclose(obtenu["similarity"].values, attendu["similarity"].values)
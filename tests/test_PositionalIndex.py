@@ -0,0 +1,100 @@
+import unittest
+import numpy as np
+from datetime import datetime
+from Document import RedditDocument
+from Corpus import Corpus
+from SearchEngine import SearchEngine
+from PositionalIndex import PositionalIndex
+
+
+
+# ============================================
+# TESTS POUR PositionalIndex.py
+# ============================================
+
+class TestPositionalIndex(unittest.TestCase):
+    """Tests pour l'index positionnel"""
+
+    def setUp(self):
+        # mots : 0 = deep, 1 = learning, 2 = neural, 3 = network
+        self.tokens = [
+            np.array([0, 1, 2, 3], dtype=np.int32),
+            np.array([1, 0, 3, 3, 2], dtype=np.int32),
+            np.array([2, 3, 0, 1], dtype=np.int32),
+        ]
+        self.index = PositionalIndex(self.tokens, 4)
+
+    def test_positions_delta(self):
+        """Tester les positions décodées à partir des écarts"""
+        np.testing.assert_array_equal(self.index.positions(3, 1), [2, 3])
+        np.testing.assert_array_equal(self.index.positions(0, 2), [2])
+        self.assertEqual(len(self.index.positions(0, 5)), 0)
+        np.testing.assert_array_equal(self.index.lignes_mot(2), [0, 1, 2])
+
+    def test_expression(self):
+        """Tester la recherche d'une expression exacte"""
+        np.testing.assert_array_equal(self.index.expression([0, 1]), [0, 2])
+        np.testing.assert_array_equal(self.index.expression([2, 3]), [0, 2])
+        np.testing.assert_array_equal(self.index.expression([3, 3, 2]), [1])
+        self.assertEqual(len(self.index.expression([0, None])), 0)
+
+    def test_proximite(self):
+        """Tester la recherche de proximité dans les deux sens"""
+        np.testing.assert_array_equal(self.index.proximite(0, 2, 1), [])
+        np.testing.assert_array_equal(self.index.proximite(0, 2, 2), [0, 2])
+        np.testing.assert_array_equal(self.index.proximite(1, 2, 4), [0, 1, 2])
+        np.testing.assert_array_equal(self.index.proximite(3, 3, 1), [1])
+
+    def test_lignes_supprimees(self):
+        """Tester que les lignes supprimées sont ignorées"""
+        index = PositionalIndex(self.tokens, 4, supprime=np.array([True, False, False]))
+        np.testing.assert_array_equal(index.expression([0, 1]), [2])
+
+
+class TestSearchEngineExpressions(unittest.TestCase):
+    """Tests des requêtes par expression et proximité dans le moteur de recherche"""
+
+    def setUp(self):
+        Corpus._instance = None
+        self.corpus = Corpus("MachineLearning")
+        self.corpus.add_documents([
+            RedditDocument("A", "Author1", "neural network training", datetime(2025, 12, 1), "http://a.com"),
+            RedditDocument("B", "Author2", "a network of neural cells", datetime(2025, 12, 2), "http://b.com"),
+            RedditDocument("C", "Author3", "deep learning", datetime(2025, 12, 3), "http://c.com"),
+        ])
+
+    def test_expression(self):
+        """Tester qu'une expression ne retourne que les documents avec les mots consécutifs"""
+        for backend in SearchEngine.BACKENDS:
+            for ranking in SearchEngine.RANKINGS:
+                moteur = SearchEngine(self.corpus, backend=backend, ranking=ranking)
+                self.assertEqual(list(moteur.search2('"neural network"')["doc_id"]), [1])
+        moteur = SearchEngine(self.corpus)
+        self.assertEqual(sorted(moteur.search2("neural network")["doc_id"]), [1, 2])
+
+    def test_proximite(self):
+        """Tester la syntaxe NEAR/k"""
+        moteur = SearchEngine(self.corpus)
+        self.assertEqual(list(moteur.search2("network NEAR/1 neural")["doc_id"]), [1])
+        self.assertEqual(sorted(moteur.search2("network NEAR/3 neural")["doc_id"]), [1, 2])
+
+    def test_ponctuation(self):
+        """Tester que les mots des expressions et de NEAR/k sont découpés comme les textes"""
+        self.corpus.add_documents([
+            RedditDocument("D", "Author4", "The U.S. economy and deep-learning", datetime(2025, 12, 4), "http://d.com"),
+            RedditDocument("E", "Author5", "economy of the US", datetime(2025, 12, 5), "http://e.com"),
+        ])
+        moteur = SearchEngine(self.corpus)
+        self.assertEqual(sorted(moteur.search2('"deep-learning"')["doc_id"]), [3, 4])
+        self.assertEqual(list(moteur.search2('"U.S. economy"')["doc_id"]), [4])
+        self.assertEqual(list(moteur.search2("U.S. NEAR/2 economy")["doc_id"]), [4])
+        self.assertEqual(list(moteur.search2('"Deep, learning!"', ranking="bm25")["doc_id"]), [3, 4])
+
+    def test_mise_a_jour(self):
+        """Tester que l'index positionnel suit les modifications du corpus"""
+        moteur = SearchEngine(self.corpus)
+        moteur.search2('"deep learning"')
+        moteur.add_documents([RedditDocument("D", "Author4", "deep learning again", datetime(2025, 12, 4), "http://d.com")])
+        self.assertEqual(sorted(moteur.search2('"deep learning"')["doc_id"]), [3, 4])
+        moteur.remove_documents([3])
+        self.assertEqual(list(moteur.search2('"deep learning"')["doc_id"]), [4])
@@ -0,0 +1,95 @@
+import unittest
+import numpy as np
+from datetime import datetime
+from Document import RedditDocument
+from Corpus import Corpus
+from SearchEngine import SearchEngine
+from QueryCache import QueryCache
+
+
+
+# ============================================
+# TESTS POUR QueryCache.py
+# ============================================
+
+class TestQueryCache(unittest.TestCase):
+    """Tests du cache LRU des résultats"""
+
+    def _resultat(self, n):
+        return np.arange(n), np.ones(n)
+
+    def test_lru(self):
+        """Tester que l'entrée la moins récemment utilisée est évincée"""
+        cache = QueryCache(taille_max=2)
+        cache.ecrire("a", *self._resultat(1))
+        cache.ecrire("b", *self._resultat(1))
+        self.assertIsNotNone(cache.lire("a", None))
+        cache.ecrire("c", *self._resultat(1))
+        self.assertIsNone(cache.lire("b", None))
+        self.assertIsNotNone(cache.lire("a", None))
+        self.assertEqual(cache.infos()["entrees"], 2)
+        self.assertEqual((cache.succes, cache.echecs), (2, 1))
+
+    def test_memoire(self):
+        """Tester l'éviction quand la mémoire maximum est dépassée"""
+        cache = QueryCache(memoire_max=3000)
+        cache.ecrire("a", *self._resultat(100))  # 1600 octets
+        cache.ecrire("b", *self._resultat(100))
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.infos()["memoire"], 1600)
+
+    def test_generation(self):
+        """Tester que le cache est vidé quand la génération change"""
+        cache = QueryCache()
+        cache.lire("a", 1)
+        cache.ecrire("a", *self._resultat(1))
+        self.assertIsNotNone(cache.lire("a", 1))
+        self.assertIsNone(cache.lire("a", 2))
+        self.assertEqual(len(cache), 0)
+
+    def test_copie(self):
+        """Tester qu'un résultat modifié par l'appelant ne modifie pas le cache"""
+        cache = QueryCache()
+        cache.ecrire("a", *self._resultat(3))
+        lignes, _ = cache.lire("a", None)
+        lignes[0] = 42
+        self.assertEqual(cache.lire("a", None)[0][0], 0)
+
+
+class TestCacheSearchEngine(unittest.TestCase):
+    """Tests du cache des résultats dans SearchEngine"""
+
+    def setUp(self):
+        Corpus._instance = None
+        self.corpus = Corpus("MachineLearning")
+        textes = ["machine learning is great", "deep learning neural networks", "machine learning regression"]
+        for i, texte in enumerate(textes, 1):
+            self.corpus.id2document[i] = RedditDocument(title=f"Article {i}", authors="Auteur", text=texte,
+                                                        published=datetime(2025, 12, i), link=f"http://test{i}.com")
+        self.moteur = SearchEngine(self.corpus)
+
+    def test_succes(self):
+        """Tester qu'une requête répétée (à la casse et aux espaces près) est servie par le cache"""
+        premier = self.moteur.search2("machine learning", 2)
+        second = self.moteur.search2("  Machine   LEARNING ", 2)
+        self.assertTrue(premier.equals(second))
+        self.assertEqual((self.moteur.cache.succes, self.moteur.cache.echecs), (1, 1))
+        # Autre k ou autre classement : autre entrée
+        self.moteur.search2("machine learning", 3)
+        self.moteur.search2("machine learning", 2, ranking="bm25")
+        self.assertEqual(self.moteur.cache.echecs, 3)
+
+    def test_near_garde_sa_casse(self):
+        """Tester que NEAR/k et near/k ne partagent pas la même entrée"""
+        self.moteur.search("machine NEAR/1 learning", 3)
+        self.moteur.search("machine near/1 learning", 3)
+        self.assertEqual(self.moteur.cache.echecs, 2)
+
+    def test_invalidation(self):
+        """Tester que les résultats sont recalculés après une modification du corpus"""
+        self.moteur.search2("neural", 5)
+        self.moteur.add_documents([RedditDocument(title="Article 4", authors="Auteur", text="neural networks again",
+                                                  published=datetime(2025, 12, 4), link="http://test4.com")])
+        resultats = self.moteur.search2("neural", 5)
+        self.assertEqual(sorted(resultats["doc_id"]), [2, 4])
+        self.assertEqual(self.moteur.cache.succes, 0)
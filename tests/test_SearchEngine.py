@@ -77,7 +77,23 @@ class TestSearchEngine(unittest.TestCase):
         # Mot inexistant
         vecteur_unknown = self.search_engine.encodage_vecteur("xyz123unknown")
         self.assertEqual(sum(vecteur_unknown), 0)  # Tous des 0
-    
+
+    def test_encodage_vecteur_apres_suppression(self):
+        """Tester l'encodage après la suppression d'un document (ids du vocabulaire non renumérotés)"""
+        # 1 document supprimé sur 5 : sous le seuil de compactage, les colonnes de ses mots restent
+        self.corpus.add_documents([RedditDocument(title=f"Article {i}", authors="Author4", text=texte,
+                                                  published=datetime(2025, 12, 30), link=f"http://test{i}.com")
+                                   for i, texte in ((4, "support vector machine"), (5, "random forest trees"))])
+        self.corpus.analyse()
+        self.corpus.remove_documents([2])
+        matrice = self.corpus.construire_matrice_tfidf()
+        self.assertLess(len(self.search_engine.vocabulaire), matrice.shape[1])
+        vecteur = self.search_engine.encodage_vecteur("regression")
+        self.assertEqual(len(vecteur), matrice.shape[1])
+        self.assertEqual(vecteur[self.search_engine.vocabulaire["regression"]["id"]], 1)
+        # Le document 3 (deuxième ligne restante) contient le mot
+        self.assertGreater(self.search_engine._cosinus(vecteur, matrice[1].toarray().reshape(-1)), 0)
+
     def test_cosinus_similarity(self):
         """Tester le calcul de similarité cosinus"""
         # Vecteurs identiques → similarité = 1
@@ -126,6 +142,20 @@ class TestSearchEngine(unittest.TestCase):
             similarities = results['similarity'].values
             self.assertTrue(all(similarities[i] >= similarities[i+1] for i in range(len(similarities)-1)))
     
+    def test_search_vectorise_identique_boucle(self):
+        """Tester que le calcul vectorisé donne les mêmes similarités que la boucle document par document"""
+        matrice = self.search_engine.matriceRecherche.tocsr()
+        attendu = []
+        for i in range(matrice.shape[0]):
+            vecteur_doc = matrice[i, :].toarray().reshape(-1)
+            sim = sum(self.search_engine._cosinus(self.search_engine.encodage_vecteur(mot), vecteur_doc)
+                      for mot in ["machine", "learning"])
+            attendu.append(sim)
+        results = self.search_engine.search("machine learning", nb_doc_retour=3)
+        self.assertEqual(list(results['similarity'].values), sorted(results['similarity'].values, reverse=True))
+        for doc_id, sim in zip(results['doc_id'], results['similarity']):
+            self.assertAlmostEqual(sim, attendu[doc_id - 1], places=10)
+
     def test_evolution_presence_mot_single_word(self):
         """Tester evolution_presence_mot avec un seul mot"""
         resultats = self.search_engine.evolution_presence_mot("machine")
@@ -149,6 +179,31 @@ class TestSearchEngine(unittest.TestCase):
             total_occ = sum(resultats["xyzunknown"].values())
             self.assertEqual(total_occ, 0)
     
+    def test_presence_mots(self):
+        """Tester les tendances calculées sans graphique, par mot entier"""
+        resultats = self.search_engine.presence_mots(["machine", "learn", "Learning"], granularite="jour")
+        jours = [datetime(2025, 12, j).date() for j in (25, 28, 29)]
+        self.assertEqual(resultats["machine"], dict(zip(jours, [1, 0, 1])))
+        # "learn" n'est pas compté dans "learning"
+        self.assertEqual(sum(resultats["learn"].values()), 0)
+        self.assertEqual(sum(resultats["Learning"].values()), 3)
+        self.assertEqual(self.search_engine.presence_mots("learning", granularite="mois")["learning"], {"2025-12": 3})
+        self.assertEqual(self.search_engine.presence_mots("learning", granularite="annee")["learning"], {"2025": 3})
+        with self.assertRaises(ValueError):
+            self.search_engine.presence_mots("learning", granularite="semaine")
+
+    def test_presence_mots_formats_dates(self):
+        """Tester les dates Reddit (dd-mm-YYYY) et arXiv (ISO) et la mise à jour après un ajout"""
+        self.search_engine.presence_mots("quantum", granularite="mois")
+        self.search_engine.add_documents([
+            RedditDocument(title="A", authors="X", text="quantum", published="03-01-2026", link="http://a.com"),
+            RedditDocument(title="B", authors="Y", text="quantum machine", published="2026-02-01T10:00:00Z",
+                           link="http://b.com"),
+        ])
+        resultats = self.search_engine.presence_mots(["quantum", "machine"], granularite="mois")
+        self.assertEqual(resultats["quantum"], {"2025-12": 0, "2026-01": 1, "2026-02": 1})
+        self.assertEqual(resultats["machine"], {"2025-12": 2, "2026-01": 0, "2026-02": 1})
+
     def test_load_from_pickle(self):
         """Tester le chargement à partir d'un pickle"""
         # Sauvegarder
@@ -170,5 +225,50 @@ class TestSearchEngine(unittest.TestCase):
         import os
         os.remove("tests/tmp/test_corpus.pkl")
 
+    def test_add_documents(self):
+        """Tester que le moteur prend en compte les documents ajoutés sans être reconstruit"""
+        doc4 = RedditDocument(
+            title="Article 4",
+            authors="Author4",
+            text="quantum computing",
+            published=datetime(2025, 12, 30),
+            link="http://test4.com",
+            comments_count=1,
+            subreddit="MachineLearning"
+        )
+        self.assertEqual(len(self.search_engine.search2("quantum")), 0)
+        ids = self.search_engine.add_documents([doc4])
+        results = self.search_engine.search2("quantum")
+        self.assertEqual(list(results['doc_id']), ids)
+        self.assertIn("quantum", self.search_engine.vocabulaire)
+        self.assertEqual(self.search_engine.matriceRecherche.shape[0], 4)
+
+    def test_remove_documents(self):
+        """Tester que les documents supprimés n'apparaissent plus dans les résultats"""
+        self.search_engine.remove_documents([1])
+        results = self.search_engine.search("machine", nb_doc_retour=5)
+        self.assertEqual(list(results['doc_id']), [3, 2])
+        results = self.search_engine.search2("powerful", nb_doc_retour=5)
+        self.assertEqual(len(results), 0)
 
+    def test_search_many_identique_search2(self):
+        """Tester que search_many donne, pour chaque requête, les résultats de search2"""
+        requetes = ["machine", "learning data", "xyzunknownword123", "", "Machine learning machine",
+                    '"machine learning" regression', "deep NEAR/2 networks"]
+        self.search_engine.TAILLE_PAQUET_REQUETES = 2
+        for ranking in ("cosinus", "bm25"):
+            results = self.search_engine.search_many(requetes, nb_doc_retour=2, ranking=ranking)
+            self.assertEqual(list(results.columns), ["requete", "doc_id", "similarity"])
+            for position, requete in enumerate(requetes):
+                attendu = self.search_engine.search2(requete, nb_doc_retour=2, ranking=ranking)
+                obtenu = results[results["requete"] == position]
+                self.assertEqual(list(obtenu["doc_id"]), list(attendu["doc_id"]))
+                np.testing.assert_allclose(obtenu["similarity"].values, attendu["similarity"].values)
 
+    def test_search_many_documents_supprimes(self):
+        """Tester que search_many ignore les documents supprimés"""
+        self.search_engine.remove_documents([1])
+        results = self.search_engine.search_many(["powerful", "machine"], nb_doc_retour=5)
+        self.assertEqual(list(results["requete"]), [1])
+        self.assertEqual(list(results["doc_id"]), [3])
+        self.assertEqual(len(self.search_engine.search_many([])), 0)
@@ -0,0 +1,49 @@
+import re
+import unittest
+from Tokenizer import Tokenizer
+
+
+
+# ============================================
+# TESTS POUR Tokenizer.py
+# ============================================
+
+def ancien_nettoyage(texte):
+    # Nettoyage en plusieurs passes utilisé avant Tokenizer (référence)
+    texte = texte.lower().replace("\r\n", "\n").replace("\r", "\n").replace("\n", " ").replace("\t", " ")
+    texte = re.sub(r"https?://\S+|www\.\S+", "", texte)
+    texte = re.sub(r"[^\w\s]", " ", texte, flags=re.UNICODE)
+    return re.sub(r"\s+", " ", texte).strip().split()
+
+
+class TestTokenizer(unittest.TestCase):
+    """Tests pour le découpage des textes en mots"""
+
+    TEXTES = [
+        "Machine Learning, c'est génial !\nDeep-learning\t2025",
+        "Voir https://example.com/a?b=1 et WWW.site.org/page, fin.",
+        "motcollé http://x.com/y suite http:// seul wwww.z.fr",
+        "snake_case et l'été À Paris",
+        "",
+        "   ",
+    ]
+
+    def setUp(self):
+        self.tokenizer = Tokenizer()
+
+    def test_meme_decoupage_que_l_ancien_nettoyage(self):
+        """Tester que les mots sont identiques à ceux de l'ancien nettoyage"""
+        for texte in self.TEXTES:
+            self.assertEqual(self.tokenizer.decouper(texte), ancien_nettoyage(texte), texte)
+
+    def test_positions(self):
+        """Tester que les positions renvoient aux mots du texte d'origine"""
+        for texte in self.TEXTES:
+            tokens = list(self.tokenizer.tokens(texte))
+            self.assertEqual([mot for mot, _, _ in tokens], self.tokenizer.decouper(texte))
+            for mot, debut, fin in tokens:
+                self.assertEqual(texte[debut:fin].lower(), mot)
+
+    def test_url_collee(self):
+        """Tester qu'une URL collée à un mot est supprimée sans supprimer le mot"""
+        self.assertEqual(self.tokenizer.decouper("voirhttps://a.com ici"), ["voir", "ici"])
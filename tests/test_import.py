@@ -0,0 +1,45 @@
+import os
+import subprocess
+import sys
+import unittest
+
+
+
+# ============================================
+# TESTS DU TEMPS D'IMPORT
+# ============================================
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Mesure faite dans un nouveau processus : les modules déjà importés par les autres tests ne comptent pas
+SCRIPT = """
+import sys, time
+debut = time.perf_counter()
+import {module}
+print(time.perf_counter() - debut)
+print(",".join(m for m in ("pandas", "scipy", "matplotlib", "tqdm") if m in sys.modules))
+"""
+
+
+class TestImport(unittest.TestCase):
+    """Tests du démarrage à froid : les dépendances lourdes ne sont importées qu'à l'usage"""
+
+    # Limite large (machines lentes, CI) : l'import prend ~0.2 s contre plus d'une seconde
+    # quand pandas / matplotlib étaient importés au chargement
+    TEMPS_MAX = 1.0
+
+    def _importer(self, module):
+        sortie = subprocess.run([sys.executable, "-c", SCRIPT.format(module=module)], cwd=RACINE,
+                                capture_output=True, text=True, check=True).stdout.splitlines()
+        return float(sortie[0]), [m for m in sortie[1].split(",") if m]
+
+    def test_modules_lourds_non_importes(self):
+        """Tester que pandas, scipy et matplotlib ne sont pas importés avec le moteur"""
+        for module in ("SearchEngine", "Corpus", "Authors"):
+            _, lourds = self._importer(module)
+            self.assertEqual(lourds, [], module)
+
+    def test_temps_import(self):
+        """Tester que l'import du moteur de recherche reste rapide"""
+        temps, _ = self._importer("SearchEngine")
+        self.assertLess(temps, self.TEMPS_MAX)